@@ -0,0 +1,20 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as default_exception_handler
+
+from users.hashers import PasswordHashingBusy
+
+
+class PasswordHashingUnavailable(APIException):
+    """Очередь хеширования паролей заполнена."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Сервер перегружен проверкой паролей, повторите запрос позже."
+    default_code = "password_hashing_unavailable"
+
+
+def exception_handler(exc, context):
+    """Обработчик исключений DRF: заполненная очередь хеширования паролей - ответ 503, остальное - по умолчанию."""
+    if isinstance(exc, PasswordHashingBusy):
+        exc = PasswordHashingUnavailable()
+    return default_exception_handler(exc, context)
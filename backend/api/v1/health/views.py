@@ -0,0 +1,24 @@
+from django.db import DatabaseError, connection
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db import get_pool_stats
+
+
+class ReadinessView(APIView):
+    """Готовность приложения принимать запросы: доступность базы и метрики пула соединений."""
+
+    authentication_classes = ()
+    permission_classes = (permissions.AllowAny,)
+
+    def get(self, request, *args, **kwargs):
+        """Ответ 200, если база отвечает на запрос, иначе 503."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            database, response_status = "unavailable", status.HTTP_503_SERVICE_UNAVAILABLE
+        else:
+            database, response_status = "ok", status.HTTP_200_OK
+        return Response({"database": database, "pool": get_pool_stats(connection.alias)}, status=response_status)
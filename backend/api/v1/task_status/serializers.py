@@ -1,6 +1,8 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from classifiers.models import TaskStatus
+from classifiers.registry import task_status_registry
 
 
 class TaskStatusSerializer(serializers.ModelSerializer):
@@ -11,3 +13,42 @@ class TaskStatusSerializer(serializers.ModelSerializer):
 
         model = TaskStatus
         fields = "__all__"
+
+
+@extend_schema_field(TaskStatusSerializer)
+class TaskStatusNestedField(serializers.Field):
+    """Вложенный статус задачи из кэша классификатора.
+
+    Читает только task_status_id задачи, поэтому не требует JOIN или отдельного запроса к статусам.
+    """
+
+    def __init__(self, **kwargs):
+        """Инициализация поля только для чтения."""
+        kwargs["read_only"] = True
+        kwargs.setdefault("source", "task_status_id")
+        super().__init__(**kwargs)
+        self._representations = {}
+
+    def to_representation(self, value):
+        """Представление статуса, одно на каждый статус в пределах сериализатора."""
+        if value not in self._representations:
+            self._representations[value] = TaskStatusSerializer(task_status_registry.get(value)).data
+        return self._representations[value]
+
+
+class TaskStatusPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """Статус задачи по id с проверкой по кэшу классификатора вместо запроса к базе."""
+
+    def __init__(self, **kwargs):
+        """Инициализация поля с кверисетом статусов для схемы и форм."""
+        kwargs.setdefault("queryset", TaskStatus.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        """Статус задачи из кэша классификатора."""
+        if isinstance(data, bool) or not isinstance(data, (int, str)):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        task_status = task_status_registry.get(data)
+        if task_status is None:
+            self.fail("does_not_exist", pk_value=data)
+        return task_status
@@ -1,7 +1,10 @@
 from rest_framework import mixins, permissions, viewsets
+from rest_framework.settings import api_settings
 
 from api.v1.task_status.serializers import TaskStatusSerializer
+from api.v1.tasks.renderers import MessagePackRenderer
 from classifiers.models import TaskStatus
+from classifiers.registry import task_status_registry
 
 
 class TaskStatusViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
@@ -10,3 +13,8 @@ class TaskStatusViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
     queryset = TaskStatus.objects.all()
     serializer_class = TaskStatusSerializer
     permission_classes = (permissions.AllowAny,)
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer)
+
+    def get_queryset(self):
+        """Статусы из кэша классификатора."""
+        return task_status_registry.all()
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+class RowEncoder:
+    """Представление строк values() в формате сериализатора без вызова to_representation каждого поля.
+
+    Поля сериализатора разбираются один раз: для каждого поля запоминаются источник в строке values()
+    и преобразование значения. Строки, UUID, числа и даты в UTC передаются рендереру как есть, потому что
+    JSONRenderer и ORJSONRenderer кодируют их так же, как соответствующие поля DRF, а MessagePackRenderer
+    кодирует UUID и даты так же и в ответах сериализаторов. Для остальных полей вызывается их to_representation,
+    поэтому формат ответа совпадает с сериализатором.
+    """
+
+    # Поля, значение которых рендерер кодирует так же, как их to_representation.
+    passthrough_fields = (
+        serializers.CharField,
+        serializers.UUIDField,
+        serializers.IntegerField,
+        serializers.BooleanField,
+    )
+
+    def __init__(self, serializer_class, context=None, fields=None):
+        """Разбор полей сериализатора, только полей fields, если они заданы."""
+        serializer = serializer_class(context=context or {})
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if field.source == "*" or "." in field.source:
+                raise ValueError(f"Поле {name} не может быть прочитано из строки values()")
+            self.fields.append((name, field.source, self.get_converter(field)))
+        self.values_fields = tuple(source for _, source, _ in self.fields)
+
+    def get_converter(self, field):
+        """Преобразование значения поля или None, если значение передается рендереру как есть."""
+        if isinstance(field, serializers.DateTimeField):
+            if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+                return field.to_representation
+            field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+            # База возвращает даты в UTC, и в UTC их не нужно переводить.
+            if field_timezone is None or field_timezone.utcoffset(None) == timedelta(0):
+                return None
+            return field.enforce_timezone
+        if isinstance(field, self.passthrough_fields) and not isinstance(field, serializers.ChoiceField):
+            return None
+        return field.to_representation
+
+    def encode(self, rows):
+        """Список представлений строк."""
+        return [self.encode_row(row) for row in rows]
+
+    def encode_row(self, row):
+        """Представление строки, None, как и в сериализаторе, не преобразуется."""
+        data = {}
+        for name, source, convert in self.fields:
+            value = row[source]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
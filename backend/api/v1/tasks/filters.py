@@ -1,13 +1,25 @@
-from django_filters.rest_framework import FilterSet, IsoDateTimeFromToRangeFilter, ModelChoiceFilter
+import re
 
-from classifiers.models import TaskStatus
-from tasks.models import Task
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django_filters.rest_framework import ChoiceFilter, DjangoFilterBackend, FilterSet, IsoDateTimeFromToRangeFilter
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from classifiers.registry import task_status_registry
+from tasks.models import SEARCH_CONFIG, Task, TaskWithArchive
+
+SEARCH_MODE_FULLTEXT = "fulltext"
+SEARCH_MODE_SUBSTRING = "substring"
+SEARCH_MODES = (SEARCH_MODE_FULLTEXT, SEARCH_MODE_SUBSTRING)
 
 
 class TaskFilter(FilterSet):
     """Класс с настройками фильтрации для API задач."""
 
-    task_status = ModelChoiceFilter(queryset=TaskStatus.objects.all())
+    task_status = ChoiceFilter(choices=lambda: task_status_registry.choices())
     created_at = IsoDateTimeFromToRangeFilter(field_name="created_at")
     updated_at = IsoDateTimeFromToRangeFilter()
     complete_before = IsoDateTimeFromToRangeFilter()
@@ -18,3 +30,85 @@ class TaskFilter(FilterSet):
 
         model = Task
         fields = ("task_status", "created_at", "updated_at", "complete_before", "completed_at")
+
+
+class TaskWithArchiveFilter(TaskFilter):
+    """Фильтры списка задач вместе с архивом."""
+
+    class Meta(TaskFilter.Meta):
+        """Метаклас настроек класса фильтра."""
+
+        model = TaskWithArchive
+
+
+class TaskFilterBackend(DjangoFilterBackend):
+    """Фильтрация задач: для списка вместе с архивом используется TaskWithArchiveFilter."""
+
+    def get_filterset_class(self, view, queryset=None):
+        """Класс фильтров по модели кверисета."""
+        if queryset is not None and queryset.model is TaskWithArchive:
+            return TaskWithArchiveFilter
+        return super().get_filterset_class(view, queryset)
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """Поиск задач по параметру search.
+
+    В режиме fulltext используется сохраненный tsvector с GIN индексом, каждое слово запроса ищется
+    как префикс, а найденные задачи получают аннотацию search_rank. Режим substring - прежний
+    поиск DRF подстрокой через ILIKE, оставлен как резервный.
+    """
+
+    search_mode_param = "search_mode"
+    rank_annotation = "search_rank"
+    word_re = re.compile(r"\w+")
+
+    def get_search_mode(self, request):
+        """Режим поиска из параметра запроса или из настроек."""
+        search_mode = request.query_params.get(self.search_mode_param, settings.TASKS_SEARCH_MODE)
+        if search_mode not in SEARCH_MODES:
+            raise ValidationError({self.search_mode_param: [f"Допустимые значения: {', '.join(SEARCH_MODES)}."]})
+        return search_mode
+
+    def get_search_query(self, request):
+        """Запрос tsquery из слов параметра search, каждое слово - префикс."""
+        words = self.word_re.findall(" ".join(self.get_search_terms(request)))
+        if not words:
+            return None
+        return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw", config=SEARCH_CONFIG)
+
+    def filter_queryset(self, request, queryset, view):
+        """Фильтрация задач по поисковому запросу."""
+        if self.get_search_mode(request) == SEARCH_MODE_SUBSTRING:
+            return super().filter_queryset(request, queryset, view)
+
+        search_query = self.get_search_query(request)
+        if search_query is None:
+            return queryset
+        # ts_rank возвращает real; приведение к double precision нужно, чтобы значение ранга в курсоре
+        # пагинации без потерь совпадало со значением в базе.
+        search_rank = Cast(SearchRank(F("search_vector"), search_query), output_field=FloatField())
+        return queryset.filter(search_vector=search_query).annotate(**{self.rank_annotation: search_rank})
+
+    def get_schema_operation_parameters(self, view):
+        """Описание параметров поиска для схемы OpenAPI."""
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.search_mode_param,
+                "required": False,
+                "in": "query",
+                "description": "Режим поиска: fulltext (по умолчанию) или substring.",
+                "schema": {"type": "string", "enum": list(SEARCH_MODES)},
+            },
+        ]
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """Сортировка задач: без явного параметра ordering результаты поиска сортируются по релевантности."""
+
+    def get_ordering(self, request, queryset, view):
+        """Сортировка по релевантности, если поиск добавил ранг, иначе обычная сортировка."""
+        searched = TaskSearchFilter.rank_annotation in queryset.query.annotations
+        if searched and self.ordering_param not in request.query_params:
+            return (f"-{TaskSearchFilter.rank_annotation}",)
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,389 @@
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from api.v1.tasks.encoders import RowEncoder
+from core.db_router import use_replicas
+from core.metrics import measure, request_metrics
+from tasks.cache import task_cache_versions
+from tasks.models import Task
+
+
+class ResponseCacheMixin:
+    """Кэш ответов списка и детального просмотра в кэше Django (настройка TASKS_RESPONSE_CACHE).
+
+    Ключ ответа строится по пользователю, действию, id объекта, формату ответа, адресу сервера и отсортированным
+    параметрам запроса (фильтры, поиск, сортировка, курсор) и содержит версии tasks.cache.TaskCacheVersions. Успешный
+    изменяющий запрос к вьюсету увеличивает версию пользователя, поэтому его следующие запросы строят ответы
+    заново. Вместе с данными хранятся заголовки валидаторов: ответ из кэша, в том числе 304, не обращается
+    к базе. Изменения задач в обход API учитываются через TASKS_RESPONSE_CACHE_TTL секунд.
+
+    При промахе ответ строится по основной базе, даже если запросу разрешено чтение с реплик: отстающая реплика
+    вернула бы данные до изменения, которое уже увеличило версию, и устаревший ответ хранился бы под новой
+    версией до истечения TTL. Повторные запросы получают ответ из кэша и не обращаются ни к одной базе.
+    """
+
+    cached_actions = ("list", "retrieve")
+    cached_headers = ("ETag", "Last-Modified", "Cache-Control", "Vary")
+
+    def get_response_cache_key(self):
+        """Ключ ответа в кэше или None, если ответ не кэшируется."""
+        if not settings.TASKS_RESPONSE_CACHE or self.action not in self.cached_actions:
+            return None
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        params = sorted((name, sorted(values)) for name, values in self.request.query_params.lists())
+        parts = (
+            self.action,
+            self.kwargs.get(lookup_url_kwarg, ""),
+            self.request.accepted_media_type,
+            # Ссылки пагинации в ответе абсолютные.
+            self.request.build_absolute_uri("/"),
+            repr(params),
+        )
+        digest = hashlib.sha1("\n".join(map(str, parts)).encode()).hexdigest()
+        generation, version = task_cache_versions.get(self.request.user.id)
+        return f"tasks:response:{type(self).__name__}:{self.request.user.id}:{generation}:{version}:{digest}"
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        """Ответ из кэша или ответ обработчика, который сохраняется в кэш, если он успешный."""
+        key = self.get_response_cache_key()
+        if key is None:
+            return handler(request, *args, **kwargs)
+        cache = task_cache_versions.cache
+        labels = (type(self).__name__, self.action)
+        entry = cache.get(key)
+        if entry is not None:
+            request_metrics.response_cache.inc((*labels, "hit"))
+            data, headers = entry
+            response = get_conditional_response(
+                request._request,
+                etag=headers.get("ETag"),
+                last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+            ) or Response(data)
+            for header, value in headers.items():
+                response.headers[header] = value
+            return response
+
+        request_metrics.response_cache.inc((*labels, "miss"))
+        with use_replicas(False):
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and isinstance(response, Response):
+            headers = {header: response.headers[header] for header in self.cached_headers if header in response}
+            # Данные в кэше теряют сериализатор, поэтому рендерер подготавливает их до сохранения.
+            prepare_data = getattr(request.accepted_renderer, "prepare_data", None)
+            data = prepare_data(response.data) if prepare_data else response.data
+            cache.set(key, (data, headers), settings.TASKS_RESPONSE_CACHE_TTL)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Список из кэша ответов."""
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Объект из кэша ответов."""
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    @staticmethod
+    def invalidates_response_cache(request, response):
+        """Сбрасывает ли ответ кэш ответов пользователя: успешный изменяющий запрос."""
+        return (
+            settings.TASKS_RESPONSE_CACHE
+            and request.method not in permissions.SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Сбрасывает кэш ответов пользователя после успешного изменяющего запроса."""
+        if self.invalidates_response_cache(request, response):
+            task_cache_versions.invalidate_user(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    async def afinalize_response(self, request, response, *args, **kwargs):
+        """Асинхронный аналог finalize_response для AsyncViewSetMixin: кэш не блокирует event loop."""
+        if self.invalidates_response_cache(request, response):
+            await task_cache_versions.ainvalidate_user(request.user.id)
+        return super(ResponseCacheMixin, self).finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """Условные GET запросы (ETag, Last-Modified, 304 Not Modified) для списка и детального просмотра.
+
+    Валидаторы вычисляются без сериализации и без обхода строк списка: ETag списка - по маркеру изменений
+    задач пользователя (TaskManager.change_marker), который меняется при любом создании, изменении и удалении
+    задач, ETag и Last-Modified задачи - по ее updated_at. Список передает только ETag, поэтому If-Modified-Since для
+    него не проверяется.
+    """
+
+    validator_field = "updated_at"
+
+    def get_list_version(self):
+        """Маркер изменений задач пользователя."""
+        return Task.objects.change_marker(self.request.user.id)
+
+    async def aget_list_version(self):
+        """Асинхронный аналог get_list_version."""
+        return await Task.objects.achange_marker(self.request.user.id)
+
+    def get_etag(self, version):
+        """Сильный ETag представления версии version с учетом параметров запроса и формата ответа."""
+        parts = (self.request.get_full_path(), self.request.accepted_media_type, str(version))
+        return quote_etag(hashlib.sha1("\n".join(parts).encode()).hexdigest())
+
+    def get_conditional_response(self, etag, last_modified=None):
+        """Ответ 304, если у клиента актуальная версия представления, иначе None."""
+        # Last-Modified передается с точностью до секунды, поэтому и сравнивается без микросекунд.
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request._request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified=None):
+        """Заголовки валидаторов и кэширования ответа."""
+        response.headers["ETag"] = etag
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Accept", "Authorization"))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Список с ETag по маркеру изменений."""
+        etag = self.get_etag(self.get_list_version())
+        not_modified = self.get_conditional_response(etag)
+        if not_modified is not None:
+            return not_modified
+        return self.set_validators(super().list(request, *args, **kwargs), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Объект с валидаторами по его времени изменения."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            last_modified = (
+                self.get_queryset()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list(self.validator_field, flat=True)
+                .first()
+            )
+        except ValidationError:
+            last_modified = None
+        if last_modified is None:
+            # Объекта нет: ответ 404 формирует стандартный обработчик.
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = self.get_etag(last_modified)
+        not_modified = self.get_conditional_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return self.set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
+
+class SparseFieldsetMixin:
+    """Выбор полей ответа списка и детального просмотра параметрами fields и exclude (через запятую).
+
+    Лишние поля удаляются из сериализатора, а кверисет ограничивается через only() полями источников, ключом
+    и полями сортировки, которые нужны пагинации для позиции курсора. Поэтому невыбранные столбцы, например
+    description, не читаются из базы. Неизвестные поля отклоняются с кодом 400.
+    """
+
+    sparse_actions = ("list", "retrieve")
+    # Столбцы, которые нужны представлению независимо от выбранных полей, например для проверки прав.
+    sparse_required_columns = ()
+
+    def get_sparse_fields(self):
+        """Имена выбранных полей сериализатора или None, если выбираются все поля."""
+        if self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        """Разбор и проверка параметров fields и exclude."""
+        requested = {
+            param: [name.strip() for name in self.request.query_params.get(param, "").split(",") if name.strip()]
+            for param in ("fields", "exclude")
+        }
+        if not requested["fields"] and not requested["exclude"]:
+            return None
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        available = [name for name, field in serializer.fields.items() if not field.write_only]
+        errors = {}
+        for param, names in requested.items():
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                errors[param] = [f"Неизвестные поля: {', '.join(unknown)}. Доступные поля: {', '.join(available)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+        selected = requested["fields"] or available
+        return tuple(name for name in available if name in selected and name not in requested["exclude"])
+
+    def get_serializer(self, *args, **kwargs):
+        """Сериализатор только с выбранными полями."""
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, "child", serializer)
+            for name in [name for name in target.fields if name not in fields]:
+                target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        """Кверисет, читающий только столбцы выбранных полей."""
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        sources = (serializer.fields[name].source.split(".")[0] for name in fields)
+        pk_name = queryset.model._meta.pk.name
+        ordering = (field.lstrip("-") for field in self.ordering_fields)
+        columns = (*sources, pk_name, *self.sparse_required_columns, *ordering)
+        return queryset.only(*(column for column in dict.fromkeys(columns) if column != "*"))
+
+
+class FastListMixin:
+    """Быстрый режим сериализации списка (настройка TASKS_LIST_FAST_PATH).
+
+    Страница выбирается через values() и кодируется RowEncoder по полям сериализатора списка без создания
+    экземпляров модели и вызова to_representation каждого поля. Если вьюсет выбирает поля ответа
+    (SparseFieldsetMixin.get_sparse_fields), кодируются только они.
+    """
+
+    def use_fast_list(self):
+        """Включен ли быстрый режим списка."""
+        return settings.TASKS_LIST_FAST_PATH
+
+    def get_list_queryset(self, queryset):
+        """Кверисет строк списка: values() с полями сериализатора и аннотациями для сортировки и курсора."""
+        if not self.use_fast_list():
+            return queryset
+        self.row_encoder = RowEncoder(
+            self.get_serializer_class(),
+            context=self.get_serializer_context(),
+            fields=getattr(self, "get_sparse_fields", lambda: None)(),
+        )
+        pk_name = queryset.model._meta.pk.name
+        # Поля сортировки нужны пагинации для позиции курсора, даже если их нет в ответе.
+        extra = (pk_name, *(field.lstrip("-") for field in self.ordering_fields), *queryset.query.annotations)
+        return queryset.values(*dict.fromkeys((*self.row_encoder.values_fields, *extra)))
+
+    def serialize_list(self, rows):
+        """Представление строк списка."""
+        with measure("serialize"):
+            if self.use_fast_list():
+                return self.row_encoder.encode(rows)
+            return self.get_serializer(rows, many=True).data
+
+    def list(self, request, *args, **kwargs):
+        """Список с сериализацией строк в быстром режиме."""
+        queryset = self.get_list_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_list(page))
+        return Response(self.serialize_list(queryset))
+
+
+class AsyncViewSetMixin:
+    """Асинхронный dispatch вьюсета DRF для ASGI.
+
+    Действия, объявленные через async def, выполняются в event loop: пользователь загружается асинхронной
+    аутентификацией (aauthenticate), ответ завершается afinalize_response, если вьюсет его объявляет, а проверка
+    прав, обработка исключений и рендеринг ответа не обращаются к базе и не переключаются в поток. Остальные
+    действия целиком выполняются синхронным dispatch через sync_to_async, как и обычные синхронные представления
+    под ASGI.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        """Представление, которое Django вызывает как корутину."""
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Асинхронный аналог APIView.dispatch."""
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if not iscoroutinefunction(handler):
+            return await sync_to_async(self.sync_dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        afinalize_response = getattr(self, "afinalize_response", None)
+        if afinalize_response is not None:
+            self.response = await afinalize_response(request, response, *args, **kwargs)
+        else:
+            self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.render_response(self.response)
+
+    def sync_dispatch(self, request, *args, **kwargs):
+        """Синхронный dispatch с рендерингом ответа в том же потоке."""
+        return self.render_response(super().dispatch(request, *args, **kwargs))
+
+    async def ainitial(self, request, *args, **kwargs):
+        """Асинхронный аналог APIView.initial."""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """Аутентификация запроса, аналог Request._authenticate.
+
+        Аутентификаторы без aauthenticate вызываются в потоке.
+        """
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, "aauthenticate", None) or sync_to_async(authenticator.authenticate)
+            try:
+                user_auth_tuple = await authenticate(request)
+            except APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    @staticmethod
+    def render_response(response):
+        """Отрисованный ответ без отложенного рендеринга.
+
+        Иначе асинхронный обработчик Django вызвал бы render() через sync_to_async в общем потоке.
+        """
+        if not isinstance(response, SimpleTemplateResponse):
+            return response
+        with measure("serialize"):
+            response.render()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
@@ -0,0 +1,155 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class TaskCursorPagination(CursorPagination):
+    """Курсорная (keyset) пагинация списка задач.
+
+    Позиция курсора - пара (значение поля сортировки, id), поэтому она уникальна для каждой строки:
+    страница выбирается условием по индексу без OFFSET и без COUNT(*), а вставка новых задач
+    между запросами не сдвигает уже выданные курсоры.
+    """
+
+    ordering = "-created_at"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    position_separator = "|"
+
+    def get_ordering(self, request, queryset, view):
+        """Сортировка по первому полю из OrderingFilter с id в качестве второго ключа."""
+        order = super().get_ordering(request, queryset, view)[0]
+        pk_name = queryset.model._meta.pk.name
+        return order, f"-{pk_name}" if order.startswith("-") else pk_name
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выборка страницы по позиции курсора."""
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Выборка страницы по позиции курсора через асинхронный ORM."""
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page([obj async for obj in page_queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Кверисет строк страницы с одной лишней строкой для позиции следующей страницы."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (self.offset, self.reverse, self.current_position) = (0, False, None)
+        else:
+            (self.offset, self.reverse, self.current_position) = self.cursor
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset, self.current_position, self.reverse))
+
+        # Позиции уникальны, поэтому offset всегда равен 0 и нужен только для совместимости с форматом курсора DRF.
+        return queryset[self.offset : self.offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """Страница и позиции соседних страниц по выбранным строкам."""
+        offset, reverse, current_position = self.offset, self.reverse, self.current_position
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_keyset_filter(self, queryset, position, reverse):
+        """Условие "строго после позиции курсора" в порядке выборки.
+
+        NULL в PostgreSQL больше любого значения: при сортировке по возрастанию пустые значения
+        идут в конце списка, а по убыванию - в начале.
+        """
+        order = self.ordering[0]
+        field_name = order.lstrip("-")
+        pk_name = self.ordering[1].lstrip("-")
+        descending = order.startswith("-") != reverse
+        lookup = "lt" if descending else "gt"
+        value, pk = self.decode_position(queryset, field_name, position)
+
+        if value is None:
+            after = Q(**{f"{field_name}__isnull": True, f"{pk_name}__{lookup}": pk})
+            if descending:
+                after |= Q(**{f"{field_name}__isnull": False})
+            return after
+
+        after = Q(**{f"{field_name}__{lookup}": value}) | Q(**{field_name: value, f"{pk_name}__{lookup}": pk})
+        # Нестрогое условие повторяет ключ, чтобы PostgreSQL начинал сканирование индекса с позиции курсора.
+        after &= Q(**{f"{field_name}__{lookup}e": value})
+        if not descending and self.get_position_field(queryset, field_name).null:
+            after |= Q(**{f"{field_name}__isnull": True})
+        return after
+
+    def get_position_field(self, queryset, field_name):
+        """Поле модели или аннотации, по которому идет сортировка."""
+        annotation = queryset.query.annotations.get(field_name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(field_name)
+
+    def decode_position(self, queryset, field_name, position):
+        """Разбор позиции курсора на значение поля сортировки и id."""
+        value, _, pk = position.rpartition(self.position_separator)
+        try:
+            pk = queryset.model._meta.pk.to_python(pk)
+            value = self.get_position_field(queryset, field_name).to_python(value) if value else None
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip("-")
+        pk_name = ordering[1].lstrip("-")
+        if isinstance(instance, dict):
+            value, pk = instance[field_name], instance[pk_name]
+        else:
+            value, pk = getattr(instance, field_name), getattr(instance, pk_name)
+        if value is None:
+            value = ""
+        elif hasattr(value, "isoformat"):
+            value = value.isoformat()
+        return f"{value}{self.position_separator}{pk}"
@@ -0,0 +1,33 @@
+import uuid
+
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from api.v1.tasks.renderers import UUID_EXT_TYPE, MessagePackRenderer
+
+
+class MessagePackParser(BaseParser):
+    """Парсер тела запроса в MessagePack.
+
+    UUID в расширении UUID_EXT_TYPE разбираются в uuid.UUID, Timestamp - в datetime в UTC. Поля сериализаторов
+    принимают их так же, как строки из JSON, поэтому клиент может передавать и расширения, и строки.
+    MessagePackRenderer кодирует ответы теми же расширениями.
+    """
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Данные тела запроса."""
+        try:
+            return msgpack.unpackb(stream.read(), ext_hook=self.ext_hook, timestamp=3)
+        except ValueError as exc:
+            raise ParseError(f"Ошибка разбора MessagePack - {exc}")
+
+    @staticmethod
+    def ext_hook(code, data):
+        """Значение расширения MessagePack."""
+        if code == UUID_EXT_TYPE:
+            return uuid.UUID(bytes=data)
+        return msgpack.ExtType(code, data)
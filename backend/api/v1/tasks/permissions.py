@@ -5,5 +5,8 @@ class IsTaskOwnerOrForbidden(permissions.BasePermission):
     """Права на задачу. Владелец или запрещено."""
 
     def has_object_permission(self, request, view, obj):
-        """Права на объект."""
-        return obj.user == request.user
+        """Права на объект.
+
+        Сравниваются id, чтобы проверка не загружала пользователя задачи отдельным запросом.
+        """
+        return obj.user_id == request.user.id
@@ -0,0 +1,170 @@
+import abc
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+
+import msgpack
+import orjson
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+# Код расширения MessagePack для UUID: 16 байт UUID в порядке big-endian.
+UUID_EXT_TYPE = 1
+
+
+class StreamingRenderer(BaseRenderer, metaclass=abc.ABCMeta):
+    """Абстрактный рендерер построчной выгрузки, подклассы задают запись строки в get_row_writer().
+
+    stream() кодирует строки по мере чтения и отдает их пачками по rows_per_chunk строк,
+    render() нужен для обычных ответов с этим форматом, например ошибок валидации фильтров.
+    """
+
+    charset = "utf-8"
+    rows_per_chunk = 500
+
+    def stream(self, fields, rows):
+        """Генератор фрагментов выгрузки строк, каждая строка - кортеж значений в порядке fields."""
+        buffer = io.StringIO()
+        write_row = self.get_row_writer(buffer, fields)
+        for index, row in enumerate(rows, start=1):
+            write_row(row)
+            if index % self.rows_per_chunk == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Запись или список записей в формате выгрузки."""
+        if data is None:
+            return b""
+        records = data if isinstance(data, list) else [data]
+        fields = tuple(dict.fromkeys(key for record in records for key in record))
+        rows = (tuple(record.get(field) for field in fields) for record in records)
+        return "".join(self.stream(fields, rows)).encode(self.charset)
+
+    @abc.abstractmethod
+    def get_row_writer(self, buffer, fields):
+        """Функция записи строки в буфер, заголовок выгрузки записывается сразу."""
+
+
+class CSVRenderer(StreamingRenderer):
+    """Рендерер выгрузки в CSV с заголовком из имен полей."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def get_row_writer(self, buffer, fields):
+        """Запись заголовка и функция записи строки CSV, списки значений объединяются через пробел."""
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        return lambda row: writer.writerow(
+            " ".join(map(str, value)) if isinstance(value, list) else value for value in row
+        )
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Рендерер выгрузки в NDJSON: по одному JSON объекту на строку."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def get_row_writer(self, buffer, fields):
+        """Функция записи строки как JSON объекта."""
+
+        def write_row(row):
+            buffer.write(json.dumps(dict(zip(fields, row)), cls=JSONEncoder, ensure_ascii=False))
+            buffer.write("\n")
+
+        return write_row
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson.
+
+    Вывод совпадает с компактным JSONRenderer. Если запрошен отступ или включен вывод только ASCII,
+    ответ рендерит стандартный JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Рендеринг данных в JSON."""
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
+        # Как и JSONRenderer, экранирует разделители строк, недопустимые в JavaScript.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+class MessagePackEncoder(JSONEncoder):
+    """Кодирование типов, которые msgpack не кодирует сам: UUID - расширением UUID_EXT_TYPE, остальные как в JSON."""
+
+    def default(self, obj):
+        """Значение obj, которое может закодировать msgpack."""
+        if isinstance(obj, uuid.UUID):
+            return msgpack.ExtType(UUID_EXT_TYPE, obj.bytes)
+        return super().default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Рендерер MessagePack.
+
+    UUID кодируются 16 байтами в расширении UUID_EXT_TYPE, даты со временем и часовым поясом - стандартным
+    расширением Timestamp (-1) MessagePack, в том же виде их принимает MessagePackParser. Быстрый путь списка
+    и синхронизация передают рендереру UUID и даты как есть. В ответах сериализаторов prepare_data() возвращает
+    строкам полей UUIDField и DateTimeField исходный тип, поэтому тип поля не зависит от действия и настроек.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    encoder_class = MessagePackEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Рендеринг данных в MessagePack."""
+        if data is None:
+            return b""
+        return msgpack.packb(self.prepare_data(data), default=self.encoder_class().default, datetime=True)
+
+    def prepare_data(self, data, serializer=None):
+        """Данные с UUID и датами сериализаторов в исходных типах.
+
+        Поля находятся по сериализатору, сохраненному в ReturnDict и ReturnList. После кэширования данных
+        сериализатора у них нет, поэтому кэш ответов (ResponseCacheMixin) хранит уже подготовленные данные.
+        """
+        serializer = getattr(data, "serializer", serializer)
+        if isinstance(data, dict):
+            fields = serializer.fields if isinstance(serializer, serializers.Serializer) else {}
+            return {key: self.prepare_value(value, fields.get(key)) for key, value in data.items()}
+        if isinstance(data, list):
+            child = serializer.child if isinstance(serializer, serializers.ListSerializer) else None
+            return [self.prepare_data(item, child) for item in data]
+        return data
+
+    def prepare_value(self, value, field):
+        """Значение поля field сериализатора в исходном типе."""
+        if isinstance(value, str):
+            # Ошибки валидации передаются по имени поля, но не в его формате.
+            try:
+                if isinstance(field, serializers.UUIDField):
+                    return uuid.UUID(value)
+                if isinstance(field, serializers.DateTimeField) and (
+                    getattr(field, "format", api_settings.DATETIME_FORMAT) == ISO_8601
+                ):
+                    return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+            return value
+        if isinstance(field, serializers.ListField) and isinstance(value, list):
+            return [self.prepare_value(item, field.child) for item in value]
+        return self.prepare_data(value, field)
@@ -1,25 +1,52 @@
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
-from api.v1.task_status.serializers import TaskStatusSerializer
-from tasks.models import Task
+from api.v1.task_status.serializers import TaskStatusNestedField, TaskStatusPrimaryKeyField, TaskStatusSerializer
+from classifiers.registry import task_status_registry
+from tasks.models import Task, TaskWithArchive
 
 
 class TaskSerializer(serializers.ModelSerializer):
     """Сериализатор задачи для детального отображения."""
 
-    task_status = TaskStatusSerializer(read_only=True)
+    task_status = TaskStatusNestedField()
 
     class Meta:
         """Метакласс сериализатора задач."""
 
         model = Task
-        fields = ("title", "description", "task_status", "created_at", "updated_at", "complete_before", "completed_at")
-        read_only_fields = ("created_at", "updated_at")
+        fields = (
+            "title",
+            "description",
+            "task_status",
+            "created_at",
+            "updated_at",
+            "complete_before",
+            "completed_at",
+            "overdue_at",
+        )
+        read_only_fields = ("created_at", "updated_at", "overdue_at")
+
+
+class TaskWithArchiveSerializer(TaskSerializer):
+    """Сериализатор задачи для детального отображения вместе с архивом."""
+
+    class Meta(TaskSerializer.Meta):
+        """Метакласс сериализатора задачи с архивом."""
+
+        model = TaskWithArchive
+        fields = (*TaskSerializer.Meta.fields, "archived_at")
+        read_only_fields = fields
 
 
 class TaskWriteSerializer(serializers.ModelSerializer):
     """Сериализатор задач для операций записи."""
 
+    task_status = TaskStatusPrimaryKeyField()
+
     class Meta:
         """Метакласс сериализатора записи для задач."""
 
@@ -28,10 +55,165 @@ class TaskWriteSerializer(serializers.ModelSerializer):
         read_only_fields = ("created_at", "updated_at")
 
 
+class TaskBulkListSerializer(serializers.ListSerializer):
+    """Базовый сериализатор пакета задач с ограничением размера из настройки TASKS_BULK_BATCH_SIZE."""
+
+    def __init__(self, *args, **kwargs):
+        """Инициализация сериализатора с размером пакета по умолчанию."""
+        kwargs.setdefault("allow_empty", False)
+        kwargs.setdefault("max_length", settings.TASKS_BULK_BATCH_SIZE)
+        super().__init__(*args, **kwargs)
+
+
+class TaskBulkCreateListSerializer(TaskBulkListSerializer):
+    """Сериализатор пакетного создания задач."""
+
+    def create(self, validated_data):
+        """Создание всех задач пакета одним INSERT."""
+        return Task.objects.bulk_create(Task(**attrs) for attrs in validated_data)
+
+
+class TaskBulkUpdateListSerializer(TaskBulkListSerializer):
+    """Сериализатор пакетного изменения задач.
+
+    В instance передается кверисет задач пользователя: задачи пакета выбираются из него одним запросом,
+    задачи не из кверисета и повторы id возвращаются как ошибки соответствующих элементов.
+    """
+
+    default_error_messages = {
+        "not_found": "Задача не найдена.",
+        "duplicate": "Задача уже указана в пакете.",
+    }
+
+    def to_internal_value(self, data):
+        """Валидация пакета с предварительной выборкой задач по id элементов."""
+        self.tasks = {}
+        self.seen_ids = set()
+        if isinstance(data, list) and (self.max_length is None or len(data) <= self.max_length):
+            self.tasks = self.instance.in_bulk(self.get_item_ids(data))
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        """Валидация элемента пакета и проверка его id."""
+        attrs = super().run_child_validation(data)
+        pk = attrs.get("id")
+        if pk is None:
+            raise serializers.ValidationError({"id": [self.child.fields["id"].error_messages["required"]]})
+        if pk not in self.tasks:
+            raise serializers.ValidationError({"id": [self.error_messages["not_found"]]})
+        if pk in self.seen_ids:
+            raise serializers.ValidationError({"id": [self.error_messages["duplicate"]]})
+        self.seen_ids.add(pk)
+        return attrs
+
+    def update(self, instance, validated_data):
+        """Изменение всех задач пакета через bulk_update."""
+        # bulk_update не вызывает pre_save полей, поэтому время изменения проставляется явно.
+        now = timezone.now()
+        fields = {"updated_at"}
+        tasks = []
+        for attrs in validated_data:
+            task = self.tasks[attrs.pop("id")]
+            for field_name, value in attrs.items():
+                setattr(task, field_name, value)
+            fields.update(attrs)
+            task.updated_at = now
+            tasks.append(task)
+        Task.objects.bulk_update(tasks, sorted(fields))
+        return tasks
+
+    @staticmethod
+    def get_item_ids(data):
+        """Корректные id элементов пакета."""
+        ids = []
+        for item in data:
+            try:
+                ids.append(uuid.UUID(str(item["id"])))
+            except (TypeError, KeyError, ValueError):
+                continue
+        return ids
+
+
+class TaskBulkCreateSerializer(TaskWriteSerializer):
+    """Сериализатор элемента пакетного создания задач."""
+
+    class Meta(TaskWriteSerializer.Meta):
+        """Метакласс сериализатора пакетного создания задач."""
+
+        list_serializer_class = TaskBulkCreateListSerializer
+
+
+class TaskBulkUpdateSerializer(TaskWriteSerializer):
+    """Сериализатор элемента пакетного изменения задач."""
+
+    id = serializers.UUIDField(help_text="Идентификатор задачи")
+
+    class Meta(TaskWriteSerializer.Meta):
+        """Метакласс сериализатора пакетного изменения задач."""
+
+        fields = ("id",) + TaskWriteSerializer.Meta.fields
+        list_serializer_class = TaskBulkUpdateListSerializer
+
+
+class TaskBulkDeleteSerializer(serializers.Serializer):
+    """Сериализатор пакетного удаления задач.
+
+    В instance передается кверисет задач пользователя, id вне него возвращаются как ошибки по индексу элемента.
+    """
+
+    default_error_messages = {
+        "not_found": "Задача не найдена.",
+        "duplicate": "Задача уже указана в пакете.",
+    }
+
+    def get_fields(self):
+        """Поля сериализатора с размером пакета из настроек."""
+        fields = super().get_fields()
+        fields["ids"] = serializers.ListField(
+            child=serializers.UUIDField(),
+            allow_empty=False,
+            max_length=settings.TASKS_BULK_BATCH_SIZE,
+            help_text="Идентификаторы удаляемых задач",
+        )
+        return fields
+
+    def validate_ids(self, ids):
+        """Проверка, что все задачи принадлежат пользователю и указаны по одному разу."""
+        existing = set(self.instance.filter(id__in=ids).values_list("id", flat=True))
+        errors = {}
+        seen_ids = set()
+        for index, pk in enumerate(ids):
+            if pk not in existing:
+                errors[index] = [self.error_messages["not_found"]]
+            elif pk in seen_ids:
+                errors[index] = [self.error_messages["duplicate"]]
+            seen_ids.add(pk)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return ids
+
+
+class TaskBulkStatusUpdateSerializer(serializers.Serializer):
+    """Сериализатор смены статуса пакета задач."""
+
+    task_status = TaskStatusPrimaryKeyField(help_text="Новый статус задач")
+
+    def get_fields(self):
+        """Поля сериализатора с размером пакета из настроек."""
+        fields = super().get_fields()
+        fields["ids"] = serializers.ListField(
+            child=serializers.UUIDField(),
+            allow_empty=False,
+            max_length=settings.TASKS_BULK_BATCH_SIZE,
+            help_text="Идентификаторы задач",
+        )
+        return fields
+
+
 class TaskListSerializer(serializers.ModelSerializer):
     """Сериализатор задач для представления в списках."""
 
-    task_status = TaskStatusSerializer(read_only=True)
+    task_status = TaskStatusNestedField()
 
     class Meta:
         """Метакласс сериализатора задач."""
@@ -40,11 +222,118 @@ class TaskListSerializer(serializers.ModelSerializer):
         fields = ("id", "title", "task_status", "complete_before", "completed_at")
 
 
+class TaskWithArchiveListSerializer(TaskListSerializer):
+    """Сериализатор задач для списка вместе с архивом."""
+
+    class Meta(TaskListSerializer.Meta):
+        """Метакласс сериализатора задач с архивом."""
+
+        model = TaskWithArchive
+        fields = (*TaskListSerializer.Meta.fields, "archived_at")
+
+
+def compact_fields(fields):
+    """Поля компактного формата: идентификатор статуса task_status_id вместо вложенного статуса task_status."""
+    return tuple("task_status_id" if name == "task_status" else name for name in fields)
+
+
+class TaskListCompactSerializer(TaskListSerializer):
+    """Сериализатор задач для списков в компактном формате: статусы передаются один раз в included."""
+
+    task_status = None
+    task_status_id = serializers.IntegerField(read_only=True, help_text="Идентификатор статуса в included")
+
+    class Meta(TaskListSerializer.Meta):
+        """Метакласс сериализатора задач в компактном формате."""
+
+        fields = compact_fields(TaskListSerializer.Meta.fields)
+
+
+class TaskWithArchiveListCompactSerializer(TaskWithArchiveListSerializer):
+    """Сериализатор задач для списка вместе с архивом в компактном формате."""
+
+    task_status = None
+    task_status_id = serializers.IntegerField(read_only=True, help_text="Идентификатор статуса в included")
+
+    class Meta(TaskWithArchiveListSerializer.Meta):
+        """Метакласс сериализатора задач с архивом в компактном формате."""
+
+        fields = compact_fields(TaskWithArchiveListSerializer.Meta.fields)
+
+
+class TaskIncludedSerializer(serializers.Serializer):
+    """Сериализатор связанных объектов ответа в компактном формате."""
+
+    task_statuses = serializers.DictField(
+        child=TaskStatusSerializer(), help_text="Статусы задач ответа по идентификатору"
+    )
+
+    @staticmethod
+    def get_included(tasks):
+        """Статусы задач из кэша классификатора, каждый один раз."""
+        task_status_ids = sorted({task["task_status_id"] for task in tasks if task.get("task_status_id") is not None})
+        return {
+            "task_statuses": {
+                str(task_status_id): TaskStatusSerializer(task_status_registry.get(task_status_id)).data
+                for task_status_id in task_status_ids
+            }
+        }
+
+
 class TaskStatusUpdateSerializer(serializers.ModelSerializer):
     """Серилазиатор статуса задач."""
 
+    task_status = TaskStatusPrimaryKeyField()
+
     class Meta:
         """Метакласс сериализатора."""
 
         model = Task
         fields = ("task_status",)
+
+
+class TaskSummaryStatusSerializer(serializers.Serializer):
+    """Сериализатор количества задач в статусе."""
+
+    id = serializers.IntegerField(help_text="Идентификатор статуса")
+    name = serializers.CharField(help_text="Наименование статуса")
+    count = serializers.IntegerField(help_text="Количество задач")
+
+
+class TaskSummarySerializer(serializers.Serializer):
+    """Сериализатор сводки задач пользователя."""
+
+    total = serializers.IntegerField(help_text="Всего задач")
+    overdue = serializers.IntegerField(help_text="Просроченные задачи: не завершены, срок прошел")
+    statuses = TaskSummaryStatusSerializer(many=True, help_text="Количество задач по статусам")
+
+
+class TaskSyncSerializer(TaskSerializer):
+    """Сериализатор задачи для синхронизации клиентов."""
+
+    class Meta(TaskSerializer.Meta):
+        """Метакласс сериализатора задач для синхронизации."""
+
+        fields = ("id", *TaskSerializer.Meta.fields)
+
+
+class TaskSyncCompactSerializer(TaskSyncSerializer):
+    """Сериализатор задачи для синхронизации в компактном формате."""
+
+    task_status = None
+    task_status_id = serializers.IntegerField(read_only=True, help_text="Идентификатор статуса в included")
+
+    class Meta(TaskSyncSerializer.Meta):
+        """Метакласс сериализатора задач для синхронизации в компактном формате."""
+
+        fields = compact_fields(TaskSyncSerializer.Meta.fields)
+
+
+class TaskSyncResponseSerializer(serializers.Serializer):
+    """Сериализатор ответа синхронизации задач."""
+
+    tasks = TaskSyncSerializer(many=True, help_text="Задачи, созданные или измененные после курсора")
+    deleted = serializers.ListField(child=serializers.UUIDField(), help_text="Идентификаторы удаленных задач")
+    cursor = serializers.CharField(help_text="Курсор следующей синхронизации (параметр updated_since)")
+    has_more = serializers.BooleanField(help_text="Есть еще изменения: запросить следующую страницу по cursor")
+    included = TaskIncludedSerializer(required=False, help_text="Статусы задач страницы в компактном формате")
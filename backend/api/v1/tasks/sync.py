@@ -0,0 +1,107 @@
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections, router
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from api.v1.tasks.encoders import RowEncoder
+from api.v1.tasks.serializers import TaskIncludedSerializer, TaskSyncCompactSerializer, TaskSyncSerializer
+from tasks.models import Task, TaskTombstone
+
+
+class SyncCursorExpired(APIException):
+    """Курсор синхронизации старше срока хранения записей об удаленных задачах."""
+
+    status_code = status.HTTP_410_GONE
+    default_detail = "Курсор синхронизации устарел, требуется полная синхронизация без updated_since."
+    default_code = "sync_cursor_expired"
+
+
+@dataclass(frozen=True)
+class SyncCursor:
+    """Позиция синхронизации задач пользователя.
+
+    since - нижняя граница номеров транзакций изменений, которые клиент еще не получил. Следующая
+    синхронизация начинается с xmin снимка snapshot_xmin, снятого перед чтением первой страницы: все транзакции
+    с меньшим номером к этому моменту завершены и попали в ответ, а незавершенные получат номер не меньше xmin
+    и будут переданы в следующий раз. after - ключ (change_txid, id) последней переданной задачи, если изменения
+    не уместились в одну страницу.
+    """
+
+    since: int
+    snapshot_xmin: int
+    after: tuple[int, uuid.UUID] | None = None
+
+    signer = signing.TimestampSigner(salt="api.v1.tasks.sync")
+
+    def encode(self):
+        """Подписанное строковое представление курсора."""
+        parts = [self.since, self.snapshot_xmin]
+        if self.after is not None:
+            parts.extend((self.after[0], self.after[1].hex))
+        return self.signer.sign(".".join(map(str, parts)))
+
+    @classmethod
+    def decode(cls, value):
+        """Курсор из строки. Курсор старше TASKS_TOMBSTONE_RETENTION_DAYS дней не принимается."""
+        max_age = timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS)
+        try:
+            parts = cls.signer.unsign(value, max_age=max_age).split(".")
+            after = (int(parts[2]), uuid.UUID(parts[3])) if len(parts) == 4 else None
+            return cls(int(parts[0]), int(parts[1]), after)
+        except signing.SignatureExpired:
+            raise SyncCursorExpired
+        except (signing.BadSignature, ValueError, IndexError):
+            raise ValidationError({"updated_since": ["Некорректный курсор синхронизации."]})
+
+
+def get_snapshot_xmin(using):
+    """Номер самой старой транзакции, незавершенной на момент снимка базы using."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0]
+
+
+def get_sync_page(user_id, cursor=None, page_size=None, compact=False):
+    """Изменения задач пользователя после курсора: измененные задачи, id удаленных задач и следующий курсор.
+
+    Задачи выбираются по индексу (user, change_txid, id) страницами по page_size (по умолчанию
+    TASKS_SYNC_PAGE_SIZE). Удаленные задачи передаются на последней странице. Задачи, измененные во время
+    синхронизации, могут быть переданы повторно, поэтому клиент применяет изменения по id. В компактном формате
+    (compact) задачи содержат task_status_id, а статусы передаются один раз в included.
+
+    Снимок, задачи и удаленные задачи читаются из одной базы: xmin реплики и основной базы различаются.
+    """
+    page_size = page_size or settings.TASKS_SYNC_PAGE_SIZE
+    using = router.db_for_read(Task)
+    since = cursor.since if cursor else 0
+    snapshot_xmin = cursor.snapshot_xmin if cursor and cursor.after else get_snapshot_xmin(using)
+    queryset = Task.objects.using(using).filter(user_id=user_id, change_txid__gte=since)
+    if cursor and cursor.after:
+        change_txid, pk = cursor.after
+        queryset = queryset.filter(Q(change_txid__gt=change_txid) | Q(change_txid=change_txid, pk__gt=pk))
+
+    encoder = RowEncoder(TaskSyncCompactSerializer if compact else TaskSyncSerializer)
+    fields = dict.fromkeys((*encoder.values_fields, "id", "change_txid"))
+    rows = list(queryset.order_by("change_txid", "id").values(*fields)[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    deleted = []
+    if has_more:
+        next_cursor = SyncCursor(since, snapshot_xmin, (rows[-1]["change_txid"], rows[-1]["id"]))
+    else:
+        if since:
+            tombstones = TaskTombstone.objects.using(using).filter(user_id=user_id, deleted_txid__gte=since)
+            deleted = list(dict.fromkeys(tombstones.order_by("deleted_txid").values_list("task_id", flat=True)))
+        next_cursor = SyncCursor(snapshot_xmin, snapshot_xmin)
+    tasks = encoder.encode(rows)
+    page = {"tasks": tasks, "deleted": deleted, "cursor": next_cursor.encode(), "has_more": has_more}
+    if compact:
+        page["included"] = TaskIncludedSerializer.get_included(tasks)
+    return page
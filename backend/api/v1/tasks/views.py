@@ -1,39 +1,185 @@
-from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
-from rest_framework import filters, permissions, status, viewsets
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import parse_header_parameters
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, extend_schema_view
+from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from api.v1.tasks.filters import TaskFilter
+from api.v1.tasks.filters import TaskFilter, TaskFilterBackend, TaskOrderingFilter, TaskSearchFilter
+from api.v1.tasks.mixins import (
+    AsyncViewSetMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    ResponseCacheMixin,
+    SparseFieldsetMixin,
+)
+from api.v1.tasks.pagination import TaskCursorPagination
+from api.v1.tasks.parsers import MessagePackParser
 from api.v1.tasks.permissions import IsTaskOwnerOrForbidden
-from api.v1.tasks.serializers import TaskListSerializer, TaskSerializer, TaskStatusUpdateSerializer, TaskWriteSerializer
-from tasks.models import Task
+from api.v1.tasks.renderers import CSVRenderer, MessagePackRenderer, NDJSONRenderer, ORJSONRenderer
+from api.v1.tasks.serializers import (
+    TaskBulkCreateSerializer,
+    TaskBulkDeleteSerializer,
+    TaskBulkStatusUpdateSerializer,
+    TaskBulkUpdateSerializer,
+    TaskIncludedSerializer,
+    TaskListCompactSerializer,
+    TaskListSerializer,
+    TaskSerializer,
+    TaskStatusUpdateSerializer,
+    TaskSummarySerializer,
+    TaskSyncResponseSerializer,
+    TaskWithArchiveListCompactSerializer,
+    TaskWithArchiveListSerializer,
+    TaskWithArchiveSerializer,
+    TaskWriteSerializer,
+)
+from api.v1.tasks.sync import SyncCursor, get_sync_page
+from api.v1.users.authentication import AsyncJWTAuthentication
+from classifiers.registry import task_status_registry
+from core.query_budget import query_budget
+from tasks.models import Task, TaskWithArchive
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        str,
+        description="Поля ответа через запятую, остальные поля не читаются из базы. Например: id,title,task_status",
+    ),
+    OpenApiParameter("exclude", str, description="Поля, исключаемые из ответа, через запятую. Например: description"),
+]
+
+COMPACT_PARAMETER = OpenApiParameter(
+    "compact",
+    bool,
+    description=(
+        "Компактный формат: задачи содержат task_status_id, а статусы передаются один раз в included.task_statuses. "
+        "Также включается заголовком Accept: application/json; compact=true"
+    ),
+)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+@query_budget(
+    list=2,
+    retrieve=2,
+    create=1,
+    update=2,
+    partial_update=2,
+    destroy=2,
+    change_status=1,
+    bulk_create=1,
+    bulk_update=2,
+    bulk_destroy=2,
+    bulk_change_status=1,
+    # Серверный курсор выполняется один раз, пачки строк читаются без новых запросов.
+    export=1,
+    summary=1,
+    sync=3,
+)
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "include_archived", bool, description="Включить в список задачи из архива (поле archived_at)"
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+            COMPACT_PARAMETER,
+        ]
+    ),
+    retrieve=extend_schema(
+        parameters=[
+            OpenApiParameter("include_archived", bool, description="Искать задачу и в архиве (поле archived_at)"),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ]
+    ),
+)
+class TaskViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     """Вьюсет задач."""
 
     permission_classes = [IsTaskOwnerOrForbidden, permissions.IsAuthenticated]
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter)
+    filter_backends = (TaskFilterBackend, TaskSearchFilter, TaskOrderingFilter)
     search_fields = ("title", "description")
     ordering = ("-created_at",)
-    ordering_fields = "__all__"
+    # Сортировка разрешена только по полям, для которых есть составной индекс (user, поле).
+    ordering_fields = ("created_at", "updated_at", "complete_before", "completed_at")
+    # Владелец задачи проверяется по user_id (IsTaskOwnerOrForbidden).
+    sparse_required_columns = ("user",)
     filterset_class = TaskFilter
+    pagination_class = TaskCursorPagination
+    renderer_classes = (ORJSONRenderer, MessagePackRenderer, BrowsableAPIRenderer)
+    parser_classes = (*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser)
+    export_fields = (
+        "id",
+        "title",
+        "description",
+        "task_status",
+        "task_status_name",
+        "created_at",
+        "updated_at",
+        "complete_before",
+        "completed_at",
+    )
 
     def get_queryset(self):
         """Получение кверисета с фильтрацией по пользователю."""
         if not self.request.user.is_authenticated:
             return Task.objects.none()
-        return Task.objects.filter(user=self.request.user).select_related("task_status")
+        model = TaskWithArchive if self.include_archived() else Task
+        return model.objects.filter(user=self.request.user).defer("search_vector")
+
+    def include_archived(self):
+        """Запрошено ли чтение вместе с архивом (параметр include_archived), только для списка и детального просмотра.
+
+        Изменяющие действия всегда работают с таблицей задач, архивная задача для них не найдена.
+        """
+        include_archived = self.request.query_params.get("include_archived", "")
+        return self.action in ("list", "retrieve") and include_archived.lower() in ("true", "1")
+
+    def compact(self):
+        """Запрошен ли компактный формат списка или синхронизации: параметр compact или параметр типа ответа."""
+        if self.action not in ("list", "sync"):
+            return False
+        compact = self.request.query_params.get("compact")
+        if compact is None:
+            _, params = parse_header_parameters(getattr(self.request, "accepted_media_type", None) or "")
+            compact = params.get("compact", "")
+        return compact.lower() in ("true", "1")
 
     def get_serializer_class(self):
         """Получение класса сериализатора в зависимости от типа запроса."""
         if self.action == "list":
-            return TaskListSerializer
+            if self.include_archived():
+                return TaskWithArchiveListCompactSerializer if self.compact() else TaskWithArchiveListSerializer
+            return TaskListCompactSerializer if self.compact() else TaskListSerializer
         elif self.action == "retrieve":
-            return TaskSerializer
+            return TaskWithArchiveSerializer if self.include_archived() else TaskSerializer
+        elif self.action == "bulk_create":
+            return TaskBulkCreateSerializer
+        elif self.action == "bulk_update":
+            return TaskBulkUpdateSerializer
+        elif self.action == "bulk_destroy":
+            return TaskBulkDeleteSerializer
+        elif self.action == "change_status":
+            return TaskStatusUpdateSerializer
+        elif self.action == "bulk_change_status":
+            return TaskBulkStatusUpdateSerializer
         return TaskWriteSerializer
 
+    def get_paginated_response(self, data):
+        """Страница списка, в компактном формате - со статусами задач страницы в included."""
+        response = super().get_paginated_response(data)
+        if self.compact():
+            response.data["included"] = TaskIncludedSerializer.get_included(data)
+        return response
+
     def perform_create(self, serializer):
         """Создание задачи."""
         serializer.save(user=self.request.user)
@@ -45,11 +191,222 @@ class TaskViewSet(viewsets.ModelViewSet):
     @extend_schema(request=TaskStatusUpdateSerializer, responses={status.HTTP_200_OK: TaskSerializer})
     @action(detail=True, methods=["PATCH"], serializer_class=TaskStatusUpdateSerializer)
     def change_status(self, request, pk=None):
-        """Обновление статуса задачи."""
-        task = self.get_object()
-        serializer = self.get_serializer(task, data=request.data, partial=True)
-        response_serializer = TaskSerializer(task)
+        """Обновление статуса задачи.
+
+        Выполняется одним UPDATE по задаче пользователя, ответ строится по новому состоянию из RETURNING.
+        """
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            task_id = uuid.UUID(str(pk))
+        except ValueError:
+            raise Http404
+        tasks = Task.objects.change_status(request.user.id, [task_id], serializer.validated_data["task_status"].id)
+        if not tasks:
+            raise Http404
+        return Response(TaskSerializer(tasks[0]).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=TaskBulkStatusUpdateSerializer, responses={status.HTTP_200_OK: TaskListSerializer(many=True)}
+    )
+    @action(detail=False, methods=["PATCH"], url_path="bulk/change_status")
+    def bulk_change_status(self, request):
+        """Смена статуса пакета задач одним UPDATE.
+
+        Если часть задач не найдена у пользователя, изменения откатываются, а в ответе возвращаются
+        ошибки по индексам id.
+        """
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data["ids"]
+        with transaction.atomic():
+            tasks = Task.objects.change_status(request.user.id, ids, serializer.validated_data["task_status"].id)
+            changed = {task.id: task for task in tasks}
+            errors = {index: ["Задача не найдена."] for index, pk in enumerate(ids) if pk not in changed}
+            if errors:
+                transaction.set_rollback(True)
+                return Response({"ids": errors}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = [changed[pk] for pk in dict.fromkeys(ids)]
+        return Response(TaskListSerializer(tasks, many=True).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=TaskBulkCreateSerializer(many=True), responses={status.HTTP_201_CREATED: TaskListSerializer(many=True)}
+    )
+    @action(detail=False, methods=["POST"], url_path="bulk")
+    def bulk_create(self, request):
+        """Пакетное создание задач.
+
+        Пакет валидируется целиком и сохраняется одной транзакцией: при ошибке в любом элементе
+        не создается ни одна задача, а в ответе возвращается список ошибок по элементам.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        if serializer.is_valid():
+            with transaction.atomic():
+                tasks = serializer.save(user=request.user)
+            return Response(TaskListSerializer(tasks, many=True).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(
+        request=TaskBulkUpdateSerializer(many=True, partial=True),
+        responses={status.HTTP_200_OK: TaskListSerializer(many=True)},
+    )
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Пакетное частичное изменение задач по id."""
+        serializer = self.get_serializer(self.get_queryset(), data=request.data, many=True, partial=True)
+        if serializer.is_valid():
+            with transaction.atomic():
+                tasks = serializer.save()
+            return Response(TaskListSerializer(tasks, many=True).data, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(request=TaskBulkDeleteSerializer, responses={status.HTTP_200_OK: TaskBulkDeleteSerializer})
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        """Пакетное удаление задач по id одним DELETE."""
+        queryset = self.get_queryset()
+        serializer = self.get_serializer(queryset, data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            return Response(response_serializer.data, status=status.HTTP_200_OK)
+            queryset.filter(id__in=serializer.validated_data["ids"]).delete()
+            return Response(serializer.validated_data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(responses={status.HTTP_200_OK: TaskSummarySerializer})
+    @action(detail=False, methods=["GET"], pagination_class=None, filter_backends=())
+    def summary(self, request):
+        """Сводка задач пользователя: всего, просроченные и количество по каждому статусу.
+
+        Строится одним запросом к счетчикам задач, время ответа не зависит от количества задач.
+        В ответе есть все статусы, в том числе без задач.
+        """
+        counts, overdue = Task.objects.summary(request.user.id, use_counters=settings.TASKS_SUMMARY_COUNTERS)
+        statuses = [
+            {"id": task_status.id, "name": task_status.name, "count": counts.get(task_status.id, 0)}
+            for task_status in task_status_registry.all()
+        ]
+        summary = {"total": sum(counts.values()), "overdue": overdue, "statuses": statuses}
+        return Response(TaskSummarySerializer(summary).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("updated_since", str, description="Курсор из ответа предыдущей синхронизации"),
+            COMPACT_PARAMETER,
+        ],
+        responses={status.HTTP_200_OK: TaskSyncResponseSerializer},
+    )
+    @action(detail=False, methods=["GET"], pagination_class=None, filter_backends=())
+    def sync(self, request):
+        """Изменения задач для синхронизации клиента.
+
+        Без updated_since возвращает все задачи, с курсором из предыдущего ответа - задачи, созданные или
+        измененные после него, и id удаленных задач. Пока has_more, следующая страница запрашивается по cursor.
+        Курсор старше срока хранения записей об удаленных задачах отклоняется с кодом 410.
+        """
+        updated_since = request.query_params.get("updated_since")
+        cursor = SyncCursor.decode(updated_since) if updated_since else None
+        return Response(get_sync_page(request.user.id, cursor, compact=self.compact()), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        responses={
+            (status.HTTP_200_OK, CSVRenderer.media_type): OpenApiResponse(OpenApiTypes.STR),
+            (status.HTTP_200_OK, NDJSONRenderer.media_type): OpenApiResponse(OpenApiTypes.STR),
+        }
+    )
+    @action(detail=False, methods=["GET"], renderer_classes=[CSVRenderer, NDJSONRenderer], pagination_class=None)
+    def export(self, request):
+        """Потоковая выгрузка задач пользователя в CSV или NDJSON.
+
+        Принимает те же параметры фильтрации, поиска и сортировки, что и список. Строки читаются
+        серверным курсором пачками по TASKS_EXPORT_CHUNK_SIZE и кодируются по мере отправки,
+        поэтому память процесса не зависит от количества задач.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(self.export_fields, self.get_export_rows(queryset)),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+
+    def get_export_rows(self, queryset):
+        """Строки выгрузки в порядке export_fields без создания экземпляров модели."""
+        datetime_field = serializers.DateTimeField()
+        rows = queryset.values_list(
+            "id",
+            "title",
+            "description",
+            "task_status_id",
+            "created_at",
+            "updated_at",
+            "complete_before",
+            "completed_at",
+        ).iterator(chunk_size=settings.TASKS_EXPORT_CHUNK_SIZE)
+        for task_id, title, description, task_status_id, *dates in rows:
+            task_status = task_status_registry.get(task_status_id)
+            yield (
+                task_id,
+                title,
+                description,
+                task_status_id,
+                task_status.name if task_status else None,
+                *(datetime_field.to_representation(value) if value else None for value in dates),
+            )
+
+
+class AsyncTaskViewSet(AsyncViewSetMixin, TaskViewSet):
+    """Вьюсет задач с асинхронными списком, детальным просмотром и созданием для запуска под ASGI.
+
+    Подключается вместо TaskViewSet настройкой TASKS_ASYNC_VIEWS. Остальные действия выполняются
+    синхронными обработчиками TaskViewSet. Асинхронные список и детальный просмотр не используют кэш ответов,
+    изменения задач сбрасывают его так же, как в TaskViewSet.
+    """
+
+    authentication_classes = [AsyncJWTAuthentication]
+
+    async def list(self, request, *args, **kwargs):
+        """Список задач с валидаторами условного запроса."""
+        await task_status_registry.arefresh()
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = self.get_etag(await self.aget_list_version())
+        not_modified = self.get_conditional_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        page = await self.paginator.apaginate_queryset(self.get_list_queryset(queryset), request, view=self)
+        response = self.get_paginated_response(self.serialize_list(page))
+        return self.set_validators(response, etag)
+
+    async def retrieve(self, request, *args, **kwargs):
+        """Задача с валидаторами условного запроса, выбранная одним запросом."""
+        await task_status_registry.arefresh()
+        instance = await self.aget_object()
+        etag = self.get_etag(getattr(instance, self.validator_field))
+        not_modified = self.get_conditional_response(etag, getattr(instance, self.validator_field))
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return self.set_validators(Response(serializer.data), etag, getattr(instance, self.validator_field))
+
+    async def create(self, request, *args, **kwargs):
+        """Создание задачи через acreate."""
+        data = request.data
+        await task_status_registry.arefresh(data.get("task_status") if isinstance(data, dict) else None)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.instance = await Task.objects.acreate(user=request.user, **serializer.validated_data)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    async def aget_object(self):
+        """Асинхронный аналог get_object."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, ValidationError, ValueError, TypeError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,81 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.metrics import exempt_from_budget
+from users.cache import authenticated_user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT с загрузкой пользователя из кэша процесса (AUTH_USER_CACHE_TTL).
+
+    Пользователь загружается из базы только при промахе кэша, и этот запрос не учитывается в бюджете запросов
+    представления. Проверки активности и отзыва токена после смены пароля выполняются для каждого запроса,
+    в том числе для пользователя из кэша.
+    """
+
+    def get_user_id(self, validated_token):
+        """Идентификатор пользователя из токена."""
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def get_user(self, validated_token):
+        """Пользователь из кэша или из базы с проверками JWTAuthentication."""
+        user_id = self.get_user_id(validated_token)
+        user = authenticated_user_cache.get(user_id)
+        if user is None:
+            generation = authenticated_user_cache.generation
+            try:
+                with exempt_from_budget():
+                    user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            authenticated_user_cache.set(user_id, user, generation)
+        return self.check_user(user, validated_token)
+
+    def check_user(self, user, validated_token):
+        """Проверяет, что пользователь активен и токен не отозван сменой пароля."""
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """Аутентификация по JWT с асинхронной загрузкой пользователя для асинхронных представлений."""
+
+    async def aauthenticate(self, request):
+        """Асинхронный вариант authenticate: разбор токена без обращений к базе и загрузка пользователя через aget."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Асинхронный вариант get_user: при промахе кэша пользователь загружается через aget."""
+        user_id = self.get_user_id(validated_token)
+        user = authenticated_user_cache.get(user_id)
+        if user is None:
+            generation = authenticated_user_cache.generation
+            try:
+                with exempt_from_budget():
+                    user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            authenticated_user_cache.set(user_id, user, generation)
+        return self.check_user(user, validated_token)
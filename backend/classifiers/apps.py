@@ -6,3 +6,7 @@ class ClassifiersConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "classifiers"
+
+    def ready(self):
+        """Подключение сигналов приложения."""
+        from classifiers import signals  # noqa: F401
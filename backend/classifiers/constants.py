@@ -0,0 +1,2 @@
+# Идентификатор статуса "Выполнено" из миграции 0002_data_migtation.
+COMPLETED_TASK_STATUS_ID = 1
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from classifiers.models import TaskStatus
+from core.metrics import exempt_from_budget
+
+
+class TaskStatusRegistry:
+    """Кэш классификатора статусов задач в памяти процесса.
+
+    Статусы перечитываются из базы не чаще раза в TASK_STATUS_CACHE_CHECK_INTERVAL секунд: классификатор
+    состоит из нескольких строк, а база - единственное состояние, общее для всех процессов при любом
+    CACHE_BACKEND. Сигналы модели сбрасывают копию процесса, изменившего статусы, сразу, остальные процессы
+    видят изменение не позже чем через интервал. Неизвестный id статуса перечитывает статусы раньше интервала, но
+    не раньше чем через TASK_STATUS_CACHE_MISS_INTERVAL секунд после последнего чтения: иначе запросы
+    с несуществующим id обращались бы к базе каждый раз.
+    """
+
+    def __init__(self):
+        """Инициализация пустого кэша."""
+        self._lock = threading.Lock()
+        self._statuses: dict[int, TaskStatus] | None = None
+        self._checked_at = 0.0
+
+    def _is_fresh(self, statuses: dict[int, TaskStatus] | None, now: float) -> bool:
+        return statuses is not None and now - self._checked_at < settings.TASK_STATUS_CACHE_CHECK_INTERVAL
+
+    def _can_force(self, now: float) -> bool:
+        # Чтение статусов в этом же вызове уже сделано: now совпадает со временем последнего чтения.
+        elapsed = now - self._checked_at
+        return elapsed > 0 and elapsed >= settings.TASK_STATUS_CACHE_MISS_INTERVAL
+
+    def _get_statuses(self, force_check: bool = False) -> dict[int, TaskStatus]:
+        now = time.monotonic()
+        statuses = self._statuses
+        if self._is_fresh(statuses, now) and not (force_check and self._can_force(now)):
+            return statuses
+        with self._lock, exempt_from_budget():
+            if not self._is_fresh(self._statuses, now) or (force_check and self._can_force(now)):
+                self._statuses = {task_status.pk: task_status for task_status in TaskStatus.objects.order_by("pk")}
+                self._checked_at = now
+            return self._statuses
+
+    async def arefresh(self, pk=None) -> None:
+        """При необходимости перечитывает статусы вне event loop.
+
+        Вызывается асинхронными представлениями перед синхронными all() и get(), чтобы те не обращались
+        к базе из event loop. Если локальная копия свежая и содержит статус pk (если он задан), переключения
+        в поток не происходит.
+        """
+        statuses = self._statuses
+        if not self._is_fresh(statuses, time.monotonic()):
+            await sync_to_async(self._get_statuses)()
+        elif pk is not None and self._to_pk(pk) not in statuses and self._can_force(time.monotonic()):
+            await sync_to_async(self._get_statuses)(force_check=True)
+
+    @staticmethod
+    def _to_pk(pk) -> int | None:
+        try:
+            return int(pk)
+        except (TypeError, ValueError):
+            return None
+
+    def all(self) -> list[TaskStatus]:
+        """Все статусы задач в порядке id."""
+        return list(self._get_statuses().values())
+
+    def get(self, pk) -> TaskStatus | None:
+        """Статус задачи по id или None, если такого статуса нет."""
+        pk = self._to_pk(pk)
+        if pk is None:
+            return None
+        task_status = self._get_statuses().get(pk)
+        if task_status is None and not self._in_event_loop():
+            # Статус мог появиться в другом процессе после последнего чтения статусов. В event loop база
+            # недоступна, асинхронные представления перечитывают статусы заранее через arefresh(pk).
+            task_status = self._get_statuses(force_check=True).get(pk)
+        return task_status
+
+    @staticmethod
+    def _in_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def choices(self) -> list[tuple[int, str]]:
+        """Варианты выбора статуса для форм и фильтров."""
+        return [(task_status.pk, task_status.name) for task_status in self.all()]
+
+    def clear(self) -> None:
+        """Сбрасывает локальную копию статусов текущего процесса."""
+        with self._lock:
+            self._statuses = None
+
+
+task_status_registry = TaskStatusRegistry()
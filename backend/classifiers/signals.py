@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from classifiers.models import TaskStatus
+from classifiers.registry import task_status_registry
+
+
+@receiver(post_save, sender=TaskStatus)
+@receiver(post_delete, sender=TaskStatus)
+def invalidate_task_status_registry(**kwargs):
+    """Сбрасывает кэш статусов задач процесса при их изменении и еще раз после фиксации транзакции.
+
+    Второй сброс нужен, если до фиксации статусы успел прочитать другой поток процесса.
+    """
+    task_status_registry.clear()
+    transaction.on_commit(task_status_registry.clear)
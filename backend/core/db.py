@@ -0,0 +1,29 @@
+from django.db import connections
+
+
+def get_pool_stats(alias="default"):
+    """Метрики пула соединений базы или None, если пул не настроен.
+
+    Метрики строятся по get_stats() пула psycopg 3: in_use - выданные соединения, idle - свободные,
+    waiting - запросы в очереди за соединением, wait_ms - суммарное время ожидания соединения,
+    timeouts - запросы, не дождавшиеся соединения.
+    """
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    return {
+        "min_size": stats["pool_min"],
+        "max_size": stats["pool_max"],
+        "size": stats["pool_size"],
+        "in_use": stats["pool_size"] - stats["pool_available"],
+        "idle": stats["pool_available"],
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "wait_ms": stats.get("requests_wait_ms", 0),
+        "avg_wait_ms": stats.get("requests_wait_ms", 0) / requests if requests else 0.0,
+        "timeouts": stats.get("requests_errors", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
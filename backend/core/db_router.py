@@ -0,0 +1,49 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Разрешено ли текущему запросу читать с реплик. Устанавливается ReplicaRoutingMiddleware, вне запросов
+# (команды, фоновые задачи) чтение идет из default.
+read_from_replicas = ContextVar("read_from_replicas", default=False)
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    """Разрешает или запрещает чтение с реплик внутри блока."""
+    token = read_from_replicas.set(enabled)
+    try:
+        yield
+    finally:
+        read_from_replicas.reset(token)
+
+
+class ReplicaRouter:
+    """Маршрутизация чтения на реплики из DATABASE_REPLICAS.
+
+    Запись всегда идет в default. Чтение идет на случайную реплику, только если его разрешил запрос
+    и соединение default не находится в транзакции: внутри транзакции чтение должно видеть ее изменения.
+    Миграции применяются только к default.
+    """
+
+    def db_for_read(self, model, **hints):
+        """База для чтения модели."""
+        if not settings.DATABASE_REPLICAS or not read_from_replicas.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        """База для записи модели."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Связи между объектами разрешены: на репликах те же данные, что в default."""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Миграции только для default."""
+        return db == DEFAULT_DB_ALIAS
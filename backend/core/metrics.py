@@ -0,0 +1,285 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# Границы корзин гистограмм: время в секундах и количество запросов к базе.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Точки сохранения вложенных atomic() появляются, например, когда запрос выполняется внутри транзакции теста,
+# и не учитываются в бюджете запросов.
+SAVEPOINT_STATEMENTS = ("SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+
+
+@dataclass
+class RequestTiming:
+    """Замеры обработки одного запроса."""
+
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_time: float = 0.0
+    # Запросы заполнения кэшей процесса (пользователь, статусы), которые не учитываются в бюджете запросов.
+    exempt_queries: int = 0
+    sections: dict[str, float] = field(default_factory=dict)
+
+    def add(self, name: str, duration: float) -> None:
+        """Добавляет время к именованному участку обработки."""
+        self.sections[name] = self.sections.get(name, 0.0) + duration
+
+
+# Замеры текущего запроса. sync_to_async и async_to_sync копируют контекст, поэтому запросы к базе
+# в потоках асинхронных представлений учитываются в замерах того же запроса.
+current_timing: ContextVar[RequestTiming | None] = ContextVar("current_timing", default=None)
+
+
+@contextmanager
+def measure(name: str):
+    """Учитывает время блока в замерах текущего запроса."""
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+
+@contextmanager
+def exempt_from_budget():
+    """Исключает запросы блока из бюджета запросов представления (core.query_budget)."""
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+    queries = timing.db_queries
+    try:
+        yield
+    finally:
+        timing.exempt_queries += timing.db_queries - queries
+
+
+def record_query(execute, sql, params, many, context):
+    """Обертка выполнения SQL (connection.execute_wrapper): количество и время запросов к базе."""
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db_queries += 1
+        timing.db_time += time.perf_counter() - started
+        if isinstance(sql, str) and sql.startswith(SAVEPOINT_STATEMENTS):
+            timing.exempt_queries += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    """Подключает record_query к соединению, если он еще не подключен."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    """Гистограмма Prometheus с метками."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]):
+        """Инициализация пустой гистограммы."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        """Учитывает значение."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                # Счетчики корзин (последняя - +Inf), сумма и количество значений.
+                counts = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts[0][index] += 1
+            counts[1] += value
+            counts[2] += 1
+
+    def clear(self) -> None:
+        """Сбрасывает значения."""
+        with self._lock:
+            self._values = {}
+
+    def samples(self):
+        """Строки значений в текстовом формате Prometheus."""
+        with self._lock:
+            values = [(labels, list(counts[0]), counts[1], counts[2]) for labels, counts in self._values.items()]
+        for labels, buckets, total, count in sorted(values):
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, "+Inf"), buckets):
+                cumulative += bucket
+                le = bound if isinstance(bound, str) else repr(float(bound))
+                yield f"{self.name}_bucket{format_labels(self.labelnames, labels, le=le)} {cumulative}"
+            yield f"{self.name}_sum{format_labels(self.labelnames, labels)} {total!r}"
+            yield f"{self.name}_count{format_labels(self.labelnames, labels)} {count}"
+
+
+class Counter:
+    """Счетчик Prometheus с метками."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        """Инициализация пустого счетчика."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1) -> None:
+        """Увеличивает счетчик."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def clear(self) -> None:
+        """Сбрасывает значения."""
+        with self._lock:
+            self._values = {}
+
+    def samples(self):
+        """Строки значений в текстовом формате Prometheus."""
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {value}"
+
+
+class Gauge:
+    """Метрика Prometheus с текущим значением и метками."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        """Инициализация пустой метрики."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, labels: tuple[str, ...], value: float) -> None:
+        """Устанавливает значение."""
+        with self._lock:
+            self._values[labels] = value
+
+    def clear(self) -> None:
+        """Сбрасывает значения."""
+        with self._lock:
+            self._values = {}
+
+    def samples(self):
+        """Строки значений в текстовом формате Prometheus."""
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {value}"
+
+
+def format_labels(labelnames: tuple[str, ...], labels: tuple[str, ...], **extra: str) -> str:
+    """Метки значения в текстовом формате Prometheus."""
+    pairs = [*zip(labelnames, labels), *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class RequestMetrics:
+    """Метрики запросов в памяти процесса по представлению и действию.
+
+    Каждый рабочий процесс сервера хранит свои метрики, Prometheus должен опрашивать процессы по отдельности.
+    """
+
+    labelnames = ("view", "action", "method")
+
+    def __init__(self):
+        """Создание метрик."""
+        self.requests = Counter("http_requests_total", "Количество запросов.", (*self.labelnames, "status"))
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Полное время обработки запроса.", self.labelnames, DURATION_BUCKETS
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds", "Время запросов к базе.", self.labelnames, DURATION_BUCKETS
+        )
+        self.db_queries = Histogram(
+            "http_request_db_queries", "Количество запросов к базе.", self.labelnames, QUERY_COUNT_BUCKETS
+        )
+        self.serialization = Histogram(
+            "http_request_serialization_seconds",
+            "Время сериализации и рендеринга ответа.",
+            self.labelnames,
+            DURATION_BUCKETS,
+        )
+        self.budget_exceeded = Counter(
+            "http_query_budget_exceeded_total",
+            "Количество запросов с превышением бюджета запросов к базе.",
+            self.labelnames,
+        )
+        self.response_cache = Counter(
+            "http_response_cache_total",
+            "Обращения к кэшу ответов: result=hit - ответ из кэша, miss - ответ построен заново.",
+            ("view", "action", "result"),
+        )
+        self.password_hashing_queue = Gauge(
+            "password_hashing_queue_depth", "Пароли в очереди пула хеширования (users.hashers).", ()
+        )
+        self.password_hashing_running = Gauge(
+            "password_hashing_in_progress", "Пароли, которые хешируются в пуле в данный момент.", ()
+        )
+        self.password_hashing_rejected = Counter(
+            "password_hashing_rejected_total", "Запросы, отклоненные с кодом 503 из-за заполненной очереди.", ()
+        )
+        self.metrics = (
+            self.requests,
+            self.duration,
+            self.db_duration,
+            self.db_queries,
+            self.serialization,
+            self.budget_exceeded,
+            self.response_cache,
+            self.password_hashing_queue,
+            self.password_hashing_running,
+            self.password_hashing_rejected,
+        )
+
+    def observe(self, labels: tuple[str, str, str], status: int, timing: RequestTiming, duration: float) -> None:
+        """Учитывает обработанный запрос."""
+        self.requests.inc((*labels, str(status)))
+        self.duration.observe(labels, duration)
+        self.db_duration.observe(labels, timing.db_time)
+        self.db_queries.observe(labels, timing.db_queries)
+        self.serialization.observe(labels, timing.sections.get("serialize", 0.0))
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Сбрасывает накопленные метрики."""
+        for metric in self.metrics:
+            metric.clear()
+
+
+request_metrics = RequestMetrics()
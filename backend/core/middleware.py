@@ -0,0 +1,217 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from core.db_router import read_from_replicas
+from core.metrics import RequestTiming, current_timing, install_query_recorder, request_metrics
+from core.query_budget import check_query_budget
+
+connection_created.connect(install_query_recorder, dispatch_uid="core.metrics.install_query_recorder")
+
+# Признак конца итератора тела потокового ответа.
+STREAM_END = object()
+
+
+class PerformanceMiddleware:
+    """Замеры обработки запросов: заголовок Server-Timing и метрики для /metrics.
+
+    Для каждого запроса учитываются количество и время запросов к базе (обертка execute_wrapper
+    на всех соединениях), время сериализации и рендеринга ответа и полное время обработки.
+    Метрики агрегируются по представлению и действию вьюсета. Количество запросов действия сверяется
+    с его бюджетом (core.query_budget) без учета запросов заполнения кэшей процесса.
+
+    Тело потокового ответа формируется уже после выхода из middleware, поэтому его итератор оборачивается:
+    запросы к базе при отправке тела учитываются в замерах запроса, а метрики и бюджет проверяются, когда
+    тело отправлено полностью. Заголовок Server-Timing потокового ответа содержит замеры до начала отправки тела.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Инициализация middleware для синхронного или асинхронного обработчика."""
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Обработка запроса с замерами."""
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = self.start()
+        token = current_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        """Асинхронная обработка запроса с замерами."""
+        timing = self.start()
+        token = current_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    def process_template_response(self, request, response):
+        """Учитывает рендеринг ответа DRF, который выполняется после возврата из представления."""
+        timing = current_timing.get()
+        if timing is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: timing.add("serialize", time.perf_counter() - started))
+        return response
+
+    @staticmethod
+    def start():
+        """Замеры нового запроса."""
+        # Соединения, открытые до подключения сигнала, получают обертку при первом запросе.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        return RequestTiming()
+
+    def finish(self, request, response, timing):
+        """Добавляет заголовок Server-Timing и учитывает запрос в метриках, потоковый - после отправки тела."""
+        if settings.SERVER_TIMING_HEADER:
+            serialize = timing.sections.get("serialize", 0.0)
+            duration = time.perf_counter() - timing.started
+            response.headers["Server-Timing"] = (
+                f'db;dur={timing.db_time * 1000:.2f};desc="{timing.db_queries} queries", '
+                f"serialize;dur={serialize * 1000:.2f}, total;dur={duration * 1000:.2f}"
+            )
+        if not response.streaming:
+            self.observe(request, response, timing)
+        elif response.is_async:
+            response.streaming_content = self.ameasure_stream(request, response, timing, response.streaming_content)
+        else:
+            response.streaming_content = self.measure_stream(request, response, timing, response.streaming_content)
+        return response
+
+    def observe(self, request, response, timing, check_budget=True):
+        """Учитывает запрос в метриках и проверяет бюджет запросов."""
+        duration = time.perf_counter() - timing.started
+        view_class, view_name, action = self.get_view(request)
+        labels = (view_name, action, request.method)
+        request_metrics.observe(labels, response.status_code, timing, duration)
+        if check_budget and check_query_budget(view_class, action, timing.db_queries - timing.exempt_queries):
+            request_metrics.budget_exceeded.inc(labels)
+
+    def measure_stream(self, request, response, timing, content):
+        """Тело потокового ответа с замерами. Бюджет не проверяется, если отправка прервана."""
+        iterator = iter(content)
+        completed = False
+        try:
+            while True:
+                token = current_timing.set(timing)
+                try:
+                    chunk = next(iterator, STREAM_END)
+                finally:
+                    current_timing.reset(token)
+                if chunk is STREAM_END:
+                    completed = True
+                    break
+                yield chunk
+        finally:
+            self.observe(request, response, timing, check_budget=completed)
+
+    async def ameasure_stream(self, request, response, timing, content):
+        """Асинхронное тело потокового ответа с замерами. Бюджет не проверяется, если отправка прервана."""
+        iterator = aiter(content)
+        completed = False
+        try:
+            while True:
+                token = current_timing.set(timing)
+                try:
+                    chunk = await anext(iterator, STREAM_END)
+                finally:
+                    current_timing.reset(token)
+                if chunk is STREAM_END:
+                    completed = True
+                    break
+                yield chunk
+        finally:
+            self.observe(request, response, timing, check_budget=completed)
+
+    @staticmethod
+    def get_view(request):
+        """Класс, имя представления и действие вьюсета (для остальных представлений - метод в нижнем регистре)."""
+        match = request.resolver_match
+        if match is None:
+            return None, "unmatched", ""
+        view_class = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+        view_name = view_class.__name__ if view_class is not None else match.func.__name__
+        actions = getattr(match.func, "actions", None) or {}
+        return view_class, view_name, actions.get(request.method.lower(), request.method.lower())
+
+
+class ReplicaRoutingMiddleware:
+    """Чтение с реплик для безопасных запросов (core.db_router.ReplicaRouter).
+
+    Запросы GET, HEAD и OPTIONS читают с реплик, остальные работают с default. После успешного изменяющего
+    запроса клиенту ставится cookie со временем окончания закрепления: DATABASE_REPLICA_LAG_TOLERANCE секунд
+    его запросы читают из default и видят свои изменения, даже если реплики отстают. API не хранит сессий
+    (JWT), поэтому закрепление передается клиенту, а не хранится на сервере.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    cookie_name = "db_primary_until"
+    safe_methods = frozenset(("GET", "HEAD", "OPTIONS"))
+
+    def __init__(self, get_response):
+        """Инициализация middleware для синхронного или асинхронного обработчика."""
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Обработка запроса с выбором базы для чтения."""
+        if self.async_mode:
+            return self.__acall__(request)
+        token = read_from_replicas.set(self.can_read_from_replicas(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_from_replicas.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        """Асинхронная обработка запроса с выбором базы для чтения."""
+        token = read_from_replicas.set(self.can_read_from_replicas(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_from_replicas.reset(token)
+        return self.pin(request, response)
+
+    def can_read_from_replicas(self, request):
+        """Безопасный запрос клиента, не закрепленного за default недавней записью."""
+        if not settings.DATABASE_REPLICAS or request.method not in self.safe_methods:
+            return False
+        try:
+            pinned_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            pinned_until = 0
+        return pinned_until <= time.time()
+
+    def pin(self, request, response):
+        """Закрепляет клиента за default после успешного изменяющего запроса."""
+        if settings.DATABASE_REPLICAS and request.method not in self.safe_methods and response.status_code < 400:
+            lag_tolerance = settings.DATABASE_REPLICA_LAG_TOLERANCE
+            response.set_cookie(
+                self.cookie_name,
+                f"{time.time() + lag_tolerance:.3f}",
+                max_age=lag_tolerance,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
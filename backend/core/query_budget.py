@@ -0,0 +1,44 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_OFF = "off"
+QUERY_BUDGET_WARN = "warn"
+QUERY_BUDGET_RAISE = "raise"
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов к базе, чем разрешает его бюджет."""
+
+
+def query_budget(**budgets):
+    """Декоратор класса представления: допустимое количество запросов к базе для действий вьюсета.
+
+    Пример: @query_budget(list=2, retrieve=2). Бюджеты наследуются и дополняются в подклассах.
+    Проверку выполняет core.middleware.PerformanceMiddleware, поведение при превышении задается
+    настройкой QUERY_BUDGET_MODE.
+    """
+
+    def decorate(view_class):
+        view_class.query_budgets = {**getattr(view_class, "query_budgets", {}), **budgets}
+        return view_class
+
+    return decorate
+
+
+def check_query_budget(view_class, action, queries):
+    """Проверяет количество запросов действия по бюджету представления.
+
+    При превышении в режиме warn пишет предупреждение в лог, в режиме raise выбрасывает QueryBudgetExceeded.
+    Возвращает True, если бюджет превышен.
+    """
+    budget = getattr(view_class, "query_budgets", {}).get(action)
+    if budget is None or queries <= budget or settings.QUERY_BUDGET_MODE == QUERY_BUDGET_OFF:
+        return False
+    message = f"{view_class.__name__}.{action}: {queries} запросов к базе при бюджете {budget}"
+    if settings.QUERY_BUDGET_MODE == QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+    return True
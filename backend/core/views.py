@@ -0,0 +1,19 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+from core.metrics import request_metrics
+
+
+def metrics(request):
+    """Метрики процесса в текстовом формате Prometheus.
+
+    Доступны только с заголовком Authorization: Bearer <METRICS_TOKEN>. Пока токен не задан, адреса нет.
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), expected):
+        return HttpResponseForbidden()
+    return HttpResponse(request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -6,3 +6,7 @@ class TasksConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        """Подключение сигналов приложения."""
+        from tasks import signals  # noqa: F401
@@ -0,0 +1,33 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from tasks.batches import BatchStats, run_batches
+from tasks.cache import task_cache_versions
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+
+def archive_completed_tasks(days=None, batch_size=None, now=None) -> BatchStats:
+    """Переносит в архив выполненные задачи всех пользователей, завершенные больше days дней назад.
+
+    days и batch_size по умолчанию берутся из TASKS_ARCHIVE_AFTER_DAYS и TASKS_ARCHIVE_BATCH_SIZE.
+    Каждая пачка переносится одним запросом в своей транзакции. После каждой пачки сбрасывается кэш ответов API
+    задач владельцев перенесенных задач.
+    """
+    days = settings.TASKS_ARCHIVE_AFTER_DAYS if days is None else days
+    batch_size = batch_size or settings.TASKS_ARCHIVE_BATCH_SIZE
+    now = now or timezone.now()
+    completed_before = now - timedelta(days=days)
+
+    def archive_batch(after):
+        rows = Task.objects.archive_completed(completed_before, batch_size, now, after)
+        task_cache_versions.invalidate_users(user_id for _, _, user_id in rows)
+        return [(completed_at, pk) for completed_at, pk, _ in rows]
+
+    stats = run_batches(archive_batch)
+    logger.info("Задачи перенесены в архив: %s", stats)
+    return stats
@@ -0,0 +1,39 @@
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchStats:
+    """Статистика пакетной обработки задач."""
+
+    processed: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Обработанных задач в секунду."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"задач: {self.processed}, пачек: {self.batches}, "
+            f"время: {self.elapsed:.3f} с, задач в секунду: {self.rate:.0f}"
+        )
+
+
+def run_batches(process_batch) -> BatchStats:
+    """Обрабатывает задачи пачками, пока process_batch возвращает ключи обработанных задач.
+
+    process_batch получает ключ последней обработанной задачи (None для первой пачки) и возвращает ключи
+    задач пачки. Следующая пачка начинается после наибольшего ключа, поэтому задачи, пропущенные из-за
+    блокировки другой транзакцией, не выбираются повторно и остаются до следующего прохода.
+    """
+    stats, after = BatchStats(), None
+    started = time.perf_counter()
+    while keys := process_batch(after):
+        stats.batches += 1
+        stats.processed += len(keys)
+        after = max(keys)
+    stats.elapsed = time.perf_counter() - started
+    return stats
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+
+class TaskCacheVersions:
+    """Версии кэша ответов API задач (api.v1.tasks.mixins.ResponseCacheMixin).
+
+    Ключ кэшированного ответа содержит версию задач пользователя и общее поколение. Версия пользователя
+    увеличивается после изменения его задач, в том числе обработчиком просроченных задач и переносом в архив,
+    поколение - после изменения статусов задач, которые вложены в ответы всех пользователей. Старые записи не удаляются,
+    а перестают читаться и вытесняются кэшем. Версии хранятся в том же кэше без срока: если запись версии
+    вытеснена, она создается заново со значением текущего времени в наносекундах, которое больше
+    любой прежней версии.
+    """
+
+    generation_key = "tasks:response:generation"
+
+    def __init__(self, alias="default"):
+        """Инициализация для кэша alias."""
+        self.alias = alias
+
+    @property
+    def cache(self):
+        """Кэш версий и ответов."""
+        return caches[self.alias]
+
+    @staticmethod
+    def user_key(user_id):
+        """Ключ версии задач пользователя."""
+        return f"tasks:response:user:{user_id}"
+
+    def get(self, user_id):
+        """Общее поколение и версия задач пользователя."""
+        keys = (self.generation_key, self.user_key(user_id))
+        versions = self.cache.get_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        if missing:
+            for key, value in missing.items():
+                self.cache.add(key, value, timeout=None)
+            versions = self.cache.get_many(keys)
+        return versions.get(keys[0], 0), versions.get(keys[1], 0)
+
+    def bump(self, key):
+        """Увеличивает версию."""
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, time.time_ns(), timeout=None)
+
+    async def abump(self, key):
+        """Асинхронный аналог bump через асинхронный API кэша."""
+        try:
+            await self.cache.aincr(key)
+        except ValueError:
+            await self.cache.aset(key, time.time_ns(), timeout=None)
+
+    def invalidate_user(self, user_id):
+        """Сбрасывает ответы пользователя после фиксации текущей транзакции.
+
+        До фиксации параллельный запрос прочитал бы старые данные и сохранил их под новой версией.
+        """
+        self.on_commit(lambda: self.bump(self.user_key(user_id)))
+
+    async def ainvalidate_user(self, user_id):
+        """Сбрасывает ответы пользователя из event loop: транзакций там нет, версия увеличивается сразу."""
+        await self.abump(self.user_key(user_id))
+
+    def invalidate_users(self, user_ids):
+        """Сбрасывает ответы перечисленных пользователей после фиксации текущей транзакции."""
+        user_ids = set(user_ids)
+
+        def bump_users():
+            for user_id in user_ids:
+                self.bump(self.user_key(user_id))
+
+        if user_ids:
+            self.on_commit(bump_users)
+
+    def invalidate_all(self):
+        """Сбрасывает ответы всех пользователей после фиксации текущей транзакции."""
+        self.on_commit(lambda: self.bump(self.generation_key))
+
+    @staticmethod
+    def on_commit(func):
+        """Вызывает func после фиксации текущей транзакции.
+
+        В event loop транзакций нет: асинхронные запросы ORM выполняются в потоке и фиксируются сразу,
+        а transaction.on_commit там недоступен.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            transaction.on_commit(func)
+        else:
+            func()
+
+
+task_cache_versions = TaskCacheVersions()
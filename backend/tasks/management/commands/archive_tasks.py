@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from tasks.archive import archive_completed_tasks
+
+
+class Command(BaseCommand):
+    """Перенос давно завершенных задач в архив."""
+
+    help = (
+        "Переносит задачи, завершенные больше N дней назад, в архивную таблицу небольшими пачками "
+        "и выводит статистику переноса."
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы команды."""
+        parser.add_argument("--days", type=int, help="Возраст завершенных задач, по умолчанию TASKS_ARCHIVE_AFTER_DAYS")
+        parser.add_argument("--batch-size", type=int, help="Задач в одной пачке, по умолчанию TASKS_ARCHIVE_BATCH_SIZE")
+
+    def handle(self, *args, days=None, batch_size=None, **options):
+        """Перенос задач в архив."""
+        stats = archive_completed_tasks(days=days, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Перенесено в архив: {stats}"))
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.batches import run_batches
+from tasks.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    """Удаление устаревших записей об удаленных задачах."""
+
+    help = "Удаляет записи об удаленных задачах старше TASKS_TOMBSTONE_RETENTION_DAYS дней небольшими пачками."
+
+    def add_arguments(self, parser):
+        """Аргументы команды."""
+        parser.add_argument("--batch-size", type=int, default=1000, help="Записей в одной пачке")
+
+    def handle(self, *args, batch_size=1000, **options):
+        """Удаление записей."""
+        deleted_before = timezone.now() - timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS)
+        stats = run_batches(lambda after: TaskTombstone.objects.purge(deleted_before, batch_size))
+        self.stdout.write(self.style.SUCCESS(f"Удалено записей об удаленных задачах: {stats}"))
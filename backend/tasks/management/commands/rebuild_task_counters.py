@@ -0,0 +1,30 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from tasks.models import TaskStatusCounter
+
+
+class Command(BaseCommand):
+    """Пересчет счетчиков задач пользователей по статусам."""
+
+    help = (
+        "Пересчитывает счетчики задач по статусам (TaskStatusCounter) по таблице задач. "
+        "Нужен после изменений задач в обход триггеров, например после TRUNCATE или восстановления из копии."
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы команды."""
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="user_ids",
+            type=uuid.UUID,
+            metavar="ID",
+            help="Пересчитать только для пользователя, можно указать несколько раз",
+        )
+
+    def handle(self, *args, user_ids=None, **options):
+        """Пересчет счетчиков."""
+        count = TaskStatusCounter.objects.rebuild(user_ids=user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Пересчитано счетчиков: {count}"))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.overdue import sweep_overdue_tasks
+
+
+class Command(BaseCommand):
+    """Отметка просроченных задач."""
+
+    help = (
+        "Отмечает просроченными незавершенные задачи, срок которых прошел, и выводит статистику прохода. "
+        "С --interval работает постоянно и повторяет проход каждые N секунд. "
+        "Несколько обработчиков могут работать параллельно."
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы команды."""
+        parser.add_argument("--batch-size", type=int, help="Задач в одной пачке, по умолчанию TASKS_OVERDUE_BATCH_SIZE")
+        parser.add_argument("--interval", type=float, help="Повторять проход каждые N секунд")
+
+    def handle(self, *args, batch_size=None, interval=None, **options):
+        """Один проход или повторяющиеся проходы с интервалом."""
+        while True:
+            stats = sweep_overdue_tasks(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Отмечено просроченных: {stats}"))
+            if interval is None:
+                return
+            # Соединение долго работающего обработчика переоткрывается по CONN_MAX_AGE, как у запросов.
+            close_old_connections()
+            time.sleep(max(0.0, interval - stats.elapsed))
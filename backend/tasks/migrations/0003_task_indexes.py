@@ -0,0 +1,48 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Пользователь",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "-created_at"], name="task_user_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "updated_at"], name="task_user_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "complete_before"], name="task_user_complete_before_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "completed_at"], name="task_user_completed_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "task_status", "-created_at"], name="task_user_status_created_idx"),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0003_task_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector("title", config="russian", weight="A"),
+                    "||",
+                    django.contrib.postgres.search.SearchVector("description", config="russian", weight="B"),
+                    django.contrib.postgres.search.SearchConfig("russian"),
+                ),
+                help_text="Поисковый вектор заголовка и описания",
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+        ),
+    ]
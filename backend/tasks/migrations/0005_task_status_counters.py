@@ -0,0 +1,128 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Счетчики задач пользователей по статусам поддерживаются триггерами уровня оператора с таблицами переходов:
+# пакетная операция над N задачами обновляет счетчики одним запросом по группам (пользователь, статус).
+# Группы обрабатываются в порядке (user_id, task_status_id), чтобы параллельные транзакции блокировали
+# строки счетчиков в одном порядке. При удалении счетчики только уменьшаются: строки счетчиков удаляемого
+# пользователя к этому моменту уже могут быть удалены каскадом.
+CREATE_COUNTER_TRIGGERS = """
+CREATE FUNCTION tasks_task_counters_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskstatuscounter (user_id, task_status_id, count)
+    SELECT user_id, task_status_id, count(*) FROM new_rows
+    GROUP BY user_id, task_status_id ORDER BY user_id, task_status_id
+    ON CONFLICT (user_id, task_status_id) DO UPDATE SET count = tasks_taskstatuscounter.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_counters_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskstatuscounter (user_id, task_status_id, count)
+    SELECT user_id, task_status_id, sum(delta) FROM (
+        SELECT old_rows.user_id, old_rows.task_status_id, -1 AS delta
+        FROM old_rows JOIN new_rows ON new_rows.id = old_rows.id
+        WHERE (old_rows.user_id, old_rows.task_status_id) IS DISTINCT FROM (new_rows.user_id, new_rows.task_status_id)
+        UNION ALL
+        SELECT new_rows.user_id, new_rows.task_status_id, 1
+        FROM old_rows JOIN new_rows ON new_rows.id = old_rows.id
+        WHERE (old_rows.user_id, old_rows.task_status_id) IS DISTINCT FROM (new_rows.user_id, new_rows.task_status_id)
+    ) AS changes
+    GROUP BY user_id, task_status_id HAVING sum(delta) <> 0 ORDER BY user_id, task_status_id
+    ON CONFLICT (user_id, task_status_id) DO UPDATE SET count = tasks_taskstatuscounter.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_counters_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_taskstatuscounter AS counter SET count = counter.count - deleted.count
+    FROM (
+        SELECT user_id, task_status_id, count(*) AS count FROM old_rows
+        GROUP BY user_id, task_status_id ORDER BY user_id, task_status_id
+    ) AS deleted
+    WHERE counter.user_id = deleted.user_id AND counter.task_status_id = deleted.task_status_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_counters_insert AFTER INSERT ON tasks_task
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_counters_insert();
+
+CREATE TRIGGER tasks_task_counters_update AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_counters_update();
+
+CREATE TRIGGER tasks_task_counters_delete AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_counters_delete();
+
+INSERT INTO tasks_taskstatuscounter (user_id, task_status_id, count)
+SELECT user_id, task_status_id, count(*) FROM tasks_task GROUP BY user_id, task_status_id;
+"""
+
+DROP_COUNTER_TRIGGERS = """
+DROP TRIGGER tasks_task_counters_insert ON tasks_task;
+DROP TRIGGER tasks_task_counters_update ON tasks_task;
+DROP TRIGGER tasks_task_counters_delete ON tasks_task;
+DROP FUNCTION tasks_task_counters_insert();
+DROP FUNCTION tasks_task_counters_update();
+DROP FUNCTION tasks_task_counters_delete();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0004_task_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStatusCounter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("count", models.IntegerField(default=0, help_text="Количество задач")),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("complete_before__isnull", False), ("completed_at__isnull", True)),
+                fields=["user", "complete_before"],
+                name="task_user_open_deadline_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskstatuscounter",
+            name="task_status",
+            field=models.ForeignKey(
+                help_text="Статус задачи",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="task_counters",
+                to="classifiers.taskstatus",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskstatuscounter",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Пользователь",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="task_status_counters",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="taskstatuscounter",
+            constraint=models.UniqueConstraint(
+                fields=("user", "task_status"), name="task_status_counter_user_status_uniq"
+            ),
+        ),
+        migrations.RunSQL(CREATE_COUNTER_TRIGGERS, DROP_COUNTER_TRIGGERS),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Перенос срока задачи снимает отметку о просрочке: задача возвращается в очередь обработчика просроченных задач
+# при любом изменении срока, в том числе пакетном и выполненном в обход ORM.
+CREATE_OVERDUE_RESET_TRIGGER = """
+CREATE FUNCTION tasks_task_overdue_reset() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.overdue_at := NULL;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_overdue_reset BEFORE UPDATE OF complete_before ON tasks_task
+FOR EACH ROW WHEN (OLD.complete_before IS DISTINCT FROM NEW.complete_before)
+EXECUTE FUNCTION tasks_task_overdue_reset();
+"""
+
+DROP_OVERDUE_RESET_TRIGGER = """
+DROP TRIGGER tasks_task_overdue_reset ON tasks_task;
+DROP FUNCTION tasks_task_overdue_reset();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0005_task_status_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="overdue_at",
+            field=models.DateTimeField(blank=True, editable=False, help_text="Отмечена просроченной", null=True),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("complete_before__isnull", False), ("completed_at__isnull", True), ("overdue_at__isnull", True)
+                ),
+                fields=["complete_before", "id"],
+                name="task_overdue_queue_idx",
+            ),
+        ),
+        migrations.RunSQL(CREATE_OVERDUE_RESET_TRIGGER, DROP_OVERDUE_RESET_TRIGGER),
+    ]
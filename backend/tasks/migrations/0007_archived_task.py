@@ -0,0 +1,139 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:12
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+# Задачи вместе с архивом для списка с include_archived (модель TaskWithArchive).
+CREATE_TASK_WITH_ARCHIVE_VIEW = """
+CREATE VIEW tasks_task_with_archive AS
+SELECT id, title, description, task_status_id, user_id, created_at, updated_at, complete_before, completed_at,
+       overdue_at, search_vector, NULL::timestamp with time zone AS archived_at
+FROM tasks_task
+UNION ALL
+SELECT id, title, description, task_status_id, user_id, created_at, updated_at, complete_before, completed_at,
+       overdue_at, search_vector, archived_at
+FROM tasks_archivedtask;
+"""
+
+DROP_TASK_WITH_ARCHIVE_VIEW = "DROP VIEW tasks_task_with_archive;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0006_task_overdue_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskWithArchive",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, help_text="Идентификатор", primary_key=True, serialize=False
+                    ),
+                ),
+                ("title", models.CharField(help_text="Заголовок задачи", max_length=100)),
+                ("description", models.TextField(help_text="Описание задачи")),
+                ("created_at", models.DateTimeField(help_text="Создана")),
+                ("updated_at", models.DateTimeField(help_text="Обновлена")),
+                ("complete_before", models.DateTimeField(blank=True, help_text="Завершить до", null=True)),
+                ("completed_at", models.DateTimeField(blank=True, help_text="Завершена", null=True)),
+                ("overdue_at", models.DateTimeField(blank=True, help_text="Отмечена просроченной", null=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(help_text="Поисковый вектор заголовка и описания"),
+                ),
+                ("archived_at", models.DateTimeField(blank=True, help_text="Перенесена в архив", null=True)),
+            ],
+            options={
+                "db_table": "tasks_task_with_archive",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, help_text="Идентификатор", primary_key=True, serialize=False
+                    ),
+                ),
+                ("title", models.CharField(help_text="Заголовок задачи", max_length=100)),
+                ("description", models.TextField(help_text="Описание задачи")),
+                ("created_at", models.DateTimeField(help_text="Создана")),
+                ("updated_at", models.DateTimeField(help_text="Обновлена")),
+                ("complete_before", models.DateTimeField(blank=True, help_text="Завершить до", null=True)),
+                ("completed_at", models.DateTimeField(blank=True, help_text="Завершена", null=True)),
+                ("overdue_at", models.DateTimeField(blank=True, help_text="Отмечена просроченной", null=True)),
+                (
+                    "search_vector",
+                    models.GeneratedField(
+                        db_persist=True,
+                        expression=django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.SearchVector("title", config="russian", weight="A"),
+                            "||",
+                            django.contrib.postgres.search.SearchVector("description", config="russian", weight="B"),
+                            django.contrib.postgres.search.SearchConfig("russian"),
+                        ),
+                        help_text="Поисковый вектор заголовка и описания",
+                        output_field=django.contrib.postgres.search.SearchVectorField(),
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(help_text="Перенесена в архив")),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("task_status", 1)),
+                fields=["completed_at", "id"],
+                name="task_completed_archive_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="task_status",
+            field=models.ForeignKey(
+                help_text="Статус задачи",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="archived_tasks",
+                to="classifiers.taskstatus",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Пользователь",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_tasks",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "-created_at"], name="archive_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "updated_at"], name="archive_user_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "complete_before"], name="archive_user_deadline_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "completed_at"], name="archive_user_completed_idx"),
+        ),
+        migrations.RunSQL(CREATE_TASK_WITH_ARCHIVE_VIEW, DROP_TASK_WITH_ARCHIVE_VIEW),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Номер транзакции последнего изменения задачи и записи об удаленных задачах для синхронизации клиентов.
+# Номер транзакции (xid8 без переполнения) сравнивается с xmin снимка, выданным клиенту курсором синхронизации.
+CREATE_SYNC_TRIGGERS = """
+CREATE FUNCTION tasks_task_change_txid() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_txid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_change_txid BEFORE INSERT OR UPDATE ON tasks_task
+FOR EACH ROW EXECUTE FUNCTION tasks_task_change_txid();
+
+CREATE FUNCTION tasks_task_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tasktombstone (task_id, user_id, deleted_txid, deleted_at)
+    SELECT id, user_id, pg_current_xact_id()::text::bigint, now() FROM old_rows;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_tombstones AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_tombstones();
+"""
+
+DROP_SYNC_TRIGGERS = """
+DROP TRIGGER tasks_task_change_txid ON tasks_task;
+DROP TRIGGER tasks_task_tombstones ON tasks_task;
+DROP FUNCTION tasks_task_change_txid();
+DROP FUNCTION tasks_task_tombstones();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0007_archived_task"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_id", models.UUIDField(help_text="Идентификатор удаленной задачи")),
+                ("deleted_txid", models.BigIntegerField(help_text="Транзакция удаления")),
+                ("deleted_at", models.DateTimeField(help_text="Удалена")),
+            ],
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="change_txid",
+            field=models.BigIntegerField(default=0, help_text="Транзакция последнего изменения"),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="change_txid",
+            field=models.BigIntegerField(default=0, editable=False, help_text="Транзакция последнего изменения"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "change_txid", "id"], name="task_user_change_txid_idx"),
+        ),
+        migrations.AddField(
+            model_name="tasktombstone",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                db_index=False,
+                help_text="Пользователь",
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasktombstone",
+            index=models.Index(fields=["user", "deleted_txid"], name="tombstone_user_txid_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tasktombstone",
+            index=models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_at_idx"),
+        ),
+        migrations.RunSQL(CREATE_SYNC_TRIGGERS, DROP_SYNC_TRIGGERS),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.1.3 on 2026-10-18 22:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("classifiers", "0002_data_migtation"),
+        ("tasks", "0008_task_sync"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="archivedtask",
+            name="archive_user_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="archivedtask",
+            name="archive_user_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="archivedtask",
+            name="archive_user_deadline_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="archivedtask",
+            name="archive_user_completed_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_created_at_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_updated_at_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_complete_before_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_completed_at_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_status_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "-created_at", "-id"], name="archive_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "updated_at", "id"], name="archive_user_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "complete_before", "id"], name="archive_user_deadline_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "completed_at", "id"], name="archive_user_completed_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "-created_at", "-id"], name="task_user_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "updated_at", "id"], name="task_user_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "complete_before", "id"], name="task_user_complete_before_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "completed_at", "id"], name="task_user_completed_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "task_status", "-created_at", "-id"], name="task_user_status_created_idx"
+            ),
+        ),
+    ]
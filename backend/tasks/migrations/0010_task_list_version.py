@@ -0,0 +1,90 @@
+# Generated by Django 5.1.3 on 2026-10-19 09:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Версия списка задач пользователя увеличивается триггерами уровня оператора на каждый оператор, затронувший
+# его задачи. UPDATE строки версии держит ее блокировку до конца транзакции: параллельная транзакция того же
+# пользователя ждет фиксации и увеличивает уже зафиксированное значение, поэтому версии растут в порядке
+# фиксации. Пользователи обрабатываются в порядке user_id, чтобы транзакции блокировали строки в одном порядке.
+# При удалении версия только обновляется: строка удаляемого пользователя к этому моменту уже может быть удалена.
+CREATE_LIST_VERSION_TRIGGERS = """
+CREATE FUNCTION tasks_task_list_version_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tasklistversion (user_id, version)
+    SELECT DISTINCT user_id, 1 FROM new_rows ORDER BY user_id
+    ON CONFLICT (user_id) DO UPDATE SET version = tasks_tasklistversion.version + 1;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_list_version_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tasklistversion (user_id, version)
+    SELECT user_id, 1 FROM (SELECT user_id FROM old_rows UNION SELECT user_id FROM new_rows) AS changed
+    ORDER BY user_id
+    ON CONFLICT (user_id) DO UPDATE SET version = tasks_tasklistversion.version + 1;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_list_version_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_tasklistversion AS list_version SET version = list_version.version + 1
+    FROM (SELECT DISTINCT user_id FROM old_rows ORDER BY user_id) AS deleted
+    WHERE list_version.user_id = deleted.user_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER tasks_task_list_version_insert AFTER INSERT ON tasks_task
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_list_version_insert();
+
+CREATE TRIGGER tasks_task_list_version_update AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_list_version_update();
+
+CREATE TRIGGER tasks_task_list_version_delete AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_list_version_delete();
+
+INSERT INTO tasks_tasklistversion (user_id, version) SELECT DISTINCT user_id, 1 FROM tasks_task;
+"""
+
+DROP_LIST_VERSION_TRIGGERS = """
+DROP TRIGGER tasks_task_list_version_insert ON tasks_task;
+DROP TRIGGER tasks_task_list_version_update ON tasks_task;
+DROP TRIGGER tasks_task_list_version_delete ON tasks_task;
+DROP FUNCTION tasks_task_list_version_insert();
+DROP FUNCTION tasks_task_list_version_update();
+DROP FUNCTION tasks_task_list_version_delete();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_task_index_pagination_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskListVersion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        help_text="Пользователь",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="task_list_version",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0, help_text="Версия списка задач")),
+            ],
+        ),
+        migrations.RunSQL(CREATE_LIST_VERSION_TRIGGERS, DROP_LIST_VERSION_TRIGGERS),
+    ]
@@ -1,11 +1,174 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connection, models, router, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
 from classifiers.models import TaskStatus
 from core.models import UUIDPrimaryKeyMixin
 
 User = get_user_model()
 
+# Конфигурация полнотекстового поиска PostgreSQL для задач.
+SEARCH_CONFIG = "russian"
+
+
+class TaskManager(models.Manager):
+    """Менеджер задач."""
+
+    def change_status(self, user_id, ids, task_status_id):
+        """Смена статуса задач пользователя одним UPDATE ... RETURNING.
+
+        Задача в статусе "Выполнено" сохраняет уже заполненное время завершения или получает текущее,
+        в остальных статусах время завершения очищается. Возвращает измененные задачи в новом состоянии,
+        задачи других пользователей и несуществующие id пропускаются.
+        """
+        model = self.model
+        qn = connection.ops.quote_name
+        now = timezone.now()
+        completed_at = qn(model._meta.get_field("completed_at").column)
+        if task_status_id == COMPLETED_TASK_STATUS_ID:
+            completed_at_value, completed_at_params = f"COALESCE({completed_at}, %s)", [now]
+        else:
+            completed_at_value, completed_at_params = "NULL", []
+        # Поисковый вектор не нужен в ответе и остается отложенным полем.
+        returning = ", ".join(
+            qn(field.column) for field in model._meta.concrete_fields if field.name != "search_vector"
+        )
+        sql = (
+            f"UPDATE {qn(model._meta.db_table)} "
+            f"SET {qn(model._meta.get_field('task_status').column)} = %s, "
+            f"{qn(model._meta.get_field('updated_at').column)} = %s, "
+            f"{completed_at} = {completed_at_value} "
+            f"WHERE {qn(model._meta.get_field('user').column)} = %s AND {qn(model._meta.pk.column)} = ANY(%s) "
+            f"RETURNING {returning}"
+        )
+        params = [task_status_id, now, *completed_at_params, user_id, list(ids)]
+        # RawQuerySet выполняет запрос при каждом обходе, поэтому результат сразу собирается в список. Базу raw()
+        # выбирает как для чтения, поэтому UPDATE явно направляется в базу для записи, а не на реплику.
+        return list(self.db_manager(router.db_for_write(model)).raw(sql, params))
+
+    def flag_overdue(self, now, batch_size, after=None):
+        """Отмечает просроченными пачку незавершенных задач всех пользователей, срок которых прошел к now.
+
+        Пачка выбирается по индексу task_overdue_queue_idx в порядке (complete_before, id) после ключа after
+        с блокировкой FOR UPDATE SKIP LOCKED и отмечается тем же запросом: задачи, заблокированные другим
+        обработчиком или запросом API, пропускаются, поэтому обработчики могут работать параллельно.
+        Возвращает ключи (complete_before, id) и владельцев (user_id) отмеченных задач.
+        """
+        model = self.model
+        qn = connection.ops.quote_name
+        table, pk = qn(model._meta.db_table), qn(model._meta.pk.column)
+        complete_before = qn(model._meta.get_field("complete_before").column)
+        keyset, keyset_params = "", []
+        if after is not None:
+            keyset, keyset_params = f"AND ({complete_before}, {pk}) > (%s, %s)", list(after)
+        sql = (
+            f"WITH batch AS ("
+            f"SELECT {pk} FROM {table} "
+            f"WHERE {qn(model._meta.get_field('completed_at').column)} IS NULL "
+            f"AND {qn(model._meta.get_field('overdue_at').column)} IS NULL "
+            f"AND {complete_before} < %s {keyset} "
+            f"ORDER BY {complete_before}, {pk} LIMIT %s FOR UPDATE SKIP LOCKED) "
+            f"UPDATE {table} AS task SET {qn(model._meta.get_field('overdue_at').column)} = %s, "
+            f"{qn(model._meta.get_field('updated_at').column)} = %s "
+            f"FROM batch WHERE task.{pk} = batch.{pk} "
+            f"RETURNING task.{complete_before}, task.{pk}, task.{qn(model._meta.get_field('user').column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [now, *keyset_params, batch_size, now, now])
+            return cursor.fetchall()
+
+    def archive_completed(self, completed_before, batch_size, now, after=None):
+        """Переносит в архив пачку выполненных задач всех пользователей, завершенных раньше completed_before.
+
+        Пачка выбирается по индексу task_completed_archive_idx в порядке (completed_at, id) после ключа after
+        с блокировкой FOR UPDATE SKIP LOCKED, удаляется из таблицы задач и вставляется в архив одним запросом,
+        поэтому блокировки держатся только на время переноса пачки. Возвращает ключи (completed_at, id)
+        и владельцев (user_id) перенесенных задач.
+        """
+        qn = connection.ops.quote_name
+        table, pk = qn(self.model._meta.db_table), qn(self.model._meta.pk.column)
+        completed_at = qn(self.model._meta.get_field("completed_at").column)
+        columns = ", ".join(qn(field.column) for field in self.model._meta.concrete_fields if not field.generated)
+        moved_columns = ", ".join(
+            f"task.{qn(field.column)}" for field in self.model._meta.concrete_fields if not field.generated
+        )
+        keyset, keyset_params = "", []
+        if after is not None:
+            keyset, keyset_params = f"AND ({completed_at}, {pk}) > (%s, %s)", list(after)
+        sql = (
+            f"WITH batch AS ("
+            f"SELECT {pk} FROM {table} "
+            f"WHERE {qn(self.model._meta.get_field('task_status').column)} = %s AND {completed_at} < %s {keyset} "
+            f"ORDER BY {completed_at}, {pk} LIMIT %s FOR UPDATE SKIP LOCKED), "
+            f"moved AS (DELETE FROM {table} AS task USING batch WHERE task.{pk} = batch.{pk} "
+            f"RETURNING {moved_columns}) "
+            f"INSERT INTO {qn(ArchivedTask._meta.db_table)} ({columns}, "
+            f"{qn(ArchivedTask._meta.get_field('archived_at').column)}) "
+            f"SELECT {columns}, %s FROM moved "
+            f"RETURNING {completed_at}, {pk}, {qn(self.model._meta.get_field('user').column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [COMPLETED_TASK_STATUS_ID, completed_before, *keyset_params, batch_size, now])
+            return cursor.fetchall()
+
+    def change_marker(self, user_id):
+        """Маркер изменений задач пользователя: версия списка TaskListVersion.
+
+        Версию увеличивают триггеры таблицы задач при любом создании, изменении и удалении задач, в том числе
+        при переносе в архив. Строка версии блокируется до конца изменяющей транзакции, поэтому каждая
+        зафиксированная транзакция оставляет версию больше предыдущей и маркер меняется после фиксации любого
+        изменения списка. Читается одна строка по первичному ключу.
+        """
+        return self._list_version(user_id).first() or 0
+
+    async def achange_marker(self, user_id):
+        """Асинхронный аналог change_marker через асинхронный ORM."""
+        return await self._list_version(user_id).afirst() or 0
+
+    def _list_version(self, user_id):
+        return TaskListVersion.objects.db_manager(self.db).filter(user_id=user_id).values_list("version", flat=True)
+
+    def summary(self, user_id, use_counters=True):
+        """Количество задач пользователя по статусам и количество просроченных задач одним запросом.
+
+        По умолчанию количество по статусам читается из счетчиков TaskStatusCounter и не зависит от числа задач,
+        а просроченные задачи считаются по частичному индексу незавершенных задач со сроком. Просрочка
+        наступает с течением времени без изменения строк, поэтому ее нельзя вести счетчиком. При
+        use_counters=False все считается агрегатом по задачам пользователя.
+        Возвращает словарь id статуса - количество задач и количество просроченных задач.
+        """
+        overdue = Q(completed_at__isnull=True, complete_before__lt=timezone.now())
+        if use_counters:
+            overdue_count = (
+                self.filter(overdue, user_id=OuterRef("user_id"))
+                .order_by()
+                .values("user_id")
+                .annotate(count=Count("pk"))
+                .values("count")
+            )
+            rows = TaskStatusCounter.objects.filter(user_id=user_id).values_list(
+                "task_status_id", "count", Coalesce(Subquery(overdue_count), 0)
+            )
+        else:
+            rows = (
+                self.filter(user_id=user_id)
+                .order_by()
+                .values("task_status_id")
+                .annotate(count=Count("pk"), overdue=Count("pk", filter=overdue))
+                .values_list("task_status_id", "count", "overdue")
+            )
+        counts, overdue_counts = {}, []
+        for task_status_id, count, overdue_count in rows:
+            counts[task_status_id] = count
+            overdue_counts.append(overdue_count)
+        # Подзапрос по счетчикам повторяет общее количество просроченных задач в каждой строке.
+        return counts, (max(overdue_counts, default=0) if use_counters else sum(overdue_counts))
+
 
 class Task(UUIDPrimaryKeyMixin):
     """Модель задачи."""
@@ -15,11 +178,278 @@ class Task(UUIDPrimaryKeyMixin):
     task_status = models.ForeignKey(
         TaskStatus, on_delete=models.PROTECT, help_text="Статус задачи", related_name="tasks"
     )
-    user = models.ForeignKey(User, on_delete=models.CASCADE, help_text="Пользователь", related_name="tasks")
+    # Отдельный индекс по user_id не нужен: его покрывают составные индексы ниже.
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, help_text="Пользователь", related_name="tasks", db_index=False
+    )
     created_at = models.DateTimeField(auto_now_add=True, help_text="Создана")
     updated_at = models.DateTimeField(auto_now=True, help_text="Обновлена")
     complete_before = models.DateTimeField(help_text="Завершить до", null=True, blank=True)
     completed_at = models.DateTimeField(help_text="Завершена", null=True, blank=True)
+    overdue_at = models.DateTimeField(help_text="Отмечена просроченной", null=True, blank=True, editable=False)
+    # Заполняется триггером (миграция 0008_task_sync) при каждой вставке и изменении.
+    change_txid = models.BigIntegerField(default=0, editable=False, help_text="Транзакция последнего изменения")
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Поисковый вектор заголовка и описания",
+    )
+
+    objects = TaskManager()
+
+    class Meta:
+        """Метакласс модели задачи."""
+
+        # Все запросы API ограничены задачами пользователя, поэтому user_id идет первым столбцом,
+        # а за ним - поле, по которому API фильтрует и сортирует список, и id: курсорная пагинация
+        # сортирует по паре (поле, id), и без id в индексе PostgreSQL досортировывал бы строки.
+        indexes = (
+            models.Index(fields=("user", "-created_at", "-id"), name="task_user_created_at_idx"),
+            models.Index(fields=("user", "updated_at", "id"), name="task_user_updated_at_idx"),
+            models.Index(fields=("user", "complete_before", "id"), name="task_user_complete_before_idx"),
+            models.Index(fields=("user", "completed_at", "id"), name="task_user_completed_at_idx"),
+            models.Index(fields=("user", "task_status", "-created_at", "-id"), name="task_user_status_created_idx"),
+            # Просроченные задачи пользователя: не завершены и срок прошел.
+            models.Index(
+                fields=("user", "complete_before"),
+                condition=models.Q(completed_at__isnull=True, complete_before__isnull=False),
+                name="task_user_open_deadline_idx",
+            ),
+            # Изменения задач пользователя для синхронизации.
+            models.Index(fields=("user", "change_txid", "id"), name="task_user_change_txid_idx"),
+            # Очередь обработчика просроченных задач всех пользователей: только незавершенные задачи со сроком,
+            # еще не отмеченные просроченными, поэтому отмеченные задачи выходят из индекса.
+            models.Index(
+                fields=("complete_before", "id"),
+                condition=models.Q(completed_at__isnull=True, overdue_at__isnull=True, complete_before__isnull=False),
+                name="task_overdue_queue_idx",
+            ),
+            # Очередь переноса выполненных задач в архив. Условие по статусу не дает планировщику выбрать
+            # этот индекс вместо (user, completed_at) для фильтров списка по времени завершения.
+            models.Index(
+                fields=("completed_at", "id"),
+                condition=models.Q(task_status=COMPLETED_TASK_STATUS_ID),
+                name="task_completed_archive_idx",
+            ),
+            GinIndex(fields=("search_vector",), name="task_search_vector_idx"),
+        )
 
     def __str__(self):
         return self.title
+
+
+class ArchivedTask(UUIDPrimaryKeyMixin):
+    """Архивная задача.
+
+    Задачи, завершенные больше TASKS_ARCHIVE_AFTER_DAYS дней назад, переносятся из таблицы задач командой
+    archive_tasks с теми же id и значениями полей, чтобы не занимать место в индексах, по которым работает
+    API задач. Список и детальный просмотр читают архив только с параметром include_archived (модель
+    TaskWithArchive).
+    """
+
+    title = models.CharField(max_length=100, help_text="Заголовок задачи")
+    description = models.TextField(help_text="Описание задачи")
+    task_status = models.ForeignKey(
+        TaskStatus, on_delete=models.PROTECT, help_text="Статус задачи", related_name="archived_tasks"
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, help_text="Пользователь", related_name="archived_tasks", db_index=False
+    )
+    created_at = models.DateTimeField(help_text="Создана")
+    updated_at = models.DateTimeField(help_text="Обновлена")
+    complete_before = models.DateTimeField(help_text="Завершить до", null=True, blank=True)
+    completed_at = models.DateTimeField(help_text="Завершена", null=True, blank=True)
+    overdue_at = models.DateTimeField(help_text="Отмечена просроченной", null=True, blank=True)
+    change_txid = models.BigIntegerField(default=0, help_text="Транзакция последнего изменения")
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Поисковый вектор заголовка и описания",
+    )
+    archived_at = models.DateTimeField(help_text="Перенесена в архив")
+
+    class Meta:
+        """Метакласс модели архивной задачи."""
+
+        # Индексы для сортировки списка с архивом: объединение читает обе таблицы по (user, поле сортировки, id).
+        indexes = (
+            models.Index(fields=("user", "-created_at", "-id"), name="archive_user_created_idx"),
+            models.Index(fields=("user", "updated_at", "id"), name="archive_user_updated_idx"),
+            models.Index(fields=("user", "complete_before", "id"), name="archive_user_deadline_idx"),
+            models.Index(fields=("user", "completed_at", "id"), name="archive_user_completed_idx"),
+        )
+
+    def __str__(self):
+        return self.title
+
+
+class TaskWithArchive(UUIDPrimaryKeyMixin):
+    """Задачи вместе с архивом: представление tasks_task_with_archive (UNION ALL), только для чтения.
+
+    Условия по пользователю, фильтры и сортировка с LIMIT передаются планировщиком в обе части объединения,
+    поэтому каждая таблица читается по своим индексам. У задач из таблицы задач archived_at пустое.
+    """
+
+    title = models.CharField(max_length=100, help_text="Заголовок задачи")
+    description = models.TextField(help_text="Описание задачи")
+    task_status = models.ForeignKey(
+        TaskStatus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        help_text="Статус задачи",
+        related_name="+",
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, help_text="Пользователь", related_name="+"
+    )
+    created_at = models.DateTimeField(help_text="Создана")
+    updated_at = models.DateTimeField(help_text="Обновлена")
+    complete_before = models.DateTimeField(help_text="Завершить до", null=True, blank=True)
+    completed_at = models.DateTimeField(help_text="Завершена", null=True, blank=True)
+    overdue_at = models.DateTimeField(help_text="Отмечена просроченной", null=True, blank=True)
+    search_vector = SearchVectorField(help_text="Поисковый вектор заголовка и описания")
+    archived_at = models.DateTimeField(help_text="Перенесена в архив", null=True, blank=True)
+
+    class Meta:
+        """Метакласс модели задач с архивом."""
+
+        managed = False
+        db_table = "tasks_task_with_archive"
+
+    def __str__(self):
+        return self.title
+
+
+class TaskStatusCounterManager(models.Manager):
+    """Менеджер счетчиков задач."""
+
+    def rebuild(self, user_ids=None):
+        """Пересчитывает счетчики по задачам всех или перечисленных пользователей.
+
+        На время пересчета таблица задач блокируется от изменений (чтение не блокируется), чтобы триггеры
+        параллельных транзакций не изменили счетчики между удалением и вставкой. Возвращает количество
+        созданных счетчиков.
+        """
+        qn = connection.ops.quote_name
+        task_table, counter_table = qn(Task._meta.db_table), qn(self.model._meta.db_table)
+        user_column = qn(Task._meta.get_field("user").column)
+        status_column = qn(Task._meta.get_field("task_status").column)
+        where, params = "", []
+        if user_ids is not None:
+            where, params = f"WHERE {user_column} = ANY(%s)", [list(user_ids)]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {task_table} IN SHARE MODE")
+            cursor.execute(f"DELETE FROM {counter_table} {where}", params)
+            cursor.execute(
+                f"INSERT INTO {counter_table} ({user_column}, {status_column}, {qn('count')}) "
+                f"SELECT {user_column}, {status_column}, count(*) FROM {task_table} {where} "
+                f"GROUP BY {user_column}, {status_column}",
+                params,
+            )
+            return cursor.rowcount
+
+
+class TaskStatusCounter(models.Model):
+    """Количество задач пользователя в статусе.
+
+    Счетчики поддерживает триггер таблицы задач (миграция 0005_task_status_counters) при любых INSERT, UPDATE
+    и DELETE, в том числе пакетных и выполненных в обход ORM. Пересчитать счетчики по задачам можно
+    командой rebuild_task_counters.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, help_text="Пользователь", related_name="task_status_counters", db_index=False
+    )
+    task_status = models.ForeignKey(
+        TaskStatus, on_delete=models.CASCADE, help_text="Статус задачи", related_name="task_counters"
+    )
+    count = models.IntegerField(default=0, help_text="Количество задач")
+
+    objects = TaskStatusCounterManager()
+
+    class Meta:
+        """Метакласс модели счетчика задач."""
+
+        constraints = (
+            models.UniqueConstraint(fields=("user", "task_status"), name="task_status_counter_user_status_uniq"),
+        )
+
+    def __str__(self):
+        return f"{self.user_id}: {self.task_status_id} = {self.count}"
+
+
+class TaskListVersion(models.Model):
+    """Версия списка задач пользователя для ETag списка (TaskManager.change_marker).
+
+    Увеличивается триггерами таблицы задач (миграция 0010_task_list_version) на каждый оператор INSERT, UPDATE
+    и DELETE, затронувший задачи пользователя, в том числе выполненный в обход ORM.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, help_text="Пользователь", related_name="task_list_version"
+    )
+    version = models.BigIntegerField(default=0, help_text="Версия списка задач")
+
+    def __str__(self):
+        return f"{self.user_id}: {self.version}"
+
+
+class TaskTombstoneManager(models.Manager):
+    """Менеджер записей об удаленных задачах."""
+
+    def purge(self, deleted_before, batch_size):
+        """Удаляет пачку записей, созданных раньше deleted_before. Возвращает ключи (deleted_at, id) пачки."""
+        qn = connection.ops.quote_name
+        table, pk = qn(self.model._meta.db_table), qn(self.model._meta.pk.column)
+        deleted_at = qn(self.model._meta.get_field("deleted_at").column)
+        sql = (
+            f"DELETE FROM {table} WHERE {pk} IN ("
+            f"SELECT {pk} FROM {table} WHERE {deleted_at} < %s ORDER BY {deleted_at}, {pk} LIMIT %s) "
+            f"RETURNING {deleted_at}, {pk}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [deleted_before, batch_size])
+            return cursor.fetchall()
+
+
+class TaskTombstone(models.Model):
+    """Запись об удаленной задаче для синхронизации клиентов.
+
+    Создается триггером таблицы задач (миграция 0008_task_sync) при любом удалении, в том числе при переносе
+    в архив. Хранится TASKS_TOMBSTONE_RETENTION_DAYS дней, старые записи удаляет команда purge_task_tombstones.
+    Внешний ключ на пользователя не проверяется базой: записи об удаленных вместе с пользователем задачах
+    создаются уже после удаления его связанных объектов и удаляются по сроку хранения.
+    """
+
+    task_id = models.UUIDField(help_text="Идентификатор удаленной задачи")
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        help_text="Пользователь",
+        related_name="+",
+    )
+    deleted_txid = models.BigIntegerField(help_text="Транзакция удаления")
+    deleted_at = models.DateTimeField(help_text="Удалена")
+
+    objects = TaskTombstoneManager()
+
+    class Meta:
+        """Метакласс модели записи об удаленной задаче."""
+
+        indexes = (
+            models.Index(fields=("user", "deleted_txid"), name="tombstone_user_txid_idx"),
+            models.Index(fields=("deleted_at", "id"), name="tombstone_deleted_at_idx"),
+        )
+
+    def __str__(self):
+        return str(self.task_id)
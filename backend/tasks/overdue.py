@@ -0,0 +1,30 @@
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from tasks.batches import BatchStats, run_batches
+from tasks.cache import task_cache_versions
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_overdue_tasks(batch_size=None, now=None) -> BatchStats:
+    """Отмечает просроченными незавершенные задачи всех пользователей, срок которых прошел к now.
+
+    Задачи обрабатываются пачками по batch_size (по умолчанию TASKS_OVERDUE_BATCH_SIZE) в порядке срока,
+    каждая пачка выбирается и отмечается одним запросом в своей транзакции. После каждой пачки сбрасывается
+    кэш ответов API задач владельцев отмеченных задач.
+    """
+    batch_size = batch_size or settings.TASKS_OVERDUE_BATCH_SIZE
+    now = now or timezone.now()
+
+    def flag_batch(after):
+        rows = Task.objects.flag_overdue(now, batch_size, after)
+        task_cache_versions.invalidate_users(user_id for _, _, user_id in rows)
+        return [(complete_before, pk) for complete_before, pk, _ in rows]
+
+    stats = run_batches(flag_batch)
+    logger.info("Просроченные задачи отмечены: %s", stats)
+    return stats
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from classifiers.models import TaskStatus
+from tasks.cache import task_cache_versions
+
+
+@receiver(post_save, sender=TaskStatus)
+@receiver(post_delete, sender=TaskStatus)
+def invalidate_task_responses(**kwargs):
+    """Сбрасывает кэш ответов API задач при изменении статусов: статус вложен в представление задачи."""
+    task_cache_versions.invalidate_all()
@@ -0,0 +1,12 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from api.v1.tasks.views import AsyncTaskViewSet
+
+# URLconf тестов асинхронных представлений: задачи обслуживает AsyncTaskViewSet, как при TASKS_ASYNC_VIEWS=true.
+router = DefaultRouter()
+router.register("tasks", AsyncTaskViewSet, basename="tasks")
+
+urlpatterns = [
+    path("api/v1/", include(router.urls)),
+]
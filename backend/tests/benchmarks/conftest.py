@@ -0,0 +1,85 @@
+import os
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.utils import timezone
+from faker import Faker
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.models import TaskStatus
+from tasks.models import Task
+from users.models import User
+
+# Объем данных для замеров задается переменными окружения.
+BENCHMARK_TASKS = int(os.getenv("BENCHMARK_TASKS", 20000))
+BENCHMARK_USERS = int(os.getenv("BENCHMARK_USERS", 50))
+BENCHMARK_TASKS_PER_USER = int(os.getenv("BENCHMARK_TASKS_PER_USER", 200))
+# Зерно генератора данных: с одним и тем же зерном и объемами замеры выполняются на одинаковых данных.
+BENCHMARK_SEED = int(os.getenv("BENCHMARK_SEED", 2024))
+BENCHMARK_BATCH_SIZE = 5000
+
+
+@pytest.fixture
+def seeded_faker(faker: Faker) -> Faker:
+    """Фейкер с фиксированным зерном для воспроизводимых данных замеров."""
+    faker.seed_instance(BENCHMARK_SEED)
+    return faker
+
+
+@pytest.fixture
+def bulk_tasks(seeded_faker: Faker) -> Callable[[User, int], None]:
+    """Фабрика, массово создающая задачи пользователя для замеров."""
+
+    def create(user: User, count: int = BENCHMARK_TASKS, analyze: bool = True) -> None:
+        statuses = list(TaskStatus.objects.order_by("pk"))
+        now = timezone.now()
+        tasks = []
+        for index in range(count):
+            task_status = statuses[index % len(statuses)]
+            complete_before = now + timedelta(days=seeded_faker.random_int(-30, 30)) if index % 3 == 0 else None
+            tasks.append(
+                Task(
+                    title=seeded_faker.sentence(nb_words=4)[:100],
+                    description=seeded_faker.text(max_nb_chars=300),
+                    task_status=task_status,
+                    user=user,
+                    complete_before=complete_before,
+                    completed_at=now if task_status.pk == COMPLETED_TASK_STATUS_ID else None,
+                )
+            )
+        Task.objects.bulk_create(tasks, batch_size=BENCHMARK_BATCH_SIZE)
+        if analyze:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    return create
+
+
+@pytest.fixture
+def bulk_users(seeded_faker: Faker, bulk_tasks: Callable) -> Callable[[int, int], list[User]]:
+    """Фабрика, массово создающая пользователей с задачами для замеров."""
+
+    def create(count: int = BENCHMARK_USERS, tasks_per_user: int = BENCHMARK_TASKS_PER_USER) -> list[User]:
+        # Хеш пароля вычисляется один раз: PBKDF2 для каждого пользователя занял бы большую часть подготовки.
+        password = make_password(seeded_faker.password())
+        users = User.objects.bulk_create(
+            User(
+                email=f"benchmark{index}@{seeded_faker.domain_name()}",
+                username=f"benchmark{index}",
+                first_name=seeded_faker.first_name(),
+                last_name=seeded_faker.last_name(),
+                password=password,
+            )
+            for index in range(count)
+        )
+        for user in users:
+            bulk_tasks(user, tasks_per_user, analyze=False)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+            cursor.execute(f"ANALYZE {Task._meta.db_table}")
+        return users
+
+    return create
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+CONCURRENCY = int(os.getenv("BENCHMARK_CONCURRENCY", 32))
+REQUESTS = int(os.getenv("BENCHMARK_REQUESTS", 2000))
+BACKEND_DIR = Path(settings.BASE_DIR)
+
+
+def free_port() -> int:
+    """Свободный TCP порт."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command: list[str], env: dict[str, str], port: int) -> subprocess.Popen:
+    """Запускает сервер приложения на тестовой базе и ждет, пока он начнет принимать соединения."""
+    env = {
+        **os.environ,
+        "POSTGRES_DB": connection.settings_dict["NAME"],
+        "ALLOWED_HOSTS": "127.0.0.1",
+        **env,
+    }
+    command = [argument.format(port=port) for argument in command]
+    process = subprocess.Popen([sys.executable, "-m", *command], cwd=BACKEND_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Сервер {command[0]} не запустился")
+
+
+async def fetch(port: int, path: str, token: str | None, body: dict | None = None) -> tuple[int, float]:
+    """Запрос по HTTP/1.1 с закрытием соединения, возвращает код ответа и время.
+
+    Без body выполняется GET, с body - POST с телом в JSON.
+    """
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    headers = ["Host: 127.0.0.1", "Connection: close"]
+    if token is not None:
+        headers.append(f"Authorization: Bearer {token}")
+    content = b""
+    if body is not None:
+        content = json.dumps(body).encode()
+        headers.extend(("Content-Type: application/json", f"Content-Length: {len(content)}"))
+    request_line = f"{'GET' if body is None else 'POST'} {path} HTTP/1.1"
+    writer.write("\r\n".join((request_line, *headers, "", "")).encode() + content)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1]), time.perf_counter() - started
+
+
+async def run_load(port: int, path: str, token: str) -> tuple[float, list[float], set[int]]:
+    """Выполняет REQUESTS запросов в CONCURRENCY параллельных клиентов."""
+    queue = iter(range(REQUESTS))
+    timings, statuses = [], set()
+
+    async def client() -> None:
+        for _ in queue:
+            status_code, elapsed = await fetch(port, path, token)
+            statuses.add(status_code)
+            timings.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(CONCURRENCY)))
+    return time.perf_counter() - started, timings, statuses
+
+
+def measure(command: list[str], env: dict[str, str], path: str, token: str) -> tuple[float, list[float], set[int]]:
+    """Запускает сервер и выполняет прогревочную и измеряемую серии запросов."""
+    port = free_port()
+    process = start_server(command, env, port)
+    try:
+        asyncio.run(run_load(port, path, token))
+        return asyncio.run(run_load(port, path, token))
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,147 @@
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.registry import task_status_registry
+from tasks.models import Task
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", 100))
+# Допустимое превышение задержек базового замера в долях: задержки зависят от машины, количество запросов - нет.
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", 1.0))
+UPDATE_BASELINE = os.getenv("BENCHMARK_UPDATE_BASELINE", "false").lower() == "true"
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Сценарий замера: запрос к API, построенный по номеру повторения."""
+
+    method: str
+    path: Callable[[int], str]
+    data: Callable[[int], dict] | None = None
+    authenticated: bool = True
+    # Доля от ITERATIONS: долгие сценарии, например выдача токена с хешированием пароля, повторяются реже.
+    iterations_share: float = 1.0
+
+
+def get_scenarios(tasks: list[str], user: User, password: str) -> dict[str, Scenario]:
+    """Сценарии замеров по id задач пользователя и его учетным данным."""
+
+    def task_path(suffix: str = "") -> Callable[[int], str]:
+        return lambda index: f"/api/v1/tasks/{tasks[index % len(tasks)]}/{suffix}"
+
+    return {
+        "list": Scenario("get", lambda index: "/api/v1/tasks/?page_size=20"),
+        "list_filtered": Scenario(
+            "get", lambda index: f"/api/v1/tasks/?page_size=20&task_status={NOT_COMPLETED_TASK_STATUS_ID}"
+        ),
+        "list_ordering": Scenario("get", lambda index: "/api/v1/tasks/?page_size=20&ordering=complete_before"),
+        "search": Scenario("get", lambda index: "/api/v1/tasks/?page_size=20&search=задача"),
+        "summary": Scenario("get", lambda index: "/api/v1/tasks/summary/"),
+        "retrieve": Scenario("get", task_path()),
+        "retrieve_sparse": Scenario("get", task_path("?exclude=description")),
+        "create": Scenario(
+            "post",
+            lambda index: "/api/v1/tasks/",
+            lambda index: {"title": f"Задача {index}", "description": "Описание", "task_status": 2},
+        ),
+        "change_status": Scenario(
+            "patch",
+            task_path("change_status/"),
+            lambda index: {"task_status": COMPLETED_TASK_STATUS_ID if index % 2 else NOT_COMPLETED_TASK_STATUS_ID},
+        ),
+        "jwt_create": Scenario(
+            "post",
+            lambda index: "/api/v1/jwt/create/",
+            lambda index: {"email": user.email, "password": password},
+            authenticated=False,
+            iterations_share=0.1,
+        ),
+    }
+
+
+def run_scenario(client: APIClient, scenario: Scenario) -> dict[str, float]:
+    """Выполняет сценарий и возвращает перцентили задержки и среднее количество запросов к базе."""
+    request = getattr(client, scenario.method)
+    iterations = max(2, int(ITERATIONS * scenario.iterations_share))
+    # Прогревочный запрос заполняет кэши процесса, как у работающего сервера.
+    request(scenario.path(0), scenario.data and scenario.data(0), format="json")
+    timings, queries = [], 0
+    for index in range(1, iterations + 1):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request(scenario.path(index), scenario.data and scenario.data(index), format="json")
+            timings.append(time.perf_counter() - started)
+        assert response.status_code < 400, f"Код ответа {response.status_code}: {response.content[:200]}"
+        queries += len(captured)
+    percentiles = statistics.quantiles(timings, n=100)
+    return {
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p95_ms": round(percentiles[94] * 1000, 2),
+        "p99_ms": round(percentiles[98] * 1000, 2),
+        "queries": round(queries / iterations, 2),
+    }
+
+
+def find_regressions(name: str, result: dict[str, float], baseline: dict[str, float]) -> list[str]:
+    """Описания показателей сценария, которые хуже базового замера."""
+    regressions = []
+    if result["queries"] > baseline["queries"]:
+        regressions.append(f"{name}: запросов к базе {result['queries']} вместо {baseline['queries']}")
+    for metric in LATENCY_METRICS:
+        limit = baseline[metric] * (1 + TOLERANCE)
+        if result[metric] > limit:
+            regressions.append(f"{name}: {metric} {result[metric]} больше допустимого {limit:.2f}")
+    return regressions
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_api_benchmark(
+    user_one: User,
+    user_one_password: str,
+    user_one_client: APIClient,
+    anonymous_client: APIClient,
+    bulk_tasks: Callable,
+    bulk_users: Callable,
+) -> None:
+    """Замеряет основные запросы API на сгенерированных данных и сравнивает результат с базовым замером.
+
+    Базовый замер хранится в baseline.json и обновляется запуском с BENCHMARK_UPDATE_BASELINE=true.
+    """
+    bulk_users()
+    bulk_tasks(user_one)
+    task_status_registry.all()
+    tasks = [str(task_id) for task_id in Task.objects.filter(user=user_one).values_list("id", flat=True)[:1000]]
+    scenarios = get_scenarios(tasks, user_one, user_one_password)
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    results, regressions = {}, []
+    print(f"\nЗамеры API, {ITERATIONS} повторений, {Task.objects.count()} задач, {User.objects.count()} пользователей:")
+    print(f"  {'сценарий':<16} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9} {'запросов':>9}")
+    for name, scenario in scenarios.items():
+        result = results[name] = run_scenario(user_one_client if scenario.authenticated else anonymous_client, scenario)
+        print(
+            f"  {name:<16} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} "
+            f"{result['p99_ms']:9.2f} {result['queries']:9.2f}"
+        )
+        if name in baseline:
+            regressions.extend(find_regressions(name, result, baseline[name]))
+
+    if UPDATE_BASELINE:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+        return
+    assert not regressions, "Показатели хуже базового замера:\n" + "\n".join(regressions)
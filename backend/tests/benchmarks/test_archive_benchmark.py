@@ -0,0 +1,55 @@
+import statistics
+import time
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from classifiers.registry import task_status_registry
+from tasks.archive import archive_completed_tasks
+from tasks.models import ArchivedTask, Task, TaskWithArchive
+from users.models import User
+
+ITERATIONS = 50
+URL = "/api/v1/tasks/?page_size=20"
+
+
+def median_ms(client: APIClient, url: str) -> float:
+    """Медиана времени ответа на запрос в миллисекундах."""
+    timings = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+    return statistics.median(timings) * 1000
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_archive(user_one: User, user_one_client: APIClient, bulk_tasks: Callable) -> None:
+    """Замеряет перенос завершенных задач в архив и список задач до и после переноса."""
+    bulk_tasks(user_one, analyze=False)
+    Task.objects.filter(completed_at__isnull=False).update(completed_at=timezone.now() - timedelta(days=365))
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+    task_status_registry.all()
+    before = median_ms(user_one_client, URL)
+
+    stats = archive_completed_tasks()
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+        cursor.execute(f"ANALYZE {ArchivedTask._meta.db_table}")
+    after = median_ms(user_one_client, URL)
+    with_archive = median_ms(user_one_client, f"{URL}&include_archived=true")
+    plan = TaskWithArchive.objects.filter(user=user_one).order_by("-created_at").values("id")[:20].explain()
+
+    print(f"\nАрхив задач: перенесено {stats}, в таблице задач осталось {Task.objects.count()}")
+    print(f"  список до переноса        {before:8.2f} мс")
+    print(f"  список после переноса     {after:8.2f} мс")
+    print(f"  список с include_archived {with_archive:8.2f} мс")
+    assert "archive_user_created_idx" in plan, f"Архив в списке читается без индекса:\n{plan}"
@@ -0,0 +1,49 @@
+import statistics
+from typing import Callable
+
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.benchmarks.load import CONCURRENCY, REQUESTS, measure
+from users.models import User
+
+WORKERS = 1
+
+# Способы запуска приложения с одинаковым количеством рабочих процессов: команда и значение TASKS_ASYNC_VIEWS.
+GUNICORN = ["gunicorn", "to_do_list.wsgi:application", "--workers", str(WORKERS), "--bind", "127.0.0.1:{port}"]
+UVICORN = [
+    "uvicorn",
+    "to_do_list.asgi:application",
+    "--workers",
+    str(WORKERS),
+    "--port",
+    "{port}",
+    "--log-level",
+    "warning",
+]
+SERVERS = {
+    "wsgi (gunicorn, sync)": (GUNICORN, "false"),
+    "asgi, sync views": (UVICORN, "false"),
+    "asgi, async views": (UVICORN, "true"),
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_async_views_load(user_one: User, bulk_tasks: Callable) -> None:
+    """Сравнивает пропускную способность списка задач под WSGI и ASGI с синхронными и асинхронными представлениями."""
+    pytest.importorskip("uvicorn")
+    pytest.importorskip("gunicorn")
+    bulk_tasks(user_one)
+    token = str(AccessToken.for_user(user_one))
+    path = "/api/v1/tasks/?page_size=20"
+
+    print(f"\nСписок задач, {WORKERS} рабочий процесс, {CONCURRENCY} параллельных клиентов, {REQUESTS} запросов:")
+    for name, (command, async_views) in SERVERS.items():
+        elapsed, timings, statuses = measure(command, {"TASKS_ASYNC_VIEWS": async_views}, path, token)
+        assert statuses == {200}, f"Неожиданные коды ответа: {statuses}"
+        percentiles = statistics.quantiles(timings, n=100)
+        print(
+            f"  {name:<24} {REQUESTS / elapsed:8.1f} rps, "
+            f"p50 {percentiles[49] * 1000:7.1f} мс, p95 {percentiles[94] * 1000:7.1f} мс"
+        )
@@ -0,0 +1,33 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.registry import task_status_registry
+from users.cache import authenticated_user_cache
+
+REQUESTS = 200
+URL = "/api/v1/tasks/?page_size=1"
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_cached_authentication(user_one_client: APIClient, settings: SettingsWrapper) -> None:
+    """Сравнивает количество запросов к базе и время запроса с кэшем пользователя и без него."""
+    task_status_registry.all()
+    print(f"\nАутентификация по JWT, {REQUESTS} запросов к {URL}:")
+    for name, ttl in (("без кэша", 0), ("с кэшем", 30)):
+        settings.AUTH_USER_CACHE_TTL = ttl
+        authenticated_user_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(REQUESTS):
+                user_one_client.get(URL)
+            elapsed = time.perf_counter() - started
+        print(
+            f"  {name:<10} {len(queries) / REQUESTS:5.2f} запросов к базе на запрос, "
+            f"{elapsed / REQUESTS * 1000:6.2f} мс на запрос, попаданий в кэш {authenticated_user_cache.hits}"
+        )
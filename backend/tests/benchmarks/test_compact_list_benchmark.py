@@ -0,0 +1,49 @@
+import time
+from typing import Callable
+
+import pytest
+
+from api.v1.tasks.encoders import RowEncoder
+from api.v1.tasks.renderers import ORJSONRenderer
+from api.v1.tasks.serializers import TaskIncludedSerializer, TaskListCompactSerializer, TaskListSerializer
+from classifiers.registry import task_status_registry
+from tasks.models import Task
+from users.models import User
+
+ROWS = 1000
+ITERATIONS = 20
+
+
+def measure_page(encode: Callable[[], dict]) -> tuple[int, float]:
+    """Размер отрисованной страницы в байтах и время кодирования и рендеринга страницы, мс."""
+    content = ORJSONRenderer().render(encode())
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        ORJSONRenderer().render(encode())
+    return len(content), (time.perf_counter() - started) / ITERATIONS * 1000
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_compact_list(user_one: User, bulk_tasks: Callable) -> None:
+    """Сравнивает размер и время рендеринга страницы списка со вложенными статусами и со статусами в included."""
+    bulk_tasks(user_one, ROWS)
+    task_status_registry.all()
+    queryset = Task.objects.filter(user=user_one).order_by("-created_at", "-id")[:ROWS]
+    instances = list(queryset.defer("search_vector"))
+    nested_rows = list(queryset.values(*RowEncoder(TaskListSerializer).values_fields))
+    compact_rows = list(queryset.values(*RowEncoder(TaskListCompactSerializer).values_fields))
+
+    def compact(tasks: list[dict]) -> dict:
+        return {"results": tasks, "included": TaskIncludedSerializer.get_included(tasks)}
+
+    report = {
+        "TaskListSerializer, вложенные": lambda: {"results": TaskListSerializer(instances, many=True).data},
+        "TaskListSerializer, included": lambda: compact(TaskListCompactSerializer(instances, many=True).data),
+        "RowEncoder, вложенные": lambda: {"results": RowEncoder(TaskListSerializer).encode(nested_rows)},
+        "RowEncoder, included": lambda: compact(RowEncoder(TaskListCompactSerializer).encode(compact_rows)),
+    }
+    print(f"\nСтраница списка из {ROWS} задач, статусы:")
+    for name, encode in report.items():
+        size, elapsed = measure_page(encode)
+        print(f"  {name:<32} {size / 1024:8.1f} КБ {elapsed:8.2f} мс")
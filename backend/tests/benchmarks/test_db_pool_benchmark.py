@@ -0,0 +1,46 @@
+import statistics
+from typing import Callable
+
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.benchmarks.load import CONCURRENCY, REQUESTS, measure
+from users.models import User
+
+THREADS = 8
+GUNICORN = [
+    "gunicorn",
+    "to_do_list.wsgi:application",
+    "--workers",
+    "1",
+    "--threads",
+    str(THREADS),
+    "--bind",
+    "127.0.0.1:{port}",
+]
+# Режимы соединений с базой: переменные окружения сервера.
+MODES = {
+    "соединение на запрос": {"POSTGRES_POOL": "false", "POSTGRES_CONN_MAX_AGE": "0"},
+    "постоянные соединения": {"POSTGRES_POOL": "false", "POSTGRES_CONN_MAX_AGE": "60"},
+    "пул psycopg 3": {"POSTGRES_POOL": "true", "POSTGRES_POOL_MAX_SIZE": str(THREADS)},
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_db_pool_load(user_one: User, bulk_tasks: Callable) -> None:
+    """Сравнивает пропускную способность списка задач без пула соединений, с постоянными соединениями и с пулом."""
+    pytest.importorskip("gunicorn")
+    bulk_tasks(user_one, 200)
+    token = str(AccessToken.for_user(user_one))
+    path = "/api/v1/tasks/?page_size=20"
+
+    print(f"\nСписок задач, gunicorn с {THREADS} потоками, {CONCURRENCY} параллельных клиентов, {REQUESTS} запросов:")
+    for name, env in MODES.items():
+        elapsed, timings, statuses = measure(GUNICORN, env, path, token)
+        assert statuses == {200}, f"Неожиданные коды ответа: {statuses}"
+        percentiles = statistics.quantiles(timings, n=100)
+        print(
+            f"  {name:<24} {REQUESTS / elapsed:8.1f} rps, "
+            f"p50 {percentiles[49] * 1000:7.1f} мс, p95 {percentiles[94] * 1000:7.1f} мс"
+        )
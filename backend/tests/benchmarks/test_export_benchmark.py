@@ -0,0 +1,32 @@
+import time
+import tracemalloc
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from rest_framework.test import APIClient
+
+from users.models import User
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+def test_export_memory(user_one_client: APIClient, user_one: User, bulk_tasks: Callable, export_format: str) -> None:
+    """Замеряет время и пиковую память выгрузки всех задач пользователя."""
+    bulk_tasks(user_one)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = user_one_client.get("/api/v1/tasks/export/", {"format": export_format})
+    assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+    size = sum(len(chunk) for chunk in response.streaming_content)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"\nВыгрузка {user_one.tasks.count()} задач в {export_format}: {elapsed * 1000:.0f} мс, "
+        f"{size / 2**20:.1f} МБ ответа, пик памяти {peak / 2**20:.1f} МБ"
+    )
+    assert peak < size, "Пиковая память выгрузки не должна расти с объемом ответа"
@@ -0,0 +1,55 @@
+import time
+from typing import Callable
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.tasks.encoders import RowEncoder
+from api.v1.tasks.renderers import MessagePackRenderer, ORJSONRenderer
+from api.v1.tasks.serializers import TaskListSerializer
+from classifiers.registry import task_status_registry
+from tasks.models import Task
+from users.models import User
+
+ROWS = 500
+ITERATIONS = 20
+
+
+def rows_per_second(encode: Callable[[], bytes]) -> float:
+    """Скорость кодирования страницы в строках в секунду."""
+    encode()
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        encode()
+    return ROWS * ITERATIONS / (time.perf_counter() - started)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_list_serialization(user_one: User, bulk_tasks: Callable) -> None:
+    """Сравнивает скорость сериализации и рендеринга страницы списка задач в обычном и быстром режимах."""
+    bulk_tasks(user_one, ROWS)
+    task_status_registry.all()
+    queryset = Task.objects.filter(user=user_one).order_by("-created_at", "-id")
+    instances = list(queryset.defer("search_vector"))
+    encoder = RowEncoder(TaskListSerializer)
+    rows = list(queryset.values(*encoder.values_fields))
+
+    def serializer_path() -> bytes:
+        return JSONRenderer().render(TaskListSerializer(instances, many=True).data)
+
+    def fast_path() -> bytes:
+        return ORJSONRenderer().render(RowEncoder(TaskListSerializer).encode(rows))
+
+    def msgpack_path() -> bytes:
+        return MessagePackRenderer().render(RowEncoder(TaskListSerializer).encode(rows))
+
+    assert serializer_path() == fast_path(), "Результаты режимов отличаются"
+    report = {
+        "TaskListSerializer + JSONRenderer": serializer_path,
+        "RowEncoder + ORJSONRenderer": fast_path,
+        "RowEncoder + MessagePackRenderer": msgpack_path,
+    }
+    print(f"\nСериализация страницы из {ROWS} задач:")
+    for name, encode in report.items():
+        print(f"  {name:<36} {rows_per_second(encode):12.0f} строк/с {len(encode()) / 1024:8.1f} КБ")
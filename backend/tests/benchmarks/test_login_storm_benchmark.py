@@ -0,0 +1,95 @@
+import asyncio
+import os
+import statistics
+from typing import Callable
+
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.benchmarks.load import fetch, free_port, start_server
+from users.models import User
+
+THREADS = 8
+LOGIN_CLIENTS = int(os.getenv("BENCHMARK_LOGIN_CLIENTS", 16))
+TASK_CLIENTS = 4
+TASK_REQUESTS = int(os.getenv("BENCHMARK_REQUESTS", 400))
+TASKS_PATH = "/api/v1/tasks/?page_size=20"
+LOGIN_PATH = "/api/v1/jwt/create/"
+
+# Один процесс gunicorn с потоками: вход и запросы задач конкурируют за ядра одного процесса.
+GUNICORN = [
+    "gunicorn",
+    "to_do_list.wsgi:application",
+    "--workers",
+    "1",
+    "--worker-class",
+    "gthread",
+    "--threads",
+    str(THREADS),
+    "--bind",
+    "127.0.0.1:{port}",
+]
+# Название режима, окружение сервера и наличие волны входов.
+MODES = {
+    "без входов": ({"PASSWORD_HASHING_WORKERS": "0"}, False),
+    "входы, хеширование в потоке запроса": ({"PASSWORD_HASHING_WORKERS": "0"}, True),
+    "входы, пул хеширования из 1 потока": (
+        {"PASSWORD_HASHING_WORKERS": "1", "PASSWORD_HASHING_QUEUE_SIZE": "4"},
+        True,
+    ),
+}
+
+
+async def run_storm(port: int, token: str, credentials: dict | None) -> tuple[list[float], dict[int, int]]:
+    """Запросы списка задач во время непрерывной волны входов: задержки списка и коды ответов входа."""
+    stop = asyncio.Event()
+    logins: dict[int, int] = {}
+    timings = []
+    queue = iter(range(TASK_REQUESTS))
+
+    async def login_client() -> None:
+        while not stop.is_set():
+            status_code, _ = await fetch(port, LOGIN_PATH, None, credentials)
+            logins[status_code] = logins.get(status_code, 0) + 1
+
+    async def task_client() -> None:
+        for _ in queue:
+            status_code, elapsed = await fetch(port, TASKS_PATH, token)
+            assert status_code == 200, f"Код ответа списка {status_code}"
+            timings.append(elapsed)
+
+    storm = [asyncio.create_task(login_client()) for _ in range(LOGIN_CLIENTS if credentials else 0)]
+    # Волна входов успевает занять потоки сервера до начала замера.
+    await asyncio.sleep(1 if credentials else 0)
+    await asyncio.gather(*(task_client() for _ in range(TASK_CLIENTS)))
+    stop.set()
+    await asyncio.gather(*storm)
+    return timings, logins
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_login_storm(user_one: User, user_one_password: str, bulk_tasks: Callable) -> None:
+    """Сравнивает задержку списка задач во время волны входов с хешированием в потоке запроса и в ограниченном пуле."""
+    pytest.importorskip("gunicorn")
+    bulk_tasks(user_one, 2000)
+    token = str(AccessToken.for_user(user_one))
+    credentials = {"email": user_one.email, "password": user_one_password}
+
+    print(
+        f"\nСписок задач во время входов: gunicorn gthread, {THREADS} потоков, {LOGIN_CLIENTS} клиентов входа, "
+        f"{TASK_CLIENTS} клиента списка, {TASK_REQUESTS} запросов списка:"
+    )
+    for name, (env, with_logins) in MODES.items():
+        port = free_port()
+        process = start_server(GUNICORN, env, port)
+        try:
+            timings, logins = asyncio.run(run_storm(port, token, credentials if with_logins else None))
+        finally:
+            process.terminate()
+            process.wait()
+        percentiles = statistics.quantiles(timings, n=100)
+        print(
+            f"  {name:<38} p50 {percentiles[49] * 1000:7.1f} мс, p95 {percentiles[94] * 1000:7.1f} мс, "
+            f"входы по кодам ответа {dict(sorted(logins.items()))}"
+        )
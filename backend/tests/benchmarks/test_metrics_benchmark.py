@@ -0,0 +1,67 @@
+import statistics
+import time
+import timeit
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from classifiers.registry import task_status_registry
+from core.middleware import PerformanceMiddleware
+from users.models import User
+
+REQUESTS = 200
+ROUNDS = 5
+MIDDLEWARE = "core.middleware.PerformanceMiddleware"
+URL = "/api/v1/tasks/?page_size=20"
+
+
+def time_requests(user: User) -> float:
+    """Среднее время запроса списка задач новым клиентом, который загружает текущие MIDDLEWARE."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    client.get(URL)
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        client.get(URL)
+    return (time.perf_counter() - started) / REQUESTS
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_performance_middleware_overhead(user_one: User, settings: SettingsWrapper) -> None:
+    """Сравнивает время запроса с PerformanceMiddleware и без него."""
+    task_status_registry.all()
+    enabled = list(settings.MIDDLEWARE)
+    disabled = [middleware for middleware in enabled if middleware != MIDDLEWARE]
+    timings = {"без PerformanceMiddleware": [], "с PerformanceMiddleware": []}
+    # Чередование серий уменьшает влияние прогрева и фоновой нагрузки на сравнение.
+    for _ in range(ROUNDS):
+        for name, middleware in zip(timings, (disabled, enabled)):
+            settings.MIDDLEWARE = middleware
+            timings[name].append(time_requests(user_one))
+
+    print(f"\nСписок задач, {ROUNDS} серий по {REQUESTS} запросов, медиана:")
+    medians = {name: statistics.median(values) for name, values in timings.items()}
+    for name, median in medians.items():
+        print(f"  {name:<26} {median * 1000:7.3f} мс на запрос")
+    overhead = medians["с PerformanceMiddleware"] - medians["без PerformanceMiddleware"]
+    print(f"  {'накладные расходы':<26} {overhead * 1000:7.3f} мс на запрос")
+
+
+@pytest.mark.benchmark
+def test_performance_middleware_own_time() -> None:
+    """Собственное время PerformanceMiddleware с представлением, которое сразу возвращает ответ."""
+    request = RequestFactory().get(URL)
+    request.resolver_match = resolve("/api/v1/tasks/")
+    response = HttpResponse()
+    middleware = PerformanceMiddleware(lambda request: response)
+    calls = 100000
+
+    elapsed = timeit.timeit(lambda: middleware(request), number=calls)
+
+    print(f"\nСобственное время PerformanceMiddleware: {elapsed / calls * 1e6:.1f} мкс на запрос")
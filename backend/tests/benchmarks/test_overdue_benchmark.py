@@ -0,0 +1,30 @@
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.overdue import sweep_overdue_tasks
+from users.models import User
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_overdue_sweep(user_one: User, bulk_tasks: Callable, bulk_users: Callable) -> None:
+    """Замеряет проход обработчика просроченных задач и повторный проход по пустой очереди."""
+    bulk_users()
+    bulk_tasks(user_one)
+    queue = Task.objects.filter(completed_at__isnull=True, overdue_at__isnull=True, complete_before__lt=timezone.now())
+    plan = queue.order_by("complete_before", "id").values("id")[:500].explain()
+    assert "task_overdue_queue_idx" in plan, f"Очередь просроченных задач выбирается без индекса:\n{plan}"
+
+    stats = sweep_overdue_tasks()
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+    idle = sweep_overdue_tasks()
+
+    print(f"\nОбработчик просроченных задач, {Task.objects.count()} задач:")
+    print(f"  первый проход   {stats}")
+    print(f"  пустая очередь  {idle}")
+    assert idle.processed == 0, "Повторный проход отметил задачи"
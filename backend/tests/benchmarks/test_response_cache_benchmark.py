@@ -0,0 +1,51 @@
+import statistics
+import time
+from typing import Callable
+
+import pytest
+from django.core.cache import cache
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.registry import task_status_registry
+from core.metrics import request_metrics
+from users.models import User
+
+ITERATIONS = 200
+URLS = ("/api/v1/tasks/?page_size=20", "/api/v1/tasks/?page_size=20&ordering=complete_before")
+
+
+def median_ms(client: APIClient) -> float:
+    """Медиана задержки запросов списка, мс."""
+    for url in URLS:
+        client.get(url)
+    timings = []
+    for index in range(ITERATIONS):
+        started = time.perf_counter()
+        client.get(URLS[index % len(URLS)])
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_response_cache(
+    user_one: User, user_one_client: APIClient, bulk_tasks: Callable, settings: SettingsWrapper
+) -> None:
+    """Сравнивает задержку повторяющихся запросов списка задач без кэша ответов и с кэшем в памяти процесса."""
+    bulk_tasks(user_one)
+    task_status_registry.all()
+    cache.clear()
+    request_metrics.clear()
+
+    settings.TASKS_RESPONSE_CACHE = False
+    without_cache = median_ms(user_one_client)
+    settings.TASKS_RESPONSE_CACHE = True
+    with_cache = median_ms(user_one_client)
+
+    print("\nПовторяющиеся запросы списка задач, медиана:")
+    print(f"  без кэша ответов  {without_cache:8.2f} мс")
+    print(f"  с кэшем ответов   {with_cache:8.2f} мс")
+    for line in request_metrics.response_cache.samples():
+        print(f"  {line}")
+    cache.clear()
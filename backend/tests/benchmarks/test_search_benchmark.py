@@ -0,0 +1,34 @@
+import statistics
+import time
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from rest_framework.test import APIClient
+
+from users.models import User
+
+SEARCH_TERMS = ("задача", "работа", "новый год", "вопрос")
+ITERATIONS = 10
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_search_modes(user_one_client: APIClient, user_one: User, bulk_tasks: Callable) -> None:
+    """Сравнивает время поиска задач в режимах fulltext и substring."""
+    bulk_tasks(user_one)
+
+    report = {}
+    for search_mode in ("fulltext", "substring"):
+        timings = []
+        for _ in range(ITERATIONS):
+            for term in SEARCH_TERMS:
+                started = time.perf_counter()
+                response = user_one_client.get("/api/v1/tasks/", {"search": term, "search_mode": search_mode})
+                timings.append(time.perf_counter() - started)
+                assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        report[search_mode] = statistics.median(timings) * 1000
+
+    print(f"\nПоиск по {user_one.tasks.count()} задачам, медиана времени ответа:")
+    for search_mode, median in report.items():
+        print(f"  {search_mode:<10} {median:8.2f} мс")
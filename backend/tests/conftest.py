@@ -1,19 +1,56 @@
+import copy
 from datetime import timezone
-from typing import Type
+from typing import Iterator, Type
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connections
 from faker import Faker
 from faker.generator import random
+from pytest_django.fixtures import SettingsWrapper
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
 
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
 from classifiers.models import TaskStatus
+from classifiers.registry import task_status_registry
 from tasks.models import Task
-from tests.constants import COMPLETED_TASK_STATUS_ID
+from users.cache import authenticated_user_cache
 from users.models import User
 
 
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix: None) -> None:
+    """Добавляет базу replica - зеркало тестовой базы default для тестов маршрутизации чтения на реплики.
+
+    DATABASE_REPLICAS остается пустым, поэтому остальные тесты работают только с default.
+    """
+    replica = copy.deepcopy(connections.settings["default"])
+    replica["TEST"] = {**replica["TEST"], "MIRROR": "default"}
+    connections.settings["replica"] = replica
+
+
+@pytest.fixture(autouse=True)
+def clear_task_status_registry() -> Iterator[None]:
+    """Сбрасывает кэш статусов задач после теста: откат транзакции теста не вызывает сигналов модели."""
+    yield
+    task_status_registry.clear()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budget(settings: SettingsWrapper) -> None:
+    """Превышение бюджета запросов к базе представления завершает тест ошибкой."""
+    settings.QUERY_BUDGET_MODE = "raise"
+
+
+@pytest.fixture(autouse=True)
+def clear_authenticated_user_cache() -> Iterator[None]:
+    """Сбрасывает кэш аутентифицированных пользователей до и после теста."""
+    authenticated_user_cache.clear()
+    yield
+    authenticated_user_cache.clear()
+
+
 @pytest.fixture
 def user_model() -> Type[User]:
     """Фикстура модели пользователя."""
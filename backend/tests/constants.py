@@ -1,2 +1 @@
-COMPLETED_TASK_STATUS_ID = 1
 NOT_COMPLETED_TASK_STATUS_ID = 2
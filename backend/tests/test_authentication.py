@@ -0,0 +1,123 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from users.cache import authenticated_user_cache
+from users.models import User
+
+URL = "/api/v1/tasks/"
+
+
+def count_user_queries(client: APIClient, url: str = URL) -> int:
+    """Выполняет запрос и возвращает количество запросов к таблице пользователей."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+    return sum(User._meta.db_table in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Класс тестов кэширования пользователя при аутентификации по JWT."""
+
+    def test_user_is_loaded_once(self, user_one_client: APIClient) -> None:
+        """Пользователь загружается из базы только при первом запросе."""
+        assert count_user_queries(user_one_client) == 1, "Первый запрос должен загрузить пользователя"
+        assert count_user_queries(user_one_client) == 0, "Повторный запрос не должен загружать пользователя"
+        assert (authenticated_user_cache.hits, authenticated_user_cache.misses) == (1, 1), "Неверные счетчики кэша"
+
+    def test_cache_disabled(self, user_one_client: APIClient, settings: SettingsWrapper) -> None:
+        """При AUTH_USER_CACHE_TTL = 0 пользователь загружается при каждом запросе."""
+        settings.AUTH_USER_CACHE_TTL = 0
+        count_user_queries(user_one_client)
+
+        assert count_user_queries(user_one_client) == 1, "Пользователь должен загружаться из базы"
+
+    def test_cache_expires(
+        self, user_one_client: APIClient, settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """По истечении TTL пользователь снова загружается из базы."""
+        settings.AUTH_USER_CACHE_TTL = 10
+        count_user_queries(user_one_client)
+        now = time.monotonic()
+        monkeypatch.setattr("users.cache.time.monotonic", lambda: now + 11)
+
+        assert count_user_queries(user_one_client) == 1, "Устаревшая запись кэша должна быть загружена заново"
+
+    def test_deactivated_user(self, user_one_client: APIClient, user_one: User) -> None:
+        """Деактивированный пользователь не проходит аутентификацию, несмотря на запись в кэше."""
+        count_user_queries(user_one_client)
+        user_one.is_active = False
+        user_one.save()
+
+        response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, "Код ответа отличается от ожидаемого"
+
+    def test_password_change_invalidates_cache(self, user_one_client: APIClient, user_one: User) -> None:
+        """Смена пароля сбрасывает пользователя в кэше."""
+        count_user_queries(user_one_client)
+        user_one.set_password("new-password")
+        user_one.save()
+
+        assert count_user_queries(user_one_client) == 1, "После смены пароля пользователь должен быть загружен заново"
+
+    def test_deleted_user(self, user_one_client: APIClient, user_one: User) -> None:
+        """Удаленный пользователь не проходит аутентификацию."""
+        count_user_queries(user_one_client)
+        user_one.delete()
+
+        response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, "Код ответа отличается от ожидаемого"
+
+    def test_cached_user_is_copied(self, user_one: User) -> None:
+        """Изменения пользователя, полученного из кэша, не попадают в кэш."""
+        authenticated_user_cache.set(user_one.pk, user_one, authenticated_user_cache.generation)
+        authenticated_user_cache.get(user_one.pk).first_name = "Изменено"
+
+        assert authenticated_user_cache.get(user_one.pk).first_name == user_one.first_name, "Кэш изменен"
+
+    def test_stale_user_is_not_cached(self, user_one: User) -> None:
+        """Пользователь, загруженный до сброса кэша, не сохраняется в кэш."""
+        generation = authenticated_user_cache.generation
+        authenticated_user_cache.invalidate(user_one.pk)
+        authenticated_user_cache.set(user_one.pk, user_one, generation)
+
+        assert authenticated_user_cache.get(user_one.pk) is None, "Устаревший пользователь сохранен в кэш"
+
+    def test_size_limit(
+        self, user_one: User, settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Заполненный кэш вытесняет сначала устаревшие записи, затем дольше всех не запрашивавшиеся."""
+        settings.AUTH_USER_CACHE_TTL = 10
+        settings.AUTH_USER_CACHE_MAX_SIZE = 2
+        now = time.monotonic()
+        monkeypatch.setattr("users.cache.time.monotonic", lambda: now)
+        for user_id in (1, 2):
+            authenticated_user_cache.set(user_id, user_one, authenticated_user_cache.generation)
+        authenticated_user_cache.get(1)
+        authenticated_user_cache.set(3, user_one, authenticated_user_cache.generation)
+
+        assert authenticated_user_cache.get(2) is None, "Дольше всех не запрашивавшийся пользователь не вытеснен"
+        assert authenticated_user_cache.get(1) is not None, "Вытеснен недавно запрошенный пользователь"
+
+        monkeypatch.setattr("users.cache.time.monotonic", lambda: now + 5)
+        authenticated_user_cache.set(4, user_one, authenticated_user_cache.generation)
+        authenticated_user_cache.get(1)
+        monkeypatch.setattr("users.cache.time.monotonic", lambda: now + 11)
+        authenticated_user_cache.set(5, user_one, authenticated_user_cache.generation)
+
+        assert authenticated_user_cache.get(4) is not None, "Вытеснен неустаревший пользователь"
+        assert authenticated_user_cache.get(5) is not None, "Новый пользователь не сохранен"
+
+    @pytest.mark.urls("tests.async_urls")
+    def test_async_authentication(self, user_one_client: APIClient) -> None:
+        """Асинхронная аутентификация использует тот же кэш."""
+        assert count_user_queries(user_one_client) == 1, "Первый запрос должен загрузить пользователя"
+        assert count_user_queries(user_one_client) == 0, "Повторный запрос не должен загружать пользователя"
@@ -0,0 +1,126 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from core.db_router import ReplicaRouter, use_replicas
+from core.middleware import ReplicaRoutingMiddleware
+from tasks.models import Task
+
+URL = "/api/v1/tasks/"
+
+
+@pytest.fixture
+def replicas(settings: SettingsWrapper) -> None:
+    """Чтение с реплики replica - зеркала тестовой базы."""
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.DATABASE_REPLICA_LAG_TOLERANCE = 5
+
+
+class TestReplicaRouter:
+    """Класс тестов выбора базы маршрутизатором."""
+
+    @pytest.mark.usefixtures("replicas")
+    def test_read(self) -> None:
+        """Чтение идет на реплику, только если оно разрешено запросом."""
+        router = ReplicaRouter()
+
+        assert router.db_for_read(Task) == "default", "Чтение вне запроса идет на реплику"
+        with use_replicas():
+            assert router.db_for_read(Task) == "replica", "Разрешенное чтение идет не на реплику"
+            with use_replicas(False):
+                assert router.db_for_read(Task) == "default", "Запрещенное чтение идет на реплику"
+
+    def test_read_without_replicas(self) -> None:
+        """Без реплик чтение идет в default."""
+        with use_replicas():
+            assert ReplicaRouter().db_for_read(Task) == "default", "Чтение идет не в default"
+
+    @pytest.mark.usefixtures("replicas")
+    def test_write_and_migrate(self) -> None:
+        """Запись и миграции только в default."""
+        router = ReplicaRouter()
+
+        with use_replicas():
+            assert router.db_for_write(Task) == "default", "Запись идет не в default"
+        assert router.allow_migrate("default", "tasks"), "Миграции default запрещены"
+        assert not router.allow_migrate("replica", "tasks"), "Миграции разрешены для реплики"
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True, databases=["default", "replica"])
+@pytest.mark.usefixtures("replicas", "user_one_tasks")
+class TestReplicaRouting:
+    """Класс тестов маршрутизации запросов API между default и репликой."""
+
+    @staticmethod
+    def request(client: APIClient, method: str, url: str, data: dict | None = None) -> tuple:
+        """Ответ и количество запросов к default и реплике."""
+        with CaptureQueriesContext(connections["default"]) as default:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = getattr(client, method)(url, data)
+        return response, len(default), len(replica)
+
+    def test_safe_request(self, user_one_client: APIClient) -> None:
+        """Безопасный запрос читает только с реплики."""
+        response, default, replica = self.request(user_one_client, "get", URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert (default, replica > 0) == (0, True), "Безопасный запрос читает не с реплики"
+        assert ReplicaRoutingMiddleware.cookie_name not in response.cookies, "Безопасный запрос закрепил клиента"
+
+    def test_read_after_write(self, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """Запись идет в default и закрепляет клиента за default на время допустимого отставания реплик."""
+        url = f"{URL}{user_one_tasks[0].id}/"
+
+        response, default, replica = self.request(user_one_client, "patch", url, {"title": "Изменена"})
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert (default > 0, replica) == (True, 0), "Изменяющий запрос обращается к реплике"
+        cookie = response.cookies[ReplicaRoutingMiddleware.cookie_name]
+        assert cookie["max-age"] == 5, "Срок закрепления отличается от допустимого отставания"
+
+        response, default, replica = self.request(user_one_client, "get", url)
+        assert response.json()["title"] == "Изменена", "Чтение после записи не видит изменение"
+        assert (default > 0, replica) == (True, 0), "Чтение после записи идет на реплику"
+
+        user_one_client.cookies[ReplicaRoutingMiddleware.cookie_name] = str(time.time() - 1)
+        _, default, replica = self.request(user_one_client, "get", url)
+        assert (default, replica > 0) == (0, True), "После окончания закрепления чтение идет не на реплику"
+
+    def test_failed_write(self, user_one_client: APIClient) -> None:
+        """Неуспешный изменяющий запрос не закрепляет клиента за default."""
+        response, _, _ = self.request(user_one_client, "post", URL, {"title": ""})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert ReplicaRoutingMiddleware.cookie_name not in response.cookies, "Неуспешный запрос закрепил клиента"
+
+    def test_transaction(self) -> None:
+        """Чтение внутри транзакции идет в default, чтобы видеть ее изменения."""
+        with use_replicas(), transaction.atomic():
+            Task.objects.update(title="Изменена")
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                assert set(Task.objects.values_list("title", flat=True)) == {"Изменена"}, "Изменения не видны"
+
+        assert len(replica) == 0, "Чтение внутри транзакции идет на реплику"
+
+    def test_change_status(self, user_one_tasks: list[Task]) -> None:
+        """Смена статуса одним UPDATE идет в default даже при разрешенном чтении с реплик."""
+        task = user_one_tasks[0]
+        with use_replicas(), CaptureQueriesContext(connections["replica"]) as replica:
+            tasks = Task.objects.change_status(task.user_id, [task.id], COMPLETED_TASK_STATUS_ID)
+
+        assert [changed.id for changed in tasks] == [task.id], "Статус задачи не изменен"
+        assert len(replica) == 0, "Смена статуса идет на реплику"
+
+    def test_sync(self, user_one_client: APIClient) -> None:
+        """Синхронизация читает снимок, задачи и удаленные задачи из одной базы."""
+        cursor = user_one_client.get(f"{URL}sync/").json()["cursor"]
+
+        response, default, replica = self.request(user_one_client, "get", f"{URL}sync/", {"updated_since": cursor})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert (default, replica) == (0, 3), "Синхронизация читает не только с реплики"
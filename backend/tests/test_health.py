@@ -0,0 +1,85 @@
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+from django.db import OperationalError, connection, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from rest_framework.test import APIClient
+
+from core.db import get_pool_stats
+
+URL = "/api/v1/health/ready/"
+POOL_ALIAS = "pooled"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def pooled_connection() -> Iterator[BaseDatabaseWrapper]:
+    """Соединение с тестовой базой через пул psycopg 3 из одного соединения."""
+    settings_dict = {**connections["default"].settings_dict, "CONN_MAX_AGE": 0}
+    settings_dict["OPTIONS"] = {"pool": {"min_size": 1, "max_size": 1, "timeout": 0.1}}
+    pooled = connections["default"].__class__(settings_dict, alias=POOL_ALIAS)
+    connections[POOL_ALIAS] = pooled
+    yield pooled
+    pooled.close()
+    pooled.close_pool()
+    del connections[POOL_ALIAS]
+
+
+class TestReadiness:
+    """Класс тестов проверки готовности."""
+
+    def test_ready_without_pool(self, anonymous_client: APIClient) -> None:
+        """Проверка готовности доступна без аутентификации, без пула метрики пула не возвращаются."""
+        response = anonymous_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json() == {"database": "ok", "pool": None}, "Ответ отличается от ожидаемого"
+
+    def test_database_unavailable(self, anonymous_client: APIClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Если база недоступна, проверка готовности отвечает 503."""
+
+        def cursor():
+            raise OperationalError("connection refused")
+
+        monkeypatch.setattr(connection, "cursor", cursor)
+
+        response = anonymous_client.get(URL)
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, "Код ответа отличается от ожидаемого"
+        assert response.json()["database"] == "unavailable", "Ответ отличается от ожидаемого"
+
+    def test_ready_with_pool(
+        self, anonymous_client: APIClient, pooled_connection: BaseDatabaseWrapper, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверка готовности возвращает метрики пула."""
+        monkeypatch.setattr("api.v1.health.views.connection", pooled_connection)
+
+        response = anonymous_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        pool = response.json()["pool"]
+        assert (pool["max_size"], pool["in_use"], pool["requests"]) == (1, 1, 1), "Метрики пула отличаются"
+
+
+def test_pool_stats(pooled_connection: BaseDatabaseWrapper) -> None:
+    """Метрики пула отражают выданные и свободные соединения и запросы, не дождавшиеся соединения."""
+    pooled_connection.ensure_connection()
+    stats = get_pool_stats(POOL_ALIAS)
+    assert (stats["in_use"], stats["idle"]) == (1, 0), "Соединение должно быть выдано"
+
+    waiting = connections["default"].__class__(pooled_connection.settings_dict, alias=POOL_ALIAS)
+    with pytest.raises(OperationalError):
+        waiting.ensure_connection()
+    pooled_connection.close()
+
+    stats = get_pool_stats(POOL_ALIAS)
+    assert (stats["in_use"], stats["idle"]) == (0, 1), "Соединение должно вернуться в пул"
+    assert (stats["requests"], stats["timeouts"]) == (2, 1), "Неверное количество запросов и таймаутов"
+    assert stats["wait_ms"] >= 100, "Время ожидания соединения не учтено"
+
+
+def test_pool_stats_without_pool() -> None:
+    """Без пула метрики не возвращаются."""
+    assert get_pool_stats() is None, "Без пула метрики должны быть None"
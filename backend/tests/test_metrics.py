@@ -0,0 +1,148 @@
+import re
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from api.v1.tasks.views import TaskViewSet
+from core.metrics import Histogram, request_metrics
+from core.query_budget import QueryBudgetExceeded
+
+URL = "/api/v1/tasks/"
+METRICS_URL = "/metrics"
+METRICS_TOKEN = "metrics-token"
+SERVER_TIMING = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", serialize;dur=(?P<serialize>[\d.]+), '
+    r"total;dur=(?P<total>[\d.]+)"
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_request_metrics() -> Iterator[None]:
+    """Сбрасывает метрики запросов до и после теста."""
+    request_metrics.clear()
+    yield
+    request_metrics.clear()
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """Значения заголовка Server-Timing."""
+    match = SERVER_TIMING.fullmatch(header)
+    assert match is not None, f"Заголовок Server-Timing имеет неожиданный формат: {header}"
+    return {name: float(value) for name, value in match.groupdict().items()}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestPerformanceMiddleware:
+    """Класс тестов замеров обработки запросов."""
+
+    def test_server_timing(self, user_one_client: APIClient) -> None:
+        """Server-Timing содержит количество запросов к базе, время сериализации и полное время."""
+        with CaptureQueriesContext(connection) as queries:
+            response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        timing = parse_server_timing(response.headers["Server-Timing"])
+        assert timing["queries"] == len(queries), "Количество запросов к базе отличается от выполненного"
+        assert 0 < timing["db"] < timing["total"], "Время запросов к базе не учтено"
+        assert 0 < timing["serialize"] < timing["total"], "Время сериализации не учтено"
+
+    def test_server_timing_disabled(self, user_one_client: APIClient, settings: SettingsWrapper) -> None:
+        """Заголовок Server-Timing отключается настройкой."""
+        settings.SERVER_TIMING_HEADER = False
+
+        response = user_one_client.get(URL)
+
+        assert "Server-Timing" not in response.headers, "Заголовок Server-Timing должен быть отключен"
+
+    def test_metrics(self, user_one_client: APIClient, anonymous_client: APIClient, settings: SettingsWrapper) -> None:
+        """Метрики агрегируются по представлению и действию и отдаются в текстовом формате Prometheus."""
+        settings.METRICS_TOKEN = METRICS_TOKEN
+        user_one_client.get(URL)
+        user_one_client.get(URL)
+        user_one_client.get("/api/v1/tasks/not-a-task/")
+        anonymous_client.get("/not-found/")
+
+        response = anonymous_client.get(METRICS_URL, HTTP_AUTHORIZATION=f"Bearer {METRICS_TOKEN}")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4"), "Неверный тип ответа"
+        lines = response.content.decode().splitlines()
+        labels = 'view="TaskViewSet",action="list",method="GET"'
+        expected = [
+            "# TYPE http_request_duration_seconds histogram",
+            f'http_requests_total{{{labels},status="200"}} 2',
+            'http_requests_total{view="TaskViewSet",action="retrieve",method="GET",status="404"} 1',
+            'http_requests_total{view="unmatched",action="",method="GET",status="404"} 1',
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            f"http_request_duration_seconds_count{{{labels}}} 2",
+            f"http_request_serialization_seconds_count{{{labels}}} 2",
+            f'http_request_db_queries_bucket{{{labels},le="0.0"}} 0',
+        ]
+        for line in expected:
+            assert line in lines, f"В метриках нет строки {line}"
+
+    def test_metrics_without_token_setting(self, anonymous_client: APIClient, settings: SettingsWrapper) -> None:
+        """Без настройки METRICS_TOKEN метрики недоступны."""
+        settings.METRICS_TOKEN = ""
+
+        response = anonymous_client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer ")
+
+        assert response.status_code == HTTPStatus.NOT_FOUND, "Код ответа отличается от ожидаемого"
+
+    @pytest.mark.parametrize("authorization", [None, "Bearer wrong-token", METRICS_TOKEN])
+    def test_metrics_invalid_token(
+        self, anonymous_client: APIClient, settings: SettingsWrapper, authorization: str | None
+    ) -> None:
+        """Запрос метрик без токена или с неверным токеном отклоняется."""
+        settings.METRICS_TOKEN = METRICS_TOKEN
+        headers = {"HTTP_AUTHORIZATION": authorization} if authorization else {}
+
+        response = anonymous_client.get(METRICS_URL, **headers)
+
+        assert response.status_code == HTTPStatus.FORBIDDEN, "Код ответа отличается от ожидаемого"
+        assert b"http_requests_total" not in response.content, "Метрики отданы без токена"
+
+    def test_streaming_response(self, user_one_client: APIClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Запросы при отправке тела потокового ответа учитываются, метрики и бюджет - после отправки тела."""
+        monkeypatch.setitem(TaskViewSet.query_budgets, "export", 0)
+        labels = 'view="TaskViewSet",action="export",method="GET"'
+
+        response = user_one_client.get("/api/v1/tasks/export/", {"format": "csv"})
+
+        assert f'http_requests_total{{{labels},status="200"}} 1' not in request_metrics.render(), "Запрос учтен рано"
+        with pytest.raises(QueryBudgetExceeded, match="export: 1 запросов к базе при бюджете 0"):
+            b"".join(response.streaming_content)
+        lines = request_metrics.render().splitlines()
+        assert f'http_requests_total{{{labels},status="200"}} 1' in lines, "Запрос не учтен в метриках"
+        assert f'http_request_db_queries_bucket{{{labels},le="0.0"}} 0' in lines, "Запрос к базе не учтен"
+
+    @pytest.mark.urls("tests.async_urls")
+    def test_async_views(self, user_one_client: APIClient) -> None:
+        """Запросы к базе асинхронных представлений учитываются в замерах запроса."""
+        with CaptureQueriesContext(connection) as queries:
+            response = user_one_client.get(URL)
+
+        timing = parse_server_timing(response.headers["Server-Timing"])
+        assert timing["queries"] == len(queries), "Количество запросов к базе отличается от выполненного"
+        assert timing["serialize"] > 0, "Время сериализации не учтено"
+
+
+def test_histogram() -> None:
+    """Корзины гистограммы накопительные, граница корзины входит в нее."""
+    histogram = Histogram("latency", "Задержка.", ("view",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(('Task"View',), value)
+
+    assert list(histogram.samples()) == [
+        'latency_bucket{view="Task\\"View",le="0.1"} 2',
+        'latency_bucket{view="Task\\"View",le="1.0"} 3',
+        'latency_bucket{view="Task\\"View",le="+Inf"} 4',
+        'latency_sum{view="Task\\"View"} 2.65',
+        'latency_count{view="Task\\"View"} 4',
+    ], "Значения гистограммы отличаются от ожидаемых"
@@ -0,0 +1,128 @@
+import threading
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, identify_hasher, make_password
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from core.metrics import request_metrics
+from users.hashers import (
+    BoundedPBKDF2PasswordHasher,
+    PasswordHashingBusy,
+    PasswordHashingExecutor,
+    password_hashing_executor,
+)
+from users.models import User
+
+
+@pytest.fixture
+def executor(settings: SettingsWrapper) -> Iterator[PasswordHashingExecutor]:
+    """Пул хеширования из одного потока с очередью из одного пароля."""
+    settings.PASSWORD_HASHING_WORKERS = 1
+    settings.PASSWORD_HASHING_QUEUE_SIZE = 1
+    request_metrics.clear()
+    executor = PasswordHashingExecutor()
+    yield executor
+    executor.shutdown()
+    request_metrics.clear()
+
+
+@pytest.fixture
+def busy_executor(executor: PasswordHashingExecutor) -> Iterator[PasswordHashingExecutor]:
+    """Пул, поток которого занят, а очередь заполнена."""
+    started, release = threading.Event(), threading.Event()
+    executor.submit(lambda: started.set() or release.wait(10))
+    assert started.wait(10), "Хеширование не началось"
+    executor.submit(lambda: None)
+    yield executor
+    release.set()
+
+
+class TestPasswordHasher:
+    """Класс тестов хешера паролей."""
+
+    def test_hasher(self, settings: SettingsWrapper) -> None:
+        """Пароли хешируются BoundedPBKDF2PasswordHasher с числом итераций из настроек."""
+        settings.PASSWORD_HASHER_ITERATIONS = 1000
+        encoded = make_password("пароль")
+
+        assert isinstance(identify_hasher(encoded), BoundedPBKDF2PasswordHasher), "Пароль хеширован другим хешером"
+        assert encoded.startswith("pbkdf2_sha256$1000$"), "Число итераций отличается от настройки"
+        assert check_password("пароль", encoded), "Пароль не прошел проверку"
+        assert not check_password("другой", encoded), "Неверный пароль прошел проверку"
+
+    def test_default_hashes(self, settings: SettingsWrapper) -> None:
+        """Хеши стандартного PBKDF2PasswordHasher проверяются и пересчитываются при смене числа итераций."""
+        settings.PASSWORD_HASHER_ITERATIONS = 1000
+        encoded = PBKDF2PasswordHasher().encode("пароль", "salt" * 4, 2000)
+        updated = []
+
+        assert check_password("пароль", encoded, setter=updated.append), "Стандартный хеш не прошел проверку"
+        assert updated == ["пароль"], "Хеш с другим числом итераций не пересчитан"
+
+    def test_hashing_in_pool(self) -> None:
+        """Хеширование выполняется в потоке пула, а не в потоке запроса."""
+        thread_names = []
+        password_hashing_executor.run(lambda: thread_names.append(threading.current_thread().name))
+
+        assert thread_names[0].startswith("password-hashing"), "Пароль хеширован не в пуле"
+
+    def test_without_pool(self, settings: SettingsWrapper) -> None:
+        """При PASSWORD_HASHING_WORKERS = 0 пароль хешируется в потоке запроса."""
+        settings.PASSWORD_HASHING_WORKERS = 0
+
+        assert password_hashing_executor.run(threading.current_thread) is threading.current_thread(), "Не в потоке"
+
+
+class TestPasswordHashingExecutor:
+    """Класс тестов ограниченного пула хеширования."""
+
+    def test_queue_limit(self, busy_executor: PasswordHashingExecutor) -> None:
+        """Хеширование сверх очереди сразу отклоняется, очередь и отказы видны в метриках."""
+        with pytest.raises(PasswordHashingBusy):
+            busy_executor.submit(lambda: None)
+
+        metrics = request_metrics.render()
+        assert "password_hashing_queue_depth 1" in metrics, "Нет глубины очереди"
+        assert "password_hashing_in_progress 1" in metrics, "Нет количества выполняемых хеширований"
+        assert "password_hashing_rejected_total 1" in metrics, "Нет количества отказов"
+
+    @pytest.mark.parametrize("workers", [0, -1])
+    def test_pool_without_workers(
+        self, executor: PasswordHashingExecutor, settings: SettingsWrapper, workers: int
+    ) -> None:
+        """Пул создается хотя бы с одним потоком, даже если PASSWORD_HASHING_WORKERS не больше нуля."""
+        settings.PASSWORD_HASHING_WORKERS = workers
+
+        assert executor.submit(make_password, "пароль", "salt" * 4).result() == make_password(
+            "пароль", "salt" * 4
+        ), "Хеш из пула отличается"
+
+    @pytest.mark.django_db
+    def test_login_unavailable(
+        self,
+        user_one: User,
+        user_one_password: str,
+        anonymous_client: APIClient,
+        busy_executor: PasswordHashingExecutor,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Вход при заполненной очереди хеширования получает 503."""
+        monkeypatch.setattr("users.hashers.password_hashing_executor", busy_executor)
+
+        response = anonymous_client.post(
+            "/api/v1/jwt/create/", {"email": user_one.email, "password": user_one_password}, format="json"
+        )
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, "Код ответа отличается от ожидаемого"
+
+    def test_hasher_busy_outside_api(
+        self, busy_executor: PasswordHashingExecutor, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Вне API заполненная очередь завершает хеширование PasswordHashingBusy, а не исключением DRF."""
+        monkeypatch.setattr("users.hashers.password_hashing_executor", busy_executor)
+
+        with pytest.raises(PasswordHashingBusy):
+            make_password("пароль")
@@ -0,0 +1,99 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework import viewsets
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.v1.tasks.permissions import IsTaskOwnerOrForbidden
+from api.v1.tasks.views import TaskViewSet
+from core.metrics import request_metrics
+from core.query_budget import QueryBudgetExceeded, query_budget
+from tasks.models import Task
+from users.models import User
+
+URL = "/api/v1/tasks/"
+
+
+@pytest.fixture
+def strict_list_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Бюджет списка задач на один запрос меньше, чем ему нужно."""
+    monkeypatch.setattr(TaskViewSet, "query_budgets", {**TaskViewSet.query_budgets, "list": 1})
+
+
+def test_query_budget_inheritance() -> None:
+    """Бюджеты подкласса дополняют и переопределяют бюджеты родителя."""
+
+    @query_budget(list=2, retrieve=2)
+    class ParentViewSet(viewsets.GenericViewSet):
+        pass
+
+    @query_budget(retrieve=3, create=1)
+    class ChildViewSet(ParentViewSet):
+        pass
+
+    assert ParentViewSet.query_budgets == {"list": 2, "retrieve": 2}, "Бюджеты родителя изменились"
+    assert ChildViewSet.query_budgets == {"list": 2, "retrieve": 3, "create": 1}, "Бюджеты подкласса отличаются"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestQueryBudget:
+    """Класс тестов проверки бюджета запросов к базе."""
+
+    def test_cache_fills_are_exempt(self, user_one_client: APIClient) -> None:
+        """Загрузка пользователя и статусов в кэш процесса не учитывается в бюджете."""
+        response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+
+    @pytest.mark.usefixtures("strict_list_budget")
+    def test_raise(self, user_one_client: APIClient) -> None:
+        """В режиме raise превышение бюджета завершается исключением."""
+        with pytest.raises(QueryBudgetExceeded, match="TaskViewSet.list: 2"):
+            user_one_client.get(URL)
+
+    @pytest.mark.usefixtures("strict_list_budget")
+    def test_warn(
+        self, user_one_client: APIClient, settings: SettingsWrapper, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """В режиме warn превышение бюджета пишется в лог и учитывается в метриках, ответ не меняется."""
+        settings.QUERY_BUDGET_MODE = "warn"
+        request_metrics.clear()
+
+        with caplog.at_level(logging.WARNING, logger="core.query_budget"):
+            response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert "TaskViewSet.list: 2 запросов к базе при бюджете 1" in caplog.text, "Нет предупреждения в логе"
+        assert (
+            'http_query_budget_exceeded_total{view="TaskViewSet",action="list",method="GET"} 1'
+            in request_metrics.render().splitlines()
+        ), "Превышение бюджета не учтено в метриках"
+        request_metrics.clear()
+
+    @pytest.mark.usefixtures("strict_list_budget")
+    def test_off(self, user_one_client: APIClient, settings: SettingsWrapper, caplog: pytest.LogCaptureFixture) -> None:
+        """В режиме off бюджет не проверяется."""
+        settings.QUERY_BUDGET_MODE = "off"
+
+        with caplog.at_level(logging.WARNING, logger="core.query_budget"):
+            response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert not caplog.records, "В режиме off не должно быть предупреждений"
+
+
+@pytest.mark.django_db
+def test_owner_permission_does_not_load_user(
+    user_one: User, user_one_task: Task, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    """Проверка владельца задачи сравнивает user_id и не загружает пользователя задачи."""
+    request = APIRequestFactory().get(URL)
+    request.user = user_one
+    task = Task.objects.get(id=user_one_task.id)
+
+    with django_assert_num_queries(0):
+        assert IsTaskOwnerOrForbidden().has_object_permission(request, None, task), "Владелец должен иметь доступ"
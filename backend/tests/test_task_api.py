@@ -9,9 +9,9 @@ from faker import Faker
 from pytest_lazy_fixtures import lf
 from rest_framework.test import APIClient
 
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
 from classifiers.models import TaskStatus
 from tasks.models import Task, User
-from tests.constants import COMPLETED_TASK_STATUS_ID
 from tests.functions import date_format, date_from_iso_str
 
 
@@ -35,7 +35,7 @@ class TestTaskApi:
 
         if expected_status_code == HTTPStatus.OK:
             json = response.json()
-            assert len(json) == user.tasks.count()
+            assert len(json["results"]) == user.tasks.count()
 
     @pytest.mark.parametrize(
         ("client", "expected_status_code", "user"),
@@ -0,0 +1,174 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pytest_django import DjangoAssertNumQueries
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.registry import task_status_registry
+from tasks.archive import archive_completed_tasks
+from tasks.models import ArchivedTask, Task
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+URL = "/api/v1/tasks/"
+
+
+def create_task(user: User, completed_days_ago: int | None) -> Task:
+    """Задача, завершенная указанное количество дней назад, или незавершенная задача."""
+    completed = completed_days_ago is not None
+    return Task.objects.create(
+        title=f"Задача {completed_days_ago}",
+        description="Описание",
+        task_status_id=COMPLETED_TASK_STATUS_ID if completed else NOT_COMPLETED_TASK_STATUS_ID,
+        user=user,
+        completed_at=timezone.now() - timedelta(days=completed_days_ago) if completed else None,
+    )
+
+
+@pytest.mark.django_db
+class TestTaskArchive:
+    """Класс тестов архива задач."""
+
+    def test_archive(self, user_one: User, user_two: User) -> None:
+        """В архив пачками переносятся задачи всех пользователей, завершенные раньше заданного срока."""
+        old = [create_task(user, days) for days in (100, 200, 300) for user in (user_one, user_two)]
+        recent = [create_task(user_one, 10), create_task(user_one, None)]
+        task = Task.objects.get(id=old[0].id)
+
+        stats = archive_completed_tasks(days=90, batch_size=4)
+
+        assert (stats.processed, stats.batches) == (len(old), 2), "Статистика переноса отличается от ожидаемой"
+        assert set(Task.objects.values_list("id", flat=True)) == {task.id for task in recent}, "Задачи не перенесены"
+        assert set(ArchivedTask.objects.values_list("id", flat=True)) == {task.id for task in old}, "Архив неполный"
+        archived = ArchivedTask.objects.get(id=task.id)
+        assert (archived.title, archived.user_id, archived.created_at, archived.completed_at) == (
+            task.title,
+            task.user_id,
+            task.created_at,
+            task.completed_at,
+        ), "Поля архивной задачи отличаются от задачи"
+        assert archived.archived_at is not None, "Не заполнено время переноса в архив"
+        assert archive_completed_tasks(days=90).processed == 0, "Повторный перенос нашел задачи"
+
+    def test_command(self, user_one: User, capsys: pytest.CaptureFixture) -> None:
+        """Команда переносит задачи в архив и выводит статистику."""
+        create_task(user_one, 10)
+
+        call_command("archive_tasks", "--days", "5", "--batch-size", "10")
+
+        assert "задач: 1, пачек: 1" in capsys.readouterr().out, "Нет статистики переноса"
+        assert ArchivedTask.objects.count() == 1, "Задача не перенесена в архив"
+
+    def test_summary_excludes_archive(self, user_one: User, user_one_client: APIClient) -> None:
+        """Архивные задачи не учитываются в сводке задач."""
+        create_task(user_one, 100)
+        create_task(user_one, None)
+        archive_completed_tasks(days=90)
+
+        assert user_one_client.get(f"{URL}summary/").json()["total"] == 1, "Архивная задача учтена в сводке"
+
+
+@pytest.mark.django_db
+class TestTaskListWithArchive:
+    """Класс тестов чтения задач вместе с архивом."""
+
+    @pytest.fixture(autouse=True)
+    def archive(self, user_one: User, user_two: User) -> None:
+        """Архивные и текущие задачи пользователей."""
+        for days in (100, 200, 10, None):
+            create_task(user_one, days)
+        create_task(user_two, 100)
+        archive_completed_tasks(days=90)
+
+    def test_list_without_archive(self, user_one_client: APIClient) -> None:
+        """По умолчанию список не читает архив."""
+        response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        results = response.json()["results"]
+        assert len(results) == 2, "В списке есть архивные задачи"
+        assert "archived_at" not in results[0], "В списке без архива есть поле archived_at"
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_list_with_archive(
+        self,
+        settings,
+        user_one_client: APIClient,
+        django_assert_num_queries: DjangoAssertNumQueries,
+        fast_path: bool,
+    ) -> None:
+        """С include_archived список читает задачи пользователя из обеих таблиц с фильтрами и сортировкой."""
+        settings.TASKS_LIST_FAST_PATH = fast_path
+        task_status_registry.all()
+        user_one_client.get(URL)
+
+        with django_assert_num_queries(2):
+            response = user_one_client.get(URL, {"include_archived": "true", "ordering": "completed_at"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        results = response.json()["results"]
+        assert [task["title"] for task in results] == [
+            "Задача 200",
+            "Задача 100",
+            "Задача 10",
+            "Задача None",
+        ], "Задачи с архивом отсортированы неверно"
+        assert [task["archived_at"] is not None for task in results] == [True, True, False, False], "Нет archived_at"
+
+        response = user_one_client.get(URL, {"include_archived": "true", "task_status": COMPLETED_TASK_STATUS_ID})
+        assert len(response.json()["results"]) == 3, "Фильтр не применен к архиву"
+
+    def test_retrieve_archived(self, user_one: User, user_one_client: APIClient) -> None:
+        """С include_archived архивная задача доступна по id вместе с полем archived_at."""
+        task = ArchivedTask.objects.filter(user=user_one).first()
+
+        response = user_one_client.get(f"{URL}{task.id}/", {"include_archived": "true"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        data = response.json()
+        assert (data["title"], data["task_status"]["id"]) == (task.title, task.task_status_id), "Задача отличается"
+        assert data["archived_at"] is not None, "Нет времени переноса в архив"
+        assert (
+            user_one_client.get(f"{URL}{task.id}/").status_code == HTTPStatus.NOT_FOUND
+        ), "Архив прочитан без параметра"
+
+    def test_retrieve_current_with_archive(self, user_one: User, user_one_client: APIClient) -> None:
+        """Текущая задача с include_archived отдается с пустым archived_at."""
+        task = Task.objects.filter(user=user_one).first()
+
+        response = user_one_client.get(f"{URL}{task.id}/", {"include_archived": "true"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json()["archived_at"] is None, "У текущей задачи заполнено archived_at"
+
+    def test_retrieve_archived_foreign(self, user_two: User, user_one_client: APIClient) -> None:
+        """Архивная задача другого пользователя недоступна."""
+        task = ArchivedTask.objects.get(user=user_two)
+
+        response = user_one_client.get(f"{URL}{task.id}/", {"include_archived": "true"})
+
+        assert response.status_code == HTTPStatus.NOT_FOUND, "Код ответа отличается от ожидаемого"
+
+    @pytest.mark.parametrize("method", ["patch", "delete"])
+    def test_write_archived(self, user_one: User, user_one_client: APIClient, method: str) -> None:
+        """Изменяющие запросы не находят архивную задачу и с include_archived."""
+        task = ArchivedTask.objects.filter(user=user_one).first()
+
+        response = getattr(user_one_client, method)(f"{URL}{task.id}/?include_archived=true", {"title": "Новая"})
+
+        assert response.status_code == HTTPStatus.NOT_FOUND, "Код ответа отличается от ожидаемого"
+        assert ArchivedTask.objects.get(id=task.id).title == task.title, "Архивная задача изменена"
+
+    @pytest.mark.urls("tests.async_urls")
+    def test_async_retrieve_archived(self, user_one: User, user_one_client: APIClient) -> None:
+        """Асинхронный детальный просмотр с include_archived читает архив."""
+        task = ArchivedTask.objects.filter(user=user_one).first()
+
+        response = user_one_client.get(f"{URL}{task.id}/", {"include_archived": "true"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json()["archived_at"] is not None, "Нет времени переноса в архив"
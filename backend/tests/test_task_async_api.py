@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.urls import resolve
+from faker import Faker
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from api.v1.tasks.serializers import TaskListSerializer, TaskSerializer
+from classifiers.models import TaskStatus
+from classifiers.registry import task_status_registry
+from tasks.cache import task_cache_versions
+from tasks.models import Task
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+# Синхронный тестовый клиент вызывает асинхронное представление через async_to_sync, поэтому синхронное
+# обращение к ORM внутри него завершилось бы исключением SynchronousOnlyOperation.
+pytestmark = [pytest.mark.django_db, pytest.mark.urls("tests.async_urls")]
+
+
+def test_views_are_async() -> None:
+    """Маршруты задач обслуживаются асинхронными представлениями."""
+    assert iscoroutinefunction(resolve("/api/v1/tasks/").func), "Список задач должен быть асинхронным"
+    assert iscoroutinefunction(resolve("/api/v1/tasks/bulk/").func), "Маршрут должен быть асинхронным"
+
+
+@pytest.mark.usefixtures("user_one_tasks")
+class TestAsyncTaskList:
+    """Класс тестов асинхронного списка задач."""
+
+    def test_list(
+        self, user_one_client: APIClient, user_one: User, django_assert_num_queries: DjangoAssertNumQueries
+    ) -> None:
+        """Асинхронный список совпадает с сериализацией задач и выполняет те же запросы, что и синхронный."""
+        task_status_registry.all()
+        # Пользователь, маркер изменений для ETag и страница задач.
+        with django_assert_num_queries(3):
+            response = user_one_client.get("/api/v1/tasks/")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        tasks = Task.objects.filter(user=user_one).order_by("-created_at", "-id")
+        assert response.json()["results"] == TaskListSerializer(tasks, many=True).data, "Список отличается"
+
+    def test_list_pagination_and_filters(self, user_one_client: APIClient, user_one: User) -> None:
+        """Курсорная пагинация и фильтры работают в асинхронном списке."""
+        expected = Task.objects.filter(user=user_one, task_status=NOT_COMPLETED_TASK_STATUS_ID).order_by(
+            "-created_at", "-id"
+        )
+        url = f"/api/v1/tasks/?page_size=2&task_status={NOT_COMPLETED_TASK_STATUS_ID}"
+        ids = []
+        while url is not None:
+            json = user_one_client.get(url).json()
+            ids.extend(task["id"] for task in json["results"])
+            url = json["next"]
+
+        assert ids == [str(task.id) for task in expected], "Состав задач при обходе страниц отличается"
+
+    def test_list_not_modified(self, user_one_client: APIClient) -> None:
+        """Асинхронный список отвечает 304 на актуальный ETag."""
+        etag = user_one_client.get("/api/v1/tasks/").headers["ETag"]
+
+        response = user_one_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, "Код ответа отличается от ожидаемого"
+
+    def test_anonymous(self, anonymous_client: APIClient) -> None:
+        """Асинхронный список недоступен без токена и с некорректным токеном."""
+        assert anonymous_client.get("/api/v1/tasks/").status_code == HTTPStatus.UNAUTHORIZED
+        response = anonymous_client.get("/api/v1/tasks/", HTTP_AUTHORIZATION="Bearer not-a-token")
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, "Код ответа отличается от ожидаемого"
+        assert "WWW-Authenticate" in response.headers, "Нет заголовка WWW-Authenticate"
+
+
+class TestAsyncTaskDetail:
+    """Класс тестов асинхронного просмотра и создания задач."""
+
+    def test_retrieve(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Асинхронный просмотр задачи совпадает с сериализацией и поддерживает условный запрос."""
+        url = f"/api/v1/tasks/{user_one_task.id}/"
+        response = user_one_client.get(url)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json() == TaskSerializer(Task.objects.get(id=user_one_task.id)).data, "Задача отличается"
+        not_modified = user_one_client.get(url, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, "Код ответа отличается от ожидаемого"
+
+    @pytest.mark.parametrize("task_id", ["not-a-uuid", "00000000-0000-0000-0000-000000000000"])
+    def test_retrieve_not_found(self, user_one_client: APIClient, task_id: str) -> None:
+        """Несуществующая задача дает 404."""
+        response = user_one_client.get(f"/api/v1/tasks/{task_id}/")
+        assert response.status_code == HTTPStatus.NOT_FOUND, "Код ответа отличается от ожидаемого"
+
+    def test_retrieve_foreign_task(self, user_two_client: APIClient, user_one_task: Task) -> None:
+        """Чужая задача недоступна."""
+        response = user_two_client.get(f"/api/v1/tasks/{user_one_task.id}/")
+        assert response.status_code == HTTPStatus.NOT_FOUND, "Код ответа отличается от ожидаемого"
+
+    def test_create(self, user_one_client: APIClient, user_one: User, faker: Faker) -> None:
+        """Асинхронное создание задачи."""
+        payload = {"title": faker.text(max_nb_chars=50), "description": faker.text(), "task_status": 1}
+
+        response = user_one_client.post("/api/v1/tasks/", payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED, "Код ответа отличается от ожидаемого"
+        task = Task.objects.get(user=user_one)
+        assert response.json()["title"] == task.title == payload["title"], "Задача не создана"
+
+    def test_create_invalidates_response_cache(
+        self, user_one_client: APIClient, user_one: User, settings: SettingsWrapper, faker: Faker
+    ) -> None:
+        """Асинхронное создание задачи увеличивает версию кэша ответов пользователя."""
+        settings.TASKS_RESPONSE_CACHE = True
+        _, version = task_cache_versions.get(user_one.id)
+        payload = {"title": faker.text(max_nb_chars=50), "description": faker.text(), "task_status": 1}
+
+        response = user_one_client.post("/api/v1/tasks/", payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED, "Код ответа отличается от ожидаемого"
+        assert task_cache_versions.get(user_one.id)[1] > version, "Версия кэша ответов не увеличена"
+
+    def test_create_with_new_status(self, user_one_client: APIClient, user_one: User, faker: Faker) -> None:
+        """Статус, созданный в другом процессе после чтения статусов, принимается без ожидания интервала."""
+        task_status_registry.all()
+        # bulk_create не отправляет сигналы: кэш статусов процесса не сбрасывается, как при создании в другом процессе.
+        TaskStatus.objects.bulk_create([TaskStatus(id=100, name="Отложено")])
+        payload = {"title": faker.text(max_nb_chars=50), "description": faker.text(), "task_status": 100}
+
+        response = user_one_client.post("/api/v1/tasks/", payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED, "Код ответа отличается от ожидаемого"
+        assert response.json()["task_status"] == 100, "Задача создана не с новым статусом"
+
+    def test_create_invalid(self, user_one_client: APIClient, user_one: User) -> None:
+        """Ошибки валидации при асинхронном создании возвращаются как 400."""
+        response = user_one_client.post("/api/v1/tasks/", {"task_status": 100500}, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert {"title", "description", "task_status"} <= set(response.json()), "Нет ошибок полей"
+        assert not Task.objects.filter(user=user_one).exists(), "Задача не должна создаваться"
+
+    def test_sync_actions(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Действия без асинхронной реализации выполняются синхронными обработчиками."""
+        url = f"/api/v1/tasks/{user_one_task.id}/"
+
+        response = user_one_client.patch(url, {"title": "Новый заголовок"}, format="json")
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert user_one_client.delete(url).status_code == HTTPStatus.NO_CONTENT, "Задача не удалена"
+        assert user_one_client.put("/api/v1/tasks/").status_code == HTTPStatus.METHOD_NOT_ALLOWED
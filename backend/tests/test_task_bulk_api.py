@@ -0,0 +1,156 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+from faker import Faker
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from tasks.models import Task
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+BULK_URL = "/api/v1/tasks/bulk/"
+
+
+def task_payload(faker: Faker) -> dict:
+    """Данные новой задачи."""
+    return {
+        "title": faker.text(max_nb_chars=50),
+        "description": faker.text(max_nb_chars=200),
+        "task_status": NOT_COMPLETED_TASK_STATUS_ID,
+    }
+
+
+@pytest.mark.django_db
+class TestTaskBulkApi:
+    """Класс тестов пакетных операций с задачами."""
+
+    def test_bulk_create(
+        self,
+        user_one_client: APIClient,
+        user_one: User,
+        faker: Faker,
+        django_assert_num_queries: DjangoAssertNumQueries,
+    ) -> None:
+        """Пакет задач создается одним INSERT и возвращается в порядке запроса."""
+        payload = [task_payload(faker) for _ in range(20)]
+        # Пользователь, статусы, SAVEPOINT/RELEASE транзакции и INSERT всех задач.
+        with django_assert_num_queries(5):
+            response = user_one_client.post(BULK_URL, payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        assert [task["title"] for task in json] == [task["title"] for task in payload], "Задачи в ответе отличаются"
+        assert Task.objects.filter(user=user_one, id__in=[task["id"] for task in json]).count() == len(payload)
+
+    def test_bulk_create_errors(self, user_one_client: APIClient, user_one: User, faker: Faker) -> None:
+        """Ошибка в одном элементе отменяет весь пакет и возвращается по его индексу."""
+        payload = [task_payload(faker) for _ in range(3)]
+        payload[1]["task_status"] = 100500
+        del payload[2]["title"]
+
+        response = user_one_client.post(BULK_URL, payload, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        errors = response.json()
+        assert errors[0] == {}, "У корректного элемента не должно быть ошибок"
+        assert "task_status" in errors[1], "Нет ошибки статуса у второго элемента"
+        assert "title" in errors[2], "Нет ошибки заголовка у третьего элемента"
+        assert not Task.objects.filter(user=user_one).exists(), "Задачи пакета с ошибками не должны создаваться"
+
+    @pytest.mark.parametrize("method", ["post", "patch"])
+    def test_batch_size_is_limited(
+        self, user_one_client: APIClient, faker: Faker, settings: SettingsWrapper, method: str
+    ) -> None:
+        """Пакет больше TASKS_BULK_BATCH_SIZE отклоняется целиком."""
+        settings.TASKS_BULK_BATCH_SIZE = 2
+        payload = [task_payload(faker) for _ in range(3)]
+
+        response = getattr(user_one_client, method)(BULK_URL, payload, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert "non_field_errors" in response.json(), "Нет ошибки размера пакета"
+
+    def test_bulk_update(
+        self,
+        user_one_client: APIClient,
+        user_one_tasks: list[Task],
+        django_assert_num_queries: DjangoAssertNumQueries,
+    ) -> None:
+        """Пакет изменений применяется одним UPDATE и обновляет время изменения задач."""
+        updated_at = {task.id: task.updated_at for task in Task.objects.filter(id__in=[t.id for t in user_one_tasks])}
+        payload = [{"id": str(task.id), "title": f"Задача {index}"} for index, task in enumerate(user_one_tasks)]
+        payload[0]["task_status"] = COMPLETED_TASK_STATUS_ID
+
+        # Пользователь, выборка задач пакета, статусы, SAVEPOINT/RELEASE транзакции и UPDATE всех задач.
+        with django_assert_num_queries(6):
+            response = user_one_client.patch(BULK_URL, payload, format="json")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert [task["title"] for task in response.json()] == [task["title"] for task in payload]
+        tasks = Task.objects.in_bulk(updated_at)
+        for index, task in enumerate(user_one_tasks):
+            assert tasks[task.id].title == f"Задача {index}", "Заголовок задачи не изменен"
+            assert tasks[task.id].updated_at > updated_at[task.id], "Время изменения задачи не обновлено"
+            assert tasks[task.id].description == task.description, "Поле не из пакета изменено"
+        assert tasks[user_one_tasks[0].id].task_status_id == COMPLETED_TASK_STATUS_ID, "Статус задачи не изменен"
+
+    def test_bulk_update_errors(
+        self, user_two_client: APIClient, user_one_task: Task, user_two: User, faker: Faker
+    ) -> None:
+        """Чужие, несуществующие, повторные и пропущенные id возвращаются как ошибки элементов."""
+        own_task = Task.objects.create(
+            user=user_two, task_status_id=NOT_COMPLETED_TASK_STATUS_ID, title="Задача", description="Описание"
+        )
+        payload = [
+            {"id": str(own_task.id), "title": "Новый заголовок"},
+            {"id": str(user_one_task.id), "title": "Новый заголовок"},
+            {"id": str(uuid.uuid4()), "title": "Новый заголовок"},
+            {"id": str(own_task.id), "title": "Новый заголовок"},
+            {"title": "Новый заголовок"},
+        ]
+
+        response = user_two_client.patch(BULK_URL, payload, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        errors = response.json()
+        assert errors[0] == {}, "У корректного элемента не должно быть ошибок"
+        assert all("id" in error for error in errors[1:]), "Нет ошибок id у некорректных элементов"
+        own_task.refresh_from_db()
+        user_one_task.refresh_from_db()
+        assert own_task.title == "Задача", "Задачи пакета с ошибками не должны изменяться"
+        assert user_one_task.title != "Новый заголовок", "Чужая задача изменена"
+
+    def test_bulk_delete(
+        self,
+        user_one_client: APIClient,
+        user_one: User,
+        user_one_tasks: list[Task],
+        django_assert_num_queries: DjangoAssertNumQueries,
+    ) -> None:
+        """Пакет задач удаляется одним DELETE."""
+        ids = [str(task.id) for task in user_one_tasks[:3]]
+        # Пользователь, проверка задач пакета и DELETE.
+        with django_assert_num_queries(3):
+            response = user_one_client.delete(BULK_URL, {"ids": ids}, format="json")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json() == {"ids": ids}, "Ответ отличается от ожидаемого"
+        assert not Task.objects.filter(id__in=ids).exists(), "Задачи не удалены"
+        assert Task.objects.filter(user=user_one).count() == len(user_one_tasks) - len(ids), "Удалены лишние задачи"
+
+    def test_bulk_delete_errors(self, user_two_client: APIClient, user_one_task: Task) -> None:
+        """Пакет с чужой задачей не удаляется, ошибка возвращается по индексу элемента."""
+        response = user_two_client.delete(BULK_URL, {"ids": [str(user_one_task.id)]}, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert "0" in response.json()["ids"], "Нет ошибки по индексу элемента"
+        assert Task.objects.filter(id=user_one_task.id).exists(), "Чужая задача удалена"
+
+    def test_anonymous(self, anonymous_client: APIClient, faker: Faker) -> None:
+        """Пакетные операции недоступны неавторизованному пользователю."""
+        response = anonymous_client.post(BULK_URL, [task_payload(faker)], format="json")
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, "Код ответа отличается от ожидаемого"
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+from pytest_django import DjangoAssertNumQueries
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.registry import task_status_registry
+from tasks.models import Task
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+BULK_URL = "/api/v1/tasks/bulk/change_status/"
+
+
+@pytest.mark.django_db
+class TestTaskChangeStatus:
+    """Класс тестов смены статуса задач."""
+
+    def test_change_status_response(
+        self, user_one_client: APIClient, user_one_task: Task, django_assert_num_queries: DjangoAssertNumQueries
+    ) -> None:
+        """Смена статуса выполняется одним UPDATE, ответ содержит новый статус и время завершения."""
+        Task.objects.filter(id=user_one_task.id).update(task_status=NOT_COMPLETED_TASK_STATUS_ID, completed_at=None)
+        url = f"/api/v1/tasks/{user_one_task.id}/change_status/"
+        task_status_registry.all()
+
+        # Пользователь и UPDATE задачи.
+        with django_assert_num_queries(2):
+            response = user_one_client.patch(url, {"task_status": COMPLETED_TASK_STATUS_ID})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        assert json["task_status"]["id"] == COMPLETED_TASK_STATUS_ID, "В ответе старый статус задачи"
+        assert json["completed_at"] is not None, "Не заполнено время завершения"
+        user_one_task.refresh_from_db()
+        assert user_one_task.completed_at is not None, "Не сохранено время завершения"
+
+        response = user_one_client.patch(url, {"task_status": NOT_COMPLETED_TASK_STATUS_ID})
+        assert response.json()["completed_at"] is None, "Время завершения не очищено"
+
+    def test_change_status_keeps_completed_at(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Повторная отметка о выполнении не меняет время завершения."""
+        completed_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        Task.objects.filter(id=user_one_task.id).update(task_status=COMPLETED_TASK_STATUS_ID, completed_at=completed_at)
+
+        response = user_one_client.patch(
+            f"/api/v1/tasks/{user_one_task.id}/change_status/", {"task_status": COMPLETED_TASK_STATUS_ID}
+        )
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        user_one_task.refresh_from_db()
+        assert user_one_task.completed_at == completed_at, "Время завершения изменено"
+
+    @pytest.mark.parametrize(("task_id", "task_status"), [("not-a-uuid", 1), (None, 100500)])
+    def test_change_status_errors(
+        self, user_one_client: APIClient, user_one_task: Task, task_id: str | None, task_status: int
+    ) -> None:
+        """Некорректный id задачи дает 404, несуществующий статус - 400."""
+        response = user_one_client.patch(
+            f"/api/v1/tasks/{task_id or user_one_task.id}/change_status/", {"task_status": task_status}
+        )
+        expected = HTTPStatus.NOT_FOUND if task_id else HTTPStatus.BAD_REQUEST
+        assert response.status_code == expected, "Код ответа отличается от ожидаемого"
+
+    def test_bulk_change_status(
+        self,
+        user_one_client: APIClient,
+        user_one_tasks: list[Task],
+        django_assert_num_queries: DjangoAssertNumQueries,
+    ) -> None:
+        """Статус пакета задач меняется одним UPDATE, ответ возвращается в порядке id запроса."""
+        ids = [str(task.id) for task in reversed(user_one_tasks)]
+        task_status_registry.all()
+
+        # Пользователь, SAVEPOINT/RELEASE транзакции и UPDATE задач.
+        with django_assert_num_queries(4):
+            response = user_one_client.patch(
+                BULK_URL, {"ids": ids, "task_status": COMPLETED_TASK_STATUS_ID}, format="json"
+            )
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        assert [task["id"] for task in json] == ids, "Порядок задач в ответе отличается от запроса"
+        assert all(task["task_status"]["id"] == COMPLETED_TASK_STATUS_ID for task in json), "Статус не изменен"
+        assert not Task.objects.filter(id__in=ids, completed_at__isnull=True).exists(), "Время завершения не задано"
+
+    def test_bulk_change_status_foreign_task(
+        self, user_two_client: APIClient, user_one_task: Task, user_two: User
+    ) -> None:
+        """Пакет с чужой задачей откатывается целиком, ошибка возвращается по индексу id."""
+        own_task = Task.objects.create(
+            user=user_two, task_status_id=NOT_COMPLETED_TASK_STATUS_ID, title="Задача", description="Описание"
+        )
+        status_before = Task.objects.get(id=user_one_task.id).task_status_id
+
+        response = user_two_client.patch(
+            BULK_URL,
+            {"ids": [str(own_task.id), str(user_one_task.id)], "task_status": COMPLETED_TASK_STATUS_ID},
+            format="json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert list(response.json()["ids"]) == ["1"], "Ошибка должна быть только у чужой задачи"
+        own_task.refresh_from_db()
+        assert own_task.task_status_id == NOT_COMPLETED_TASK_STATUS_ID, "Изменения пакета не откатились"
+        assert Task.objects.get(id=user_one_task.id).task_status_id == status_before, "Чужая задача изменена"
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.registry import task_status_registry
+from tasks.models import Task
+
+URL = "/api/v1/tasks/"
+
+
+def expand(json: dict, key: str = "results") -> list[dict]:
+    """Задачи компактного ответа с вложенными статусами из included, как в обычном формате."""
+    statuses = json["included"]["task_statuses"]
+    tasks = []
+    for task in json[key]:
+        task = dict(task)
+        task_status_id = task.pop("task_status_id")
+        tasks.append({**task, "task_status": statuses[str(task_status_id)]})
+    return tasks
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskCompactFormat:
+    """Класс тестов компактного формата ответа со статусами в included."""
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_list(self, user_one_client: APIClient, settings: SettingsWrapper, fast_path: bool) -> None:
+        """Компактный список содержит те же данные, что и обычный, а каждый статус передается один раз."""
+        settings.TASKS_LIST_FAST_PATH = fast_path
+        nested = user_one_client.get(URL)
+
+        response = user_one_client.get(URL, {"compact": "true"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        assert all("task_status" not in task for task in json["results"]), "В компактном списке вложенный статус"
+        assert set(json["included"]["task_statuses"]) == {
+            str(task["task_status_id"]) for task in json["results"]
+        }, "В included не только статусы задач страницы"
+        for task_status_id, task_status in json["included"]["task_statuses"].items():
+            assert task_status["name"] == task_status_registry.get(int(task_status_id)).name, "Статус отличается"
+        assert expand(json) == nested.json()["results"], "Данные компактного списка отличаются от обычного"
+        assert len(response.content) < len(nested.content), "Компактный ответ не меньше обычного"
+
+    def test_accept_header(self, user_one_client: APIClient) -> None:
+        """Компактный формат включается параметром типа ответа в Accept."""
+        response = user_one_client.get(URL, HTTP_ACCEPT="application/json; compact=true")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert "included" in response.json(), "Нет included в ответе"
+
+    def test_default_format(self, user_one_client: APIClient) -> None:
+        """По умолчанию статусы вложены в задачи, included нет."""
+        json = user_one_client.get(URL, {"compact": "false"}).json()
+
+        assert "included" not in json, "В обычном формате есть included"
+        assert all(isinstance(task["task_status"], dict) for task in json["results"]), "Статус не вложен в задачу"
+
+    def test_query_count(self, user_one_client: APIClient, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+        """Статусы берутся из кэша классификатора без дополнительных запросов."""
+        user_one_client.get(URL)
+
+        with django_assert_num_queries(2):
+            user_one_client.get(URL, {"compact": "true"})
+
+    def test_sparse_fields(self, user_one_client: APIClient) -> None:
+        """Поле task_status_id выбирается параметром fields."""
+        json = user_one_client.get(URL, {"compact": "true", "fields": "id,task_status_id"}).json()
+
+        assert {tuple(task) for task in json["results"]} == {("id", "task_status_id")}, "Поля отличаются от выбранных"
+        assert json["included"]["task_statuses"], "Нет статусов в included"
+
+    def test_include_archived(self, user_one_client: APIClient) -> None:
+        """Компактный список с архивом."""
+        json = user_one_client.get(URL, {"compact": "true", "include_archived": "true"}).json()
+
+        assert {"task_status_id", "archived_at"} <= set(json["results"][0]), "Нет полей компактного списка с архивом"
+        assert json["included"]["task_statuses"], "Нет статусов в included"
+
+    def test_retrieve_keeps_nested(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Детальный просмотр всегда вкладывает статус: для одной задачи included ничего не экономит."""
+        json = user_one_client.get(f"{URL}{user_one_task.id}/", {"compact": "true"}).json()
+
+        assert isinstance(json["task_status"], dict), "Статус не вложен в задачу"
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_sync(user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+    """Компактная синхронизация передает задачи с task_status_id и статусы в included."""
+    nested = user_one_client.get(f"{URL}sync/").json()
+
+    json = user_one_client.get(f"{URL}sync/", {"compact": "1"}).json()
+
+    assert sorted(expand(json, "tasks"), key=lambda task: task["id"]) == sorted(
+        nested["tasks"], key=lambda task: task["id"]
+    ), "Данные компактной синхронизации отличаются от обычной"
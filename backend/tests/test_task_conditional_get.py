@@ -0,0 +1,134 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.http import http_date
+from pytest_django import DjangoAssertNumQueries
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from tasks.archive import archive_completed_tasks
+from tasks.models import Task
+from users.models import User
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskConditionalGet:
+    """Класс тестов условных GET запросов к API задач."""
+
+    def test_list_not_modified(
+        self, user_one_client: APIClient, django_assert_num_queries: DjangoAssertNumQueries
+    ) -> None:
+        """Повторный запрос списка с If-None-Match получает 304 без выборки и сериализации задач."""
+        response = user_one_client.get("/api/v1/tasks/")
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.headers["ETag"], "В ответе нет ETag"
+        assert "Last-Modified" not in response.headers, "Список не должен передавать Last-Modified"
+
+        # Только маркер изменений списка: пользователь загружен из кэша при первом запросе.
+        with django_assert_num_queries(1):
+            not_modified = user_one_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=response.headers["ETag"])
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, "Код ответа отличается от ожидаемого"
+        assert not not_modified.content, "Ответ 304 не должен содержать тело"
+        assert not_modified.headers["ETag"] == response.headers["ETag"], "ETag ответа 304 отличается"
+
+    def test_list_etag_depends_on_query(self, user_one_client: APIClient) -> None:
+        """ETag списка зависит от параметров запроса."""
+        response = user_one_client.get("/api/v1/tasks/")
+        other = user_one_client.get(
+            "/api/v1/tasks/", {"ordering": "created_at"}, HTTP_IF_NONE_MATCH=response.headers["ETag"]
+        )
+        assert other.status_code == HTTPStatus.OK, "Другой запрос не должен совпадать по ETag"
+
+    def test_retrieve_not_modified(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Задача отдается с ETag, повторный запрос получает 304 до ее изменения."""
+        url = f"/api/v1/tasks/{user_one_task.id}/"
+        etag = user_one_client.get(url).headers["ETag"]
+
+        not_modified = user_one_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, "Код ответа отличается от ожидаемого"
+
+        user_one_client.patch(url, {"title": "Новый заголовок"})
+        response = user_one_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json()["title"] == "Новый заголовок", "Задача не обновлена"
+
+    def test_retrieve_foreign_task(self, user_two_client: APIClient, user_one_task: Task) -> None:
+        """Условный запрос к чужой задаче получает 404, а не 304."""
+        response = user_two_client.get(f"/api/v1/tasks/{user_one_task.id}/", HTTP_IF_NONE_MATCH="*")
+        assert response.status_code == HTTPStatus.NOT_FOUND, "Код ответа отличается от ожидаемого"
+
+    def test_change_marker_grows_on_every_change(self, user_one: User, user_one_tasks: list[Task]) -> None:
+        """Маркер меняется при каждом изменении, даже если количество задач и номер транзакции те же."""
+        markers = [Task.objects.change_marker(user_one.id)]
+        for title in ("Первый заголовок", "Второй заголовок"):
+            Task.objects.filter(id=user_one_tasks[0].id).update(title=title)
+            markers.append(Task.objects.change_marker(user_one.id))
+        Task.objects.filter(id=user_one_tasks[1].id).delete()
+        markers.append(Task.objects.change_marker(user_one.id))
+        assert markers == sorted(set(markers)), "Маркер изменений не вырос после изменения задач"
+
+    def test_list_changed_after_update(self, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """Изменение задачи делает ETag списка неактуальным."""
+        etag = user_one_client.get("/api/v1/tasks/").headers["ETag"]
+        user_one_client.patch(f"/api/v1/tasks/{user_one_tasks[0].id}/", {"title": "Новый заголовок"})
+
+        response = user_one_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.headers["ETag"] != etag, "ETag не изменился после изменения задачи"
+
+    def test_list_changed_after_delete(self, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """Удаление задачи, даже не самой свежей, делает ETag списка неактуальным."""
+        oldest = Task.objects.filter(user=user_one_tasks[0].user).order_by("updated_at").first()
+        etag = user_one_client.get("/api/v1/tasks/").headers["ETag"]
+        user_one_client.delete(f"/api/v1/tasks/{oldest.id}/")
+
+        response = user_one_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.headers["ETag"] != etag, "ETag не изменился после удаления задачи"
+
+    def test_list_if_modified_since_after_delete(self, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """If-Modified-Since не дает 304 для списка: удаление задачи не меняет время изменения остальных."""
+        oldest = Task.objects.filter(user=user_one_tasks[0].user).order_by("updated_at").first()
+        user_one_client.get("/api/v1/tasks/")
+        user_one_client.delete(f"/api/v1/tasks/{oldest.id}/")
+
+        # Время позже любого изменения задач: при проверке If-Modified-Since список получил бы 304.
+        since = http_date(time.time() + 60)
+        response = user_one_client.get("/api/v1/tasks/", HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert str(oldest.id) not in {task["id"] for task in response.json()["results"]}, "Удаленная задача в списке"
+
+    def test_list_changed_after_bulk_status_change(
+        self, user_one_client: APIClient, user_one_tasks: list[Task]
+    ) -> None:
+        """Смена статуса одним UPDATE в обход ORM делает ETag списка неактуальным."""
+        etag = user_one_client.get("/api/v1/tasks/").headers["ETag"]
+        user_one_client.patch(
+            "/api/v1/tasks/bulk/change_status/",
+            {"ids": [str(user_one_tasks[0].id)], "task_status": COMPLETED_TASK_STATUS_ID},
+            format="json",
+        )
+
+        response = user_one_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, "ETag не изменился после смены статуса"
+
+    def test_list_with_archive_changed_after_archiving(self, user_one_client: APIClient, user_one: User) -> None:
+        """Перенос задачи в архив меняет ETag списка с архивом, хотя задача в нем остается."""
+        Task.objects.create(
+            title="Задача",
+            description="Описание",
+            task_status_id=COMPLETED_TASK_STATUS_ID,
+            user=user_one,
+            completed_at=timezone.now() - timedelta(days=100),
+        )
+        url = "/api/v1/tasks/?include_archived=true"
+        etag = user_one_client.get(url).headers["ETag"]
+        archive_completed_tasks(days=90)
+
+        response = user_one_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, "ETag не изменился после переноса в архив"
+        assert response.json()["results"][0]["archived_at"] is not None, "Задача не перенесена в архив"
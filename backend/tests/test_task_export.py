@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.http import StreamingHttpResponse
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from api.v1.tasks.renderers import StreamingRenderer
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from tasks.models import Task
+from users.models import User
+
+EXPORT_URL = "/api/v1/tasks/export/"
+
+
+def read_content(response: StreamingHttpResponse) -> str:
+    """Собирает тело потокового ответа."""
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskExport:
+    """Класс тестов выгрузки задач."""
+
+    def test_export_csv(self, user_one_client: APIClient, user_one: User) -> None:
+        """Выгрузка в CSV содержит все задачи пользователя в порядке сортировки списка."""
+        response = user_one_client.get(EXPORT_URL, {"format": "csv"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert isinstance(response, StreamingHttpResponse), "Выгрузка должна быть потоковой"
+        assert response["Content-Type"] == "text/csv; charset=utf-8", "Тип содержимого отличается от ожидаемого"
+        assert 'filename="tasks.csv"' in response["Content-Disposition"], "Нет имени файла выгрузки"
+        rows = list(csv.DictReader(io.StringIO(read_content(response))))
+        expected = Task.objects.filter(user=user_one).order_by("-created_at")
+        assert [row["id"] for row in rows] == [str(task.id) for task in expected], "Состав задач отличается"
+        task = expected[0]
+        assert rows[0]["title"] == task.title, "Заголовок задачи отличается"
+        assert rows[0]["description"] == task.description, "Описание задачи отличается"
+        assert rows[0]["task_status_name"] == task.task_status.name, "Статус задачи отличается"
+
+    def test_export_ndjson(self, user_one_client: APIClient, user_one: User) -> None:
+        """Выгрузка в NDJSON отдает по одному объекту задачи на строку."""
+        response = user_one_client.get(EXPORT_URL, HTTP_ACCEPT="application/x-ndjson")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        tasks = [json.loads(line) for line in read_content(response).splitlines()]
+        assert len(tasks) == user_one.tasks.count(), "Количество задач отличается"
+        detail = user_one_client.get(f"/api/v1/tasks/{tasks[0]['id']}/").json()
+        for field in ("title", "description", "created_at", "updated_at", "complete_before", "completed_at"):
+            assert tasks[0][field] == detail[field], f"Поле {field} отличается от детального просмотра"
+        assert tasks[0]["task_status"] == detail["task_status"]["id"], "Статус задачи отличается"
+
+    def test_export_filters(self, user_one_client: APIClient, user_one: User) -> None:
+        """Выгрузка принимает параметры фильтрации списка."""
+        response = user_one_client.get(EXPORT_URL, {"format": "ndjson", "task_status": COMPLETED_TASK_STATUS_ID})
+
+        tasks = [json.loads(line) for line in read_content(response).splitlines()]
+        expected = Task.objects.filter(user=user_one, task_status=COMPLETED_TASK_STATUS_ID).count()
+        assert len(tasks) == expected, "Фильтр не применен к выгрузке"
+        assert all(task["task_status"] == COMPLETED_TASK_STATUS_ID for task in tasks), "Фильтр не применен"
+
+    def test_export_invalid_filter(self, user_one_client: APIClient) -> None:
+        """Ошибка фильтра возвращается в формате выгрузки."""
+        response = user_one_client.get(EXPORT_URL, {"format": "ndjson", "task_status": "not-a-status"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert "task_status" in json.loads(response.content), "Нет ошибки фильтра"
+
+    def test_export_is_chunked(
+        self, user_one_client: APIClient, user_one: User, settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Выгрузка отдается несколькими фрагментами, а не одним телом."""
+        settings.TASKS_EXPORT_CHUNK_SIZE = 2
+        monkeypatch.setattr(StreamingRenderer, "rows_per_chunk", 2)
+
+        response = user_one_client.get(EXPORT_URL, {"format": "ndjson"})
+
+        chunks = list(response.streaming_content)
+        assert len(chunks) == (user_one.tasks.count() + 1) // 2, "Строки должны отдаваться пачками"
+
+    def test_export_other_user(self, user_two_client: APIClient) -> None:
+        """Выгрузка содержит только задачи текущего пользователя."""
+        response = user_two_client.get(EXPORT_URL, {"format": "csv"})
+
+        assert read_content(response).splitlines()[1:] == [], "В выгрузке задачи другого пользователя"
+
+    def test_export_anonymous(self, anonymous_client: APIClient) -> None:
+        """Выгрузка недоступна неавторизованному пользователю."""
+        response = anonymous_client.get(EXPORT_URL, {"format": "csv"})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, "Код ответа отличается от ожидаемого"
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.models import TaskStatus
+from tasks.models import Task
+from users.models import User
+
+
+def explain(queryset: QuerySet | str) -> str:
+    """Возвращает план запроса (кверисета или SQL) при запрещенном сканировании без индекса и явной сортировке.
+
+    На тестовых объемах данных планировщик всегда предпочтет Seq Scan и сортировку в памяти,
+    поэтому они отключаются, и проверяется, что для запроса вообще существует подходящий индекс.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+        if isinstance(queryset, QuerySet):
+            return queryset.explain()
+        cursor.execute(f"EXPLAIN {queryset}")
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+def page_query(client: APIClient, url: str, page_size: int) -> str:
+    """SQL выборки страницы, выполненный API при запросе url."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+    return next(query["sql"] for query in queries if query["sql"].endswith(f"LIMIT {page_size + 1}"))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskIndexes:
+    """Проверяет, что запросы списка задач обслуживаются индексами."""
+
+    @pytest.mark.parametrize(
+        ("ordering", "index_name"),
+        [
+            ("-created_at", "task_user_created_at_idx"),
+            ("created_at", "task_user_created_at_idx"),
+            ("-updated_at", "task_user_updated_at_idx"),
+            ("complete_before", "task_user_complete_before_idx"),
+            ("-completed_at", "task_user_completed_at_idx"),
+        ],
+    )
+    def test_list_page_uses_index(self, user_one_client: APIClient, ordering: str, index_name: str) -> None:
+        """Страницы списка API, в том числе после курсора, читаются по индексу (user, поле, id) без сортировки."""
+        url = f"/api/v1/tasks/?ordering={ordering}&page_size=2"
+        next_url = user_one_client.get(url).json()["next"]
+        assert next_url, "Нет следующей страницы"
+        for page_url in (url, next_url):
+            plan = explain(page_query(user_one_client, page_url, page_size=2))
+            assert index_name in plan, f"Запрос не использует индекс {index_name}:\n{plan}"
+            assert "Seq Scan" not in plan, f"Запрос выполняется последовательным сканированием:\n{plan}"
+            assert "Sort" not in plan, f"Для сортировки требуется отдельный шаг:\n{plan}"
+
+    @pytest.mark.parametrize(
+        ("field_name", "index_name"),
+        [
+            ("updated_at", "task_user_updated_at_idx"),
+            ("complete_before", "task_user_complete_before_idx"),
+            ("completed_at", "task_user_completed_at_idx"),
+        ],
+    )
+    def test_date_range_filter_uses_index(self, user_one: User, field_name: str, index_name: str) -> None:
+        """Фильтр по диапазону дат использует составной индекс пользователя."""
+        since = timezone.now() + timedelta(days=1)
+        queryset = Task.objects.filter(user=user_one, **{f"{field_name}__gte": since})
+        plan = explain(queryset)
+        assert index_name in plan, f"Запрос не использует индекс {index_name}:\n{plan}"
+        assert "Seq Scan" not in plan, f"Запрос выполняется последовательным сканированием:\n{plan}"
+
+    def test_status_filter_uses_index(self, user_one: User) -> None:
+        """Фильтр по статусу с сортировкой по умолчанию использует индекс (user, status, created_at)."""
+        task_status = TaskStatus.objects.get(id=COMPLETED_TASK_STATUS_ID)
+        plan = explain(Task.objects.filter(user=user_one, task_status=task_status).order_by("-created_at"))
+        assert "task_user_status_created_idx" in plan, f"Запрос не использует индекс статуса:\n{plan}"
+        assert "Seq Scan" not in plan, f"Запрос выполняется последовательным сканированием:\n{plan}"
+        assert "Sort" not in plan, f"Для сортировки требуется отдельный шаг:\n{plan}"
+
+    def test_sync_uses_index(self, user_one: User) -> None:
+        """Изменения задач пользователя после курсора синхронизации выбираются по индексу без сортировки."""
+        plan = explain(Task.objects.filter(user=user_one, change_txid__gte=1).order_by("change_txid", "id"))
+        assert "task_user_change_txid_idx" in plan, f"Запрос не использует индекс синхронизации:\n{plan}"
+        assert "Sort" not in plan, f"Для сортировки требуется отдельный шаг:\n{plan}"
+
+    def test_list_with_archive_page_uses_indexes(self, user_one_client: APIClient) -> None:
+        """Страница списка с архивом читает обе таблицы по индексам (user, created_at, id) без сортировки."""
+        url = "/api/v1/tasks/?include_archived=true&page_size=2"
+        next_url = user_one_client.get(url).json()["next"]
+        for page_url in (url, next_url):
+            plan = explain(page_query(user_one_client, page_url, page_size=2))
+            assert "task_user_created_at_idx" in plan, f"Задачи читаются не по индексу:\n{plan}"
+            assert "archive_user_created_idx" in plan, f"Архив читается не по индексу:\n{plan}"
+            # Merge Append объединяет упорядоченные индексами части (строка Sort Key), узла сортировки нет.
+            assert "Sort  (" not in plan, f"Для сортировки требуется отдельный шаг:\n{plan}"
@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.v1.tasks.encoders import RowEncoder
+from api.v1.tasks.renderers import ORJSONRenderer
+from api.v1.tasks.serializers import TaskListSerializer
+from api.v1.tasks.views import TaskViewSet
+from tasks.models import Task
+from users.models import User
+
+
+@pytest.fixture
+def edge_case_tasks(user_one: User, user_one_tasks: list[Task]) -> None:
+    """Задачи с пограничными значениями: микросекунды, пустые даты, символы вне ASCII и разделители строк."""
+    tasks = Task.objects.filter(user=user_one).order_by("id")
+    Task.objects.filter(id=tasks[0].id).update(
+        title='Задача   с   "кавычками" и \\ слешем',
+        complete_before=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        completed_at=datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+    )
+    Task.objects.filter(id=tasks[1].id).update(complete_before=None, completed_at=None, title="😀 emoji")
+
+
+def get_pages(client: APIClient, url: str) -> list[bytes]:
+    """Тела всех страниц списка по ссылкам next."""
+    pages = []
+    while url is not None:
+        response = client.get(url)
+        pages.append(response.content)
+        url = response.json()["next"]
+    return pages
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("edge_case_tasks")
+class TestTaskListFastPath:
+    """Контрактные тесты быстрого режима списка задач: ответ совпадает с ответом сериализатора DRF побайтово."""
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "",
+            "?page_size=3",
+            "?page_size=4&ordering=complete_before",
+            "?page_size=4&ordering=-completed_at",
+            "?search=задача",
+            "?search=задача&search_mode=substring&page_size=2",
+            "?task_status=1",
+        ],
+    )
+    @pytest.mark.parametrize("time_zone", ["UTC", "Europe/Moscow"])
+    def test_same_output(
+        self,
+        user_one_client: APIClient,
+        settings: SettingsWrapper,
+        monkeypatch: pytest.MonkeyPatch,
+        query: str,
+        time_zone: str,
+    ) -> None:
+        """Быстрый режим с ORJSONRenderer отдает те же байты, что сериализатор с JSONRenderer."""
+        settings.TIME_ZONE = time_zone
+        url = f"/api/v1/tasks/{query}"
+        fast_pages = get_pages(user_one_client, url)
+
+        settings.TASKS_LIST_FAST_PATH = False
+        monkeypatch.setattr(TaskViewSet, "renderer_classes", (JSONRenderer,))
+        slow_pages = get_pages(user_one_client, url)
+
+        assert fast_pages == slow_pages, "Ответ быстрого режима отличается от ответа сериализатора"
+
+    def test_indent(self, user_one_client: APIClient) -> None:
+        """Запрос с отступом рендерится стандартным JSONRenderer."""
+        response = user_one_client.get("/api/v1/tasks/", HTTP_ACCEPT="application/json; indent=2")
+        assert response.content.startswith(b'{\n  "next"'), "Ответ должен быть отформатирован с отступом"
+
+
+def test_orjson_renderer_matches_json_renderer() -> None:
+    """ORJSONRenderer отдает те же байты, что JSONRenderer, для типов, которые встречаются в ответах API."""
+    data = {
+        "text": 'строка    "\\ \u2028 \u2029',
+        "errors": {0: ["ошибка"]},
+        "date": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        "nested": [{"number": 1, "float": 1.5, "flag": True, "empty": None}],
+    }
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data), "Вывод рендереров отличается"
+
+
+def test_row_encoder_fields() -> None:
+    """RowEncoder читает из строки values() источники полей сериализатора списка."""
+    encoder = RowEncoder(TaskListSerializer)
+
+    assert [name for name, _, _ in encoder.fields] == list(TaskListSerializer.Meta.fields), "Поля отличаются"
+    assert encoder.values_fields == ("id", "title", "task_status_id", "complete_before", "completed_at")
+
+    class NestedSourceSerializer(serializers.Serializer):
+        email = serializers.CharField(source="user.email")
+
+    with pytest.raises(ValueError):
+        RowEncoder(NestedSourceSerializer)
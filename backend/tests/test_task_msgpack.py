@@ -0,0 +1,176 @@
+import uuid
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any
+
+import msgpack
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from faker import Faker
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from api.v1.tasks.parsers import MessagePackParser
+from api.v1.tasks.renderers import UUID_EXT_TYPE
+from tasks.models import Task
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+URL = "/api/v1/tasks/"
+MEDIA_TYPE = "application/msgpack"
+
+
+def unpack(content: bytes) -> Any:
+    """Данные ответа в MessagePack."""
+    return msgpack.unpackb(content, ext_hook=MessagePackParser.ext_hook, timestamp=3)
+
+
+def to_json(value: Any) -> Any:
+    """Данные, разобранные из MessagePack, в представлении JSON: UUID и даты - строками, как в полях DRF."""
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return serializers.DateTimeField().to_representation(value)
+    return value
+
+
+def find_values(value: Any, types: tuple) -> list:
+    """Все значения указанных типов в разобранных данных."""
+    if isinstance(value, dict):
+        return [found for item in value.values() for found in find_values(item, types)]
+    if isinstance(value, list):
+        return [found for item in value for found in find_values(item, types)]
+    return [value] if isinstance(value, types) else []
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskMessagePackRenderer:
+    """Класс тестов ответов API задач в MessagePack."""
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_list(self, user_one_client: APIClient, settings: SettingsWrapper, fast_path: bool) -> None:
+        """Список в MessagePack совпадает с JSON и короче его, UUID и даты кодируются расширениями на любом пути."""
+        settings.TASKS_LIST_FAST_PATH = fast_path
+        Task.objects.update(complete_before=timezone.now())
+        expected = user_one_client.get(URL)
+
+        response = user_one_client.get(URL, HTTP_ACCEPT=MEDIA_TYPE)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response["Content-Type"] == MEDIA_TYPE, "Тип ответа отличается от ожидаемого"
+        data = unpack(response.content)
+        assert to_json(data) == expected.json(), "Данные в MessagePack отличаются от JSON"
+        assert find_values(data["results"], (uuid.UUID,)), "UUID закодированы строками"
+        assert find_values(data["results"], (datetime,)), "Даты закодированы строками"
+        assert len(response.content) < len(expected.content), "MessagePack не короче JSON"
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_list_and_retrieve_types(
+        self, user_one_client: APIClient, user_one_task: Task, settings: SettingsWrapper, fast_path: bool
+    ) -> None:
+        """Типы полей задачи в MessagePack одинаковы в списке и детальном просмотре при любом пути списка."""
+        settings.TASKS_LIST_FAST_PATH = fast_path
+        Task.objects.filter(id=user_one_task.id).update(complete_before=timezone.now(), completed_at=timezone.now())
+        listed = unpack(user_one_client.get(URL, HTTP_ACCEPT=MEDIA_TYPE).content)["results"]
+        retrieved = unpack(user_one_client.get(f"{URL}{user_one_task.id}/", HTTP_ACCEPT=MEDIA_TYPE).content)
+
+        # Детальный просмотр не содержит id, он есть в адресе запроса.
+        task = next(task for task in listed if task["id"] == user_one_task.id)
+        shared = task.keys() & retrieved.keys()
+        assert {"task_status", "complete_before", "completed_at"} <= shared, "Нет общих полей списка и задачи"
+        assert {name: type(task[name]) for name in shared} == {
+            name: type(retrieved[name]) for name in shared
+        }, "Типы полей списка и задачи отличаются"
+        assert isinstance(retrieved["completed_at"], datetime), "Дата задачи закодирована строкой"
+
+    def test_cached_response_types(self, user_one_client: APIClient, settings: SettingsWrapper) -> None:
+        """Ответ из кэша ответов кодирует UUID и даты так же, как исходный ответ."""
+        settings.TASKS_RESPONSE_CACHE = True
+        settings.TASKS_LIST_FAST_PATH = False
+        cache.clear()
+        Task.objects.update(complete_before=timezone.now())
+        response = user_one_client.get(URL, HTTP_ACCEPT=MEDIA_TYPE)
+
+        cached = user_one_client.get(URL, HTTP_ACCEPT=MEDIA_TYPE)
+
+        assert cached.content == response.content, "Ответ из кэша отличается от исходного"
+        assert find_values(unpack(cached.content)["results"], (uuid.UUID,)), "UUID в ответе из кэша - строки"
+
+    def test_compact_sync(self, user_one_client: APIClient) -> None:
+        """Компактный формат синхронизации задается параметром типа ответа MessagePack."""
+        expected = user_one_client.get(f"{URL}sync/", {"compact": "true"}).json()
+
+        response = user_one_client.get(f"{URL}sync/", HTTP_ACCEPT=f"{MEDIA_TYPE}; compact=true")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        data = to_json(unpack(response.content))
+        # Курсор содержит время подписи.
+        assert {**data, "cursor": None} == {**expected, "cursor": None}, "Данные в MessagePack отличаются от JSON"
+
+    def test_retrieve_format_parameter(self, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """Формат выбирается и параметром format."""
+        url = f"{URL}{user_one_tasks[0].id}/"
+
+        response = user_one_client.get(url, {"format": "msgpack"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert to_json(unpack(response.content)) == user_one_client.get(url).json(), "Данные отличаются от JSON"
+
+    def test_json_by_default(self, user_one_client: APIClient) -> None:
+        """Без запроса MessagePack ответ остается в JSON."""
+        response = user_one_client.get(URL, HTTP_ACCEPT="*/*")
+
+        assert response["Content-Type"] == "application/json", "Тип ответа по умолчанию изменился"
+
+
+@pytest.mark.django_db
+class TestTaskMessagePackParser:
+    """Класс тестов запросов к API задач в MessagePack."""
+
+    def test_create(self, user_one_client: APIClient, faker: Faker) -> None:
+        """Задача из MessagePack с датой в Timestamp создается так же, как из JSON."""
+        complete_before = timezone.now().replace(microsecond=123456)
+        payload = {
+            "title": faker.text(max_nb_chars=50),
+            "description": faker.text(max_nb_chars=200),
+            "task_status": NOT_COMPLETED_TASK_STATUS_ID,
+            "complete_before": complete_before,
+        }
+
+        response = user_one_client.post(URL, msgpack.packb(payload, datetime=True), content_type=MEDIA_TYPE)
+
+        assert response.status_code == HTTPStatus.CREATED, "Код ответа отличается от ожидаемого"
+        task = Task.objects.get(title=payload["title"])
+        assert task.complete_before == complete_before, "Срок задачи отличается от переданного"
+
+    def test_bulk_delete(self, user_one: User, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """Id задач передаются расширением UUID."""
+        ids = [msgpack.ExtType(UUID_EXT_TYPE, task.id.bytes) for task in user_one_tasks[:2]]
+
+        response = user_one_client.delete(f"{URL}bulk/", msgpack.packb({"ids": ids}), content_type=MEDIA_TYPE)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert not Task.objects.filter(id__in=[task.id for task in user_one_tasks[:2]]).exists(), "Задачи не удалены"
+
+    def test_invalid_body(self, user_one_client: APIClient) -> None:
+        """Некорректное тело запроса отклоняется с кодом 400."""
+        response = user_one_client.post(URL, b"\xc1", content_type=MEDIA_TYPE)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert response.json()["detail"].startswith("Ошибка разбора MessagePack"), "Нет описания ошибки"
+
+
+@pytest.mark.django_db
+def test_task_status_list(anonymous_client: APIClient) -> None:
+    """Список статусов в MessagePack совпадает с JSON."""
+    response = anonymous_client.get("/api/v1/task_statuses/", HTTP_ACCEPT=MEDIA_TYPE)
+
+    assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+    assert unpack(response.content) == anonymous_client.get("/api/v1/task_statuses/").json(), "Статусы отличаются"
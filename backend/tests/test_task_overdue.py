@@ -0,0 +1,101 @@
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from tasks.models import Task
+from tasks.overdue import sweep_overdue_tasks
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+
+def create_task(user: User, complete_before_days: int | None, completed: bool = False) -> Task:
+    """Задача со сроком через указанное количество дней (отрицательное - в прошлом)."""
+    now = timezone.now()
+    return Task.objects.create(
+        title="Задача",
+        description="Описание",
+        task_status_id=COMPLETED_TASK_STATUS_ID if completed else NOT_COMPLETED_TASK_STATUS_ID,
+        user=user,
+        complete_before=None if complete_before_days is None else now + timedelta(days=complete_before_days),
+        completed_at=now if completed else None,
+    )
+
+
+@pytest.mark.django_db
+class TestOverdueSweep:
+    """Класс тестов обработчика просроченных задач."""
+
+    def test_sweep(self, user_one: User, user_two: User) -> None:
+        """Отмечаются только незавершенные задачи с прошедшим сроком всех пользователей, пачками."""
+        overdue = [create_task(user, -days) for days in range(1, 4) for user in (user_one, user_two)]
+        not_overdue = [create_task(user_one, 1), create_task(user_one, None), create_task(user_one, -1, completed=True)]
+
+        stats = sweep_overdue_tasks(batch_size=4)
+
+        assert (stats.processed, stats.batches) == (len(overdue), 2), "Статистика прохода отличается от ожидаемой"
+        assert all(
+            Task.objects.filter(id__in=[task.id for task in overdue]).values_list("overdue_at", flat=True)
+        ), "Не все просроченные задачи отмечены"
+        assert not Task.objects.filter(
+            id__in=[task.id for task in not_overdue], overdue_at__isnull=False
+        ).exists(), "Отмечены задачи, которые не просрочены"
+        assert sweep_overdue_tasks().processed == 0, "Повторный проход отметил задачи еще раз"
+
+    def test_deadline_change_resets_flag(self, user_one: User, user_one_client: APIClient) -> None:
+        """Перенос срока снимает отметку, и задача снова попадает в очередь обработчика."""
+        task = create_task(user_one, -1)
+        sweep_overdue_tasks()
+        url = f"/api/v1/tasks/{task.id}/"
+        assert user_one_client.get(url).json()["overdue_at"] is not None, "В задаче нет отметки о просрочке"
+
+        user_one_client.patch(url, {"title": "Новый заголовок"})
+        assert user_one_client.get(url).json()["overdue_at"] is not None, "Отметка снята без переноса срока"
+
+        response = user_one_client.patch(url, {"complete_before": (timezone.now() - timedelta(hours=1)).isoformat()})
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert user_one_client.get(url).json()["overdue_at"] is None, "Отметка не снята после переноса срока"
+        assert sweep_overdue_tasks().processed == 1, "Задача с перенесенным сроком не отмечена повторно"
+
+    def test_command(self, user_one: User, capsys: pytest.CaptureFixture) -> None:
+        """Команда выполняет проход и выводит статистику."""
+        create_task(user_one, -1)
+
+        call_command("sweep_overdue_tasks", "--batch-size", "10")
+
+        assert "задач: 1, пачек: 1" in capsys.readouterr().out, "Нет статистики прохода"
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_sweep_skips_locked_tasks(user_one: User) -> None:
+    """Задача, заблокированная другой транзакцией, пропускается без ожидания и отмечается следующим проходом."""
+    locked_task, task = create_task(user_one, -2), create_task(user_one, -1)
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock() -> None:
+        try:
+            with transaction.atomic():
+                Task.objects.select_for_update().get(id=locked_task.id)
+                locked.set()
+                release.wait(10)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    try:
+        assert locked.wait(10), "Задача не заблокирована"
+        assert sweep_overdue_tasks().processed == 1, "Заблокированная задача не пропущена"
+    finally:
+        release.set()
+        thread.join()
+
+    assert Task.objects.get(id=task.id).overdue_at is not None, "Свободная задача не отмечена"
+    assert Task.objects.get(id=locked_task.id).overdue_at is None, "Заблокированная задача отмечена"
+    assert sweep_overdue_tasks().processed == 1, "Задача после снятия блокировки не отмечена"
@@ -0,0 +1,108 @@
+import uuid
+from base64 import b64encode
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from faker import Faker
+from rest_framework.test import APIClient
+
+from classifiers.models import TaskStatus
+from tasks.models import Task
+from users.models import User
+
+PAGE_SIZE = 3
+
+
+def fetch_all_pages(client: APIClient, url: str) -> list[str]:
+    """Обходит все страницы списка по ссылкам next и возвращает id задач в порядке выдачи."""
+    ids = []
+    while url is not None:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        assert len(json["results"]) <= PAGE_SIZE, "Размер страницы больше запрошенного"
+        ids.extend(task["id"] for task in json["results"])
+        url = json["next"]
+    return ids
+
+
+@pytest.mark.django_db
+class TestTaskPagination:
+    """Класс тестов курсорной пагинации списка задач."""
+
+    @pytest.fixture(autouse=True)
+    def duplicated_created_at(self, user_one_tasks: list[Task]) -> None:
+        """Делает время создания части задач одинаковым, чтобы проверить разбор совпадающих позиций."""
+        tasks = Task.objects.filter(user=user_one_tasks[0].user).order_by("id")
+        Task.objects.filter(id__in=tasks.values("id")[: len(user_one_tasks) // 2]).update(created_at=timezone.now())
+
+    @pytest.mark.parametrize(
+        "ordering",
+        ["-created_at", "created_at", "-updated_at", "complete_before", "-complete_before", "completed_at"],
+    )
+    def test_pages_cover_all_tasks_in_order(self, user_one_client: APIClient, user_one: User, ordering: str) -> None:
+        """Обход страниц возвращает каждую задачу ровно один раз в порядке сортировки."""
+        tiebreaker = "-id" if ordering.startswith("-") else "id"
+        tasks = Task.objects.filter(user=user_one).order_by(ordering, tiebreaker)
+        expected = [str(task_id) for task_id in tasks.values_list("id", flat=True)]
+
+        ids = fetch_all_pages(user_one_client, f"/api/v1/tasks/?page_size={PAGE_SIZE}&ordering={ordering}")
+
+        assert ids == expected, "Порядок или состав задач при обходе страниц отличается от ожидаемого"
+
+    def test_previous_link(self, user_one_client: APIClient) -> None:
+        """Ссылка previous возвращает предыдущую страницу."""
+        first_page = user_one_client.get(f"/api/v1/tasks/?page_size={PAGE_SIZE}").json()
+        second_page = user_one_client.get(first_page["next"]).json()
+        previous_page = user_one_client.get(second_page["previous"]).json()
+
+        assert first_page["previous"] is None, "У первой страницы не должно быть ссылки previous"
+        assert previous_page["results"] == first_page["results"], "Ссылка previous ведет не на первую страницу"
+
+    def test_cursor_is_stable_under_inserts(self, user_one_client: APIClient, user_one: User, faker: Faker) -> None:
+        """Задачи, созданные между запросами страниц, не сдвигают выдачу и не дублируют задачи."""
+        expected = {str(task_id) for task_id in Task.objects.filter(user=user_one).values_list("id", flat=True)}
+        first_page = user_one_client.get(f"/api/v1/tasks/?page_size={PAGE_SIZE}").json()
+        Task.objects.bulk_create(
+            Task(
+                title=faker.text(max_nb_chars=50),
+                description=faker.text(max_nb_chars=100),
+                task_status=TaskStatus.objects.first(),
+                user=user_one,
+            )
+            for _ in range(PAGE_SIZE * 2)
+        )
+
+        ids = [task["id"] for task in first_page["results"]] + fetch_all_pages(user_one_client, first_page["next"])
+
+        assert len(ids) == len(set(ids)), "Задачи на страницах дублируются"
+        assert set(ids) == expected, "Состав задач изменился после вставки новых задач"
+
+    def test_list_does_not_count(self, user_one_client: APIClient) -> None:
+        """Получение страницы не выполняет COUNT(*) по задачам пользователя."""
+        with CaptureQueriesContext(connection) as queries:
+            response = user_one_client.get(f"/api/v1/tasks/?page_size={PAGE_SIZE}")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert not [query for query in queries if "COUNT(" in query["sql"]], "Пагинация выполнила COUNT(*)"
+
+    def test_page_size_is_limited(self, user_one_client: APIClient) -> None:
+        """Размер страницы, запрошенный клиентом, ограничен max_page_size."""
+        response = user_one_client.get("/api/v1/tasks/?page_size=100000&ordering=-updated_at")
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json()["next"] is None, "Все задачи должны поместиться на одну страницу"
+
+    def test_invalid_cursor(self, user_one_client: APIClient) -> None:
+        """Некорректный курсор приводит к ответу 404."""
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        positions = (f"{since}|not-a-uuid", f"not-a-date|{uuid.uuid4()}")
+        cursors = ["not-a-cursor"] + [b64encode(urlencode({"p": position}).encode()).decode() for position in positions]
+        for cursor in cursors:
+            response = user_one_client.get("/api/v1/tasks/", {"cursor": cursor})
+            assert response.status_code == HTTPStatus.NOT_FOUND, f"Курсор {cursor} должен быть отклонен"
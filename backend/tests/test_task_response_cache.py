@@ -0,0 +1,216 @@
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Callable, Iterator
+
+import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.models import TaskStatus
+from core.metrics import request_metrics
+from tasks.archive import archive_completed_tasks
+from tasks.cache import task_cache_versions
+from tasks.models import Task
+from tasks.overdue import sweep_overdue_tasks
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+URL = "/api/v1/tasks/"
+
+
+@pytest.fixture(autouse=True)
+def response_cache(settings: SettingsWrapper) -> Iterator[None]:
+    """Включенный кэш ответов задач, пустой кэш и метрики до и после теста."""
+    settings.TASKS_RESPONSE_CACHE = True
+    cache.clear()
+    request_metrics.clear()
+    yield
+    cache.clear()
+    request_metrics.clear()
+
+
+def get_cache_counts() -> dict[str, float]:
+    """Количество попаданий и промахов кэша ответов по результату."""
+    counts = {}
+    for labels, value in request_metrics.response_cache._values.items():
+        counts[labels[-1]] = counts.get(labels[-1], 0) + value
+    return counts
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskResponseCache:
+    """Класс тестов кэша ответов списка и детального просмотра задач."""
+
+    def test_list(self, user_one_client: APIClient, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+        """Повторный запрос списка отвечает из кэша без запросов к базе."""
+        response = user_one_client.get(URL, {"ordering": "created_at", "task_status": COMPLETED_TASK_STATUS_ID})
+
+        with django_assert_num_queries(0):
+            cached = user_one_client.get(URL, {"task_status": COMPLETED_TASK_STATUS_ID, "ordering": "created_at"})
+
+        assert cached.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert cached.json() == response.json(), "Ответ из кэша отличается от ответа"
+        assert cached.headers["ETag"] == response.headers["ETag"], "ETag ответа из кэша отличается"
+        assert get_cache_counts() == {"miss": 1, "hit": 1}, "Счетчики кэша отличаются от ожидаемых"
+
+    def test_query_params(self, user_one_client: APIClient) -> None:
+        """Ответы с разными параметрами запроса кэшируются отдельно."""
+        all_tasks = user_one_client.get(URL).json()["results"]
+        completed = user_one_client.get(URL, {"task_status": COMPLETED_TASK_STATUS_ID}).json()["results"]
+
+        assert len(completed) < len(all_tasks), "Ответ с фильтром получен из кэша ответа без фильтра"
+        assert get_cache_counts() == {"miss": 2}, "Счетчики кэша отличаются от ожидаемых"
+
+    def test_retrieve_not_modified(
+        self,
+        user_one_client: APIClient,
+        user_one_task: Task,
+        django_assert_num_queries: DjangoAssertNumQueries,
+    ) -> None:
+        """Ответ 304 на запрос задачи строится по валидаторам из кэша без запросов к базе."""
+        url = f"{URL}{user_one_task.id}/"
+        response = user_one_client.get(url)
+
+        with django_assert_num_queries(0):
+            not_modified = user_one_client.get(url, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, "Код ответа отличается от ожидаемого"
+        assert not_modified.headers["ETag"] == response.headers["ETag"], "ETag ответа 304 отличается"
+
+    def test_write_invalidates_user(
+        self,
+        user_one_client: APIClient,
+        user_two_client: APIClient,
+        user_one_task: Task,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """Изменение задачи через API сбрасывает кэш ответов только ее владельца."""
+        url = f"{URL}{user_one_task.id}/"
+        user_one_client.get(url)
+        user_two_client.get(URL)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_one_client.patch(url, {"title": "Изменена"})
+
+        assert user_one_client.get(url).json()["title"] == "Изменена", "Ответ из кэша после изменения задачи"
+        user_two_client.get(URL)
+        assert get_cache_counts() == {"miss": 3, "hit": 1}, "Сброшен кэш другого пользователя"
+
+    def test_failed_write_keeps_cache(
+        self, user_one_client: APIClient, django_capture_on_commit_callbacks: Callable
+    ) -> None:
+        """Неуспешный изменяющий запрос не сбрасывает кэш."""
+        user_one_client.get(URL)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            user_one_client.post(URL, {"title": ""})
+        user_one_client.get(URL)
+
+        assert callbacks == [], "Неуспешный запрос сбросил кэш"
+        assert get_cache_counts() == {"miss": 1, "hit": 1}, "Счетчики кэша отличаются от ожидаемых"
+
+    def test_background_changes_invalidate_owners(
+        self,
+        user_one_client: APIClient,
+        user_two_client: APIClient,
+        user_one_task: Task,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """Обработчик просроченных задач и перенос в архив сбрасывают кэш ответов только владельцев задач."""
+        url = f"{URL}{user_one_task.id}/"
+        Task.objects.filter(id=user_one_task.id).update(
+            complete_before=timezone.now() - timedelta(days=1), completed_at=None, overdue_at=None
+        )
+        assert user_one_client.get(url).json()["overdue_at"] is None, "Задача отмечена просроченной"
+        user_two_client.get(URL)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sweep_overdue_tasks()
+        assert user_one_client.get(url).json()["overdue_at"] is not None, "Ответ из кэша после отметки просрочки"
+        user_two_client.get(URL)
+        assert get_cache_counts() == {"miss": 3, "hit": 1}, "Отметка просрочки сбросила кэш другого пользователя"
+
+        Task.objects.filter(id=user_one_task.id).update(
+            task_status_id=COMPLETED_TASK_STATUS_ID, completed_at=timezone.now() - timedelta(days=100)
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            archive_completed_tasks(days=90)
+        assert user_one_client.get(url).status_code == HTTPStatus.NOT_FOUND, "Ответ из кэша после переноса в архив"
+        user_two_client.get(URL)
+        assert get_cache_counts() == {"miss": 4, "hit": 2}, "Перенос в архив сбросил кэш другого пользователя"
+
+    def test_task_status_change_invalidates_all(
+        self, user_one_client: APIClient, user_one_task: Task, django_capture_on_commit_callbacks: Callable
+    ) -> None:
+        """Изменение статусов сбрасывает кэш ответов всех пользователей."""
+        url = f"{URL}{user_one_task.id}/"
+        user_one_client.get(url)
+
+        task_status = TaskStatus.objects.get(id=user_one_task.task_status_id)
+        with django_capture_on_commit_callbacks(execute=True):
+            task_status.name = "Переименован"
+            task_status.save()
+        assert user_one_client.get(url).json()["task_status"]["name"] == "Переименован", "Ответ из кэша"
+
+    def test_disabled(self, user_one_client: APIClient, settings: SettingsWrapper) -> None:
+        """Без TASKS_RESPONSE_CACHE ответы не кэшируются."""
+        settings.TASKS_RESPONSE_CACHE = False
+        user_one_client.get(URL)
+        user_one_client.get(URL)
+
+        assert get_cache_counts() == {}, "Ответы кэшируются при выключенном кэше"
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True, databases=["default", "replica"])
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskResponseCacheReplicas:
+    """Класс тестов кэша ответов при чтении с реплик."""
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings: SettingsWrapper) -> None:
+        """Чтение с реплики replica - зеркала тестовой базы."""
+        settings.DATABASE_REPLICAS = ["replica"]
+        settings.DATABASE_REPLICA_LAG_TOLERANCE = 5
+
+    def test_miss_reads_primary(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Промах кэша строит ответ по default и сохраняет его, повторный запрос получает ответ из кэша."""
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            for url in (URL, URL, f"{URL}{user_one_task.id}/", f"{URL}{user_one_task.id}/"):
+                assert user_one_client.get(url).status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+
+        task_queries = [query["sql"] for query in replica.captured_queries if Task._meta.db_table in query["sql"]]
+        assert not task_queries, "Ответ при промахе кэша прочитан с реплики"
+        assert get_cache_counts() == {"miss": 2, "hit": 2}, "Ответы не сохранены в кэш"
+
+    def test_primary_response_cached(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Ответы клиента, закрепленного за default после записи, сохраняются в кэш."""
+        response = user_one_client.patch(f"{URL}{user_one_task.id}/", {"title": "Изменена"})
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = user_one_client.get(URL)
+            cached = user_one_client.get(URL)
+
+        assert len(replica) == 0, "Закрепленный клиент читает с реплики"
+        assert cached.json() == response.json(), "Ответ из кэша отличается от ответа"
+        assert get_cache_counts() == {"miss": 1, "hit": 1}, "Ответ из default не сохранен в кэш"
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("tests.async_urls")
+def test_async_create_invalidates(user_one: User, user_one_client: APIClient) -> None:
+    """Асинхронное создание задачи сбрасывает кэш ответов пользователя без transaction.on_commit в event loop."""
+    versions = task_cache_versions.get(user_one.id)
+    data = {"title": "Задача", "description": "Описание", "task_status": NOT_COMPLETED_TASK_STATUS_ID}
+
+    response = user_one_client.post(URL, data, format="json")
+
+    assert response.status_code == HTTPStatus.CREATED, "Код ответа отличается от ожидаемого"
+    assert task_cache_versions.get(user_one.id) > versions, "Версия пользователя не увеличена"
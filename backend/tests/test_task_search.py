@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from classifiers.models import TaskStatus
+from tasks.models import Task
+from users.models import User
+
+
+@pytest.fixture
+def searchable_tasks(user_one: User, user_two: User) -> dict[str, Task]:
+    """Задачи с заранее известными заголовками и описаниями для проверки поиска."""
+    task_status = TaskStatus.objects.first()
+    tasks = {
+        "title": Task(title="Купить молоко", description="Зайти в магазин после работы", user=user_one),
+        "description": Task(title="Магазин", description="Не забыть молоко и хлеб", user=user_one),
+        "other": Task(title="Позвонить маме", description="Обсудить выходные", user=user_one),
+        "foreign": Task(title="Купить молоко", description="Задача другого пользователя", user=user_two),
+    }
+    for task in tasks.values():
+        task.task_status = task_status
+    Task.objects.bulk_create(tasks.values())
+    return tasks
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    """Класс тестов поиска задач."""
+
+    def test_fulltext_search_ranks_title_first(
+        self, user_one_client: APIClient, searchable_tasks: dict[str, Task]
+    ) -> None:
+        """Полнотекстовый поиск находит задачи пользователя и ставит совпадение в заголовке выше."""
+        response = user_one_client.get("/api/v1/tasks/", {"search": "молоко"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        ids = [task["id"] for task in response.json()["results"]]
+        expected = [str(searchable_tasks["title"].id), str(searchable_tasks["description"].id)]
+        assert ids == expected, "Результаты поиска или их порядок отличаются от ожидаемых"
+
+    def test_fulltext_search_matches_prefix_and_word_forms(
+        self, user_one_client: APIClient, searchable_tasks: dict[str, Task]
+    ) -> None:
+        """Поиск находит незаконченное слово и другие словоформы."""
+        for term in ("моло", "магазине", "позвонил мам"):
+            response = user_one_client.get("/api/v1/tasks/", {"search": term})
+            assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+            assert response.json()["results"], f"По запросу {term} ничего не найдено"
+
+    def test_fulltext_search_with_explicit_ordering(
+        self, user_one_client: APIClient, searchable_tasks: dict[str, Task]
+    ) -> None:
+        """Явный параметр ordering заменяет сортировку по релевантности."""
+        response = user_one_client.get("/api/v1/tasks/", {"search": "молоко", "ordering": "created_at"})
+
+        ids = [task["id"] for task in response.json()["results"]]
+        expected = Task.objects.filter(id__in=ids).order_by("created_at", "id").values_list("id", flat=True)
+        assert ids == [str(task_id) for task_id in expected], "Порядок результатов не соответствует ordering"
+
+    def test_fulltext_search_pagination(self, user_one_client: APIClient, searchable_tasks: dict[str, Task]) -> None:
+        """Результаты полнотекстового поиска постранично обходятся по курсору релевантности."""
+        first_page = user_one_client.get("/api/v1/tasks/", {"search": "молоко", "page_size": 1}).json()
+        second_page = user_one_client.get(first_page["next"]).json()
+
+        assert first_page["results"][0]["id"] == str(searchable_tasks["title"].id), "Первая страница неверна"
+        assert second_page["results"][0]["id"] == str(searchable_tasks["description"].id), "Вторая страница неверна"
+        assert second_page["next"] is None, "После второй страницы не должно быть результатов"
+
+    def test_substring_search_mode(self, user_one_client: APIClient, searchable_tasks: dict[str, Task]) -> None:
+        """Резервный режим ищет подстроку, в том числе внутри слова."""
+        response = user_one_client.get("/api/v1/tasks/", {"search": "олок", "search_mode": "substring"})
+
+        ids = {task["id"] for task in response.json()["results"]}
+        expected = {str(searchable_tasks["title"].id), str(searchable_tasks["description"].id)}
+        assert ids == expected, "Результаты поиска подстроки отличаются от ожидаемых"
+
+    def test_invalid_search_mode(self, user_one_client: APIClient) -> None:
+        """Неизвестный режим поиска отклоняется."""
+        response = user_one_client.get("/api/v1/tasks/", {"search": "молоко", "search_mode": "regex"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+
+    def test_fulltext_search_uses_gin_index(self, user_one: User, searchable_tasks: dict[str, Task]) -> None:
+        """Полнотекстовый поиск выполняется по GIN индексу поискового вектора."""
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = Task.objects.filter(search_vector="молоко").explain()
+
+        assert "task_search_vector_idx" in plan, f"Поиск не использует GIN индекс:\n{plan}"
@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from drf_spectacular.generators import SchemaGenerator
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from users.models import User
+
+URL = "/api/v1/tasks/"
+
+
+def get_task_query(queries: CaptureQueriesContext) -> str:
+    """Последний запрос к таблице задач."""
+    return [query["sql"] for query in queries.captured_queries if '"tasks_task"' in query["sql"]][-1]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskSparseFields:
+    """Класс тестов выбора полей ответа параметрами fields и exclude."""
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_list_fields(self, user_one_client: APIClient, settings: SettingsWrapper, fast_path: bool) -> None:
+        """Список возвращает только выбранные поля и не читает столбцы остальных."""
+        settings.TASKS_LIST_FAST_PATH = fast_path
+
+        with CaptureQueriesContext(connection) as queries:
+            response = user_one_client.get(URL, {"fields": "id,task_status"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert {tuple(task) for task in response.json()["results"]} == {("id", "task_status")}, "Лишние поля"
+        sql = get_task_query(queries)
+        assert '"tasks_task"."title"' not in sql, "Прочитан столбец невыбранного поля"
+        assert '"tasks_task"."description"' not in sql, "Прочитано описание задачи"
+
+    def test_retrieve_exclude(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Детальный просмотр без исключенных полей не читает их столбцы и выполняет те же запросы."""
+        url = f"{URL}{user_one_task.id}/"
+        full = user_one_client.get(url).json()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = user_one_client.get(url, {"exclude": "description,overdue_at"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json() == {
+            name: value for name, value in full.items() if name not in ("description", "overdue_at")
+        }, "Ответ отличается от полного ответа без исключенных полей"
+        assert '"tasks_task"."description"' not in get_task_query(queries), "Прочитано описание задачи"
+        assert len(queries) == 2, "Количество запросов отличается от ожидаемого"
+
+    def test_fields_and_exclude(self, user_one_client: APIClient, user_one_task: Task) -> None:
+        """Параметр exclude исключает поля из перечисленных в fields."""
+        response = user_one_client.get(f"{URL}{user_one_task.id}/", {"fields": "title,description", "exclude": "title"})
+
+        assert list(response.json()) == ["description"], "Поля ответа отличаются от ожидаемых"
+
+    @pytest.mark.parametrize("param", ["fields", "exclude"])
+    def test_invalid_fields(self, user_one_client: APIClient, param: str) -> None:
+        """Неизвестные поля отклоняются с кодом 400 и списком доступных полей."""
+        response = user_one_client.get(URL, {param: "id,description,secret"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert "description, secret" in response.json()[param][0], "В ошибке нет неизвестных полей"
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_pagination(
+        self, user_one: User, user_one_client: APIClient, settings: SettingsWrapper, fast_path: bool
+    ) -> None:
+        """Курсорная пагинация работает, даже если поле сортировки не выбрано."""
+        settings.TASKS_LIST_FAST_PATH = fast_path
+        url = f"{URL}?fields=id&ordering=complete_before&page_size=2"
+        ids = []
+        while url is not None:
+            json = user_one_client.get(url).json()
+            ids.extend(task["id"] for task in json["results"])
+            url = json["next"]
+
+        expected = Task.objects.filter(user=user_one).order_by("complete_before", "id").values_list("id", flat=True)
+        assert ids == [str(task_id) for task_id in expected], "Состав задач при обходе страниц отличается"
+
+    def test_include_archived(self, user_one_client: APIClient) -> None:
+        """Поля списка с архивом выбираются из полей его сериализатора."""
+        response = user_one_client.get(URL, {"include_archived": "true", "fields": "id,archived_at"})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert {tuple(task) for task in response.json()["results"]} == {("id", "archived_at")}, "Лишние поля"
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("tests.async_urls")
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_async_views(
+    user_one_client: APIClient, user_one_task: Task, settings: SettingsWrapper, fast_path: bool
+) -> None:
+    """Асинхронные список и детальный просмотр поддерживают выбор полей."""
+    settings.TASKS_LIST_FAST_PATH = fast_path
+
+    results = user_one_client.get(URL, {"fields": "id,title"}).json()["results"]
+    task = user_one_client.get(f"{URL}{user_one_task.id}/", {"fields": "title"}).json()
+
+    assert [tuple(result) for result in results] == [("id", "title")], "Поля списка отличаются от выбранных"
+    assert task == {"title": user_one_task.title}, "Поля задачи отличаются от выбранных"
+
+
+def test_schema_parameters() -> None:
+    """Параметры fields и exclude описаны в схеме OpenAPI списка и детального просмотра."""
+    paths = SchemaGenerator().get_schema(request=None, public=True)["paths"]
+
+    for path in ("/api/v1/tasks/", "/api/v1/tasks/{id}/"):
+        parameters = {parameter["name"] for parameter in paths[path]["get"]["parameters"]}
+        assert {"fields", "exclude"} <= parameters, f"Нет параметров в схеме {path}"
@@ -1,9 +1,14 @@
+import time
 from http import HTTPStatus
 
 import pytest
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
 from rest_framework.test import APIClient
 
 from classifiers.models import TaskStatus
+from classifiers.registry import TaskStatusRegistry, task_status_registry
+from tasks.models import Task
 
 
 @pytest.mark.django_db
@@ -13,3 +18,127 @@ def test_get_task_status_classifier(anonymous_client: APIClient) -> None:
     assert response.status_code == HTTPStatus.OK, "Код ответа не соответствует ожидаемому"
     json = response.json()
     assert len(json) == TaskStatus.objects.count(), "Количество результатов в ответе не соответствует ожидаемому"
+
+
+@pytest.mark.django_db
+def test_task_status_classifier_is_cached(
+    anonymous_client: APIClient, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    """Повторное получение классификатора статусов не обращается к базе данных."""
+    anonymous_client.get("/api/v1/task_statuses/")
+    with django_assert_num_queries(0):
+        response = anonymous_client.get("/api/v1/task_statuses/")
+    assert response.status_code == HTTPStatus.OK, "Код ответа не соответствует ожидаемому"
+
+
+@pytest.mark.django_db
+def test_task_status_registry_invalidated_by_signals() -> None:
+    """Изменение статусов сбрасывает кэш текущего процесса."""
+    task_status_registry.all()
+
+    task_status = TaskStatus.objects.create(id=100, name="Отложено")
+    assert task_status_registry.get(task_status.id).name == "Отложено", "Новый статус не попал в кэш"
+
+    task_status.name = "Отменено"
+    task_status.save()
+    assert task_status_registry.get(task_status.id).name == "Отменено", "Изменение статуса не попало в кэш"
+
+    task_status.delete()
+    assert task_status_registry.get(task_status.id) is None, "Удаленный статус остался в кэше"
+
+
+@pytest.mark.django_db
+def test_task_status_registry_other_process(settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Другой процесс видит изменение статусов после интервала, а новый статус по id - сразу, без общего кэша."""
+    other_process_registry = TaskStatusRegistry()
+    renamed = other_process_registry.all()[0]
+
+    TaskStatus.objects.filter(pk=renamed.pk).update(name="Переименован")
+    assert other_process_registry.get(renamed.pk).name == renamed.name, "Статусы перечитаны до истечения интервала"
+
+    checked_at = time.monotonic()
+    with monkeypatch.context() as patch:
+        patch.setattr(time, "monotonic", lambda: checked_at + settings.TASK_STATUS_CACHE_CHECK_INTERVAL)
+        assert other_process_registry.get(renamed.pk).name == "Переименован", "Статусы не перечитаны после интервала"
+
+    task_status = TaskStatus.objects.create(id=100, name="Отложено")
+    with monkeypatch.context() as patch:
+        miss_at = checked_at + settings.TASK_STATUS_CACHE_CHECK_INTERVAL + settings.TASK_STATUS_CACHE_MISS_INTERVAL
+        patch.setattr(time, "monotonic", lambda: miss_at)
+        assert other_process_registry.get(task_status.id).name == "Отложено", "Новый статус не найден по id"
+
+
+@pytest.mark.django_db
+def test_task_status_registry_unknown_id(
+    settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    """Неизвестный id перечитывает статусы не раньше интервала после последнего чтения и не дважды за вызов."""
+    registry = TaskStatusRegistry()
+    checked_at = time.monotonic()
+    with monkeypatch.context() as patch:
+        patch.setattr(time, "monotonic", lambda: checked_at)
+        registry.all()
+
+    with monkeypatch.context() as patch, django_assert_num_queries(0):
+        patch.setattr(time, "monotonic", lambda: checked_at + settings.TASK_STATUS_CACHE_MISS_INTERVAL / 2)
+        assert registry.get(100500) is None, "Найден несуществующий статус"
+
+    with monkeypatch.context() as patch, django_assert_num_queries(1):
+        patch.setattr(time, "monotonic", lambda: checked_at + settings.TASK_STATUS_CACHE_MISS_INTERVAL)
+        assert registry.get(100500) is None, "Найден несуществующий статус"
+        assert registry.get(100500) is None, "Найден несуществующий статус"
+        assert registry.get(100501) is None, "Найден несуществующий статус"
+
+    # Устаревшая копия уже перечитана этим вызовом, повторного чтения из-за неизвестного id нет.
+    with monkeypatch.context() as patch, django_assert_num_queries(1):
+        stale_at = checked_at + settings.TASK_STATUS_CACHE_MISS_INTERVAL + settings.TASK_STATUS_CACHE_CHECK_INTERVAL
+        patch.setattr(time, "monotonic", lambda: stale_at)
+        assert registry.get(100500) is None, "Найден несуществующий статус"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+def test_task_list_does_not_query_statuses(
+    user_one_client: APIClient, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    """Список задач со статусами получается без JOIN и запросов к таблице статусов."""
+    task_status_registry.all()
+    # Пользователь, маркер изменений для ETag и страница задач.
+    with django_assert_num_queries(3) as captured:
+        response = user_one_client.get("/api/v1/tasks/")
+    assert response.status_code == HTTPStatus.OK, "Код ответа не соответствует ожидаемому"
+    assert all(task["task_status"]["name"] for task in response.json()["results"]), "Статусы задач не заполнены"
+    assert not [
+        query for query in captured.captured_queries if TaskStatus._meta.db_table in query["sql"]
+    ], "Список задач обратился к таблице статусов"
+
+
+@pytest.mark.django_db
+def test_task_reads_and_writes_do_not_query_statuses(
+    user_one_client: APIClient, user_one_task: Task, django_assert_max_num_queries: DjangoAssertNumQueries
+) -> None:
+    """Чтение, фильтрация и запись задач не обращаются к таблице статусов."""
+    task_status_registry.all()
+    task_status = TaskStatus.objects.exclude(id=user_one_task.task_status_id).first()
+
+    for method, url, payload in (
+        ("get", f"/api/v1/tasks/?task_status={task_status.id}", None),
+        ("get", f"/api/v1/tasks/{user_one_task.id}/", None),
+        ("patch", f"/api/v1/tasks/{user_one_task.id}/", {"task_status": task_status.id}),
+    ):
+        with django_assert_max_num_queries(5) as captured:
+            response = getattr(user_one_client, method)(url, data=payload)
+        assert response.status_code == HTTPStatus.OK, "Код ответа не соответствует ожидаемому"
+        assert not [
+            query for query in captured.captured_queries if TaskStatus._meta.db_table in query["sql"]
+        ], f"Запрос {method.upper()} {url} обратился к таблице статусов"
+    assert response.json()["task_status"] == task_status.id, "Статус задачи не изменился"
+
+
+@pytest.mark.django_db
+def test_create_task_with_unknown_status(user_one_client: APIClient) -> None:
+    """Создание задачи с несуществующим статусом отклоняется."""
+    payload = {"title": "Задача", "description": "Описание", "task_status": 100500}
+    response = user_one_client.post("/api/v1/tasks/", data=payload)
+    assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа не соответствует ожидаемому"
+    assert "task_status" in response.json(), "Ошибка не относится к статусу задачи"
@@ -0,0 +1,154 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.registry import task_status_registry
+from tasks.models import Task, TaskStatusCounter
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+URL = "/api/v1/tasks/summary/"
+
+
+def get_expected_summary(user: User) -> dict:
+    """Сводка задач пользователя, посчитанная по задачам в Python."""
+    tasks = list(Task.objects.filter(user=user))
+    now = timezone.now()
+    return {
+        "total": len(tasks),
+        "overdue": sum(
+            task.completed_at is None and task.complete_before is not None and task.complete_before < now
+            for task in tasks
+        ),
+        "statuses": [
+            {
+                "id": task_status.id,
+                "name": task_status.name,
+                "count": sum(task.task_status_id == task_status.id for task in tasks),
+            }
+            for task_status in task_status_registry.all()
+        ],
+    }
+
+
+def get_counters(user: User) -> dict[int, int]:
+    """Ненулевые счетчики задач пользователя по статусам."""
+    return dict(TaskStatusCounter.objects.filter(user=user).exclude(count=0).values_list("task_status_id", "count"))
+
+
+def get_task_counts(user: User) -> dict[int, int]:
+    """Количество задач пользователя по статусам."""
+    counts = {}
+    for task_status_id in Task.objects.filter(user=user).values_list("task_status_id", flat=True):
+        counts[task_status_id] = counts.get(task_status_id, 0) + 1
+    return counts
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user_one_tasks")
+class TestTaskSummary:
+    """Класс тестов сводки задач."""
+
+    @pytest.mark.parametrize("use_counters", [True, False])
+    def test_summary(
+        self,
+        user_one: User,
+        user_one_client: APIClient,
+        settings: SettingsWrapper,
+        django_assert_num_queries: DjangoAssertNumQueries,
+        use_counters: bool,
+    ) -> None:
+        """Сводка по счетчикам и агрегатом по задачам строится одним запросом и совпадает с задачами."""
+        settings.TASKS_SUMMARY_COUNTERS = use_counters
+        Task.objects.create(
+            title="Просрочена",
+            description="Описание",
+            task_status_id=NOT_COMPLETED_TASK_STATUS_ID,
+            user=user_one,
+            complete_before=timezone.now() - timedelta(days=1),
+        )
+        user_one_client.get(URL)
+
+        with django_assert_num_queries(1):
+            response = user_one_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        assert response.json() == get_expected_summary(user_one), "Сводка не совпадает с задачами"
+
+    def test_summary_without_tasks(self, user_two_client: APIClient) -> None:
+        """Пользователь без задач получает нули по всем статусам."""
+        response = user_two_client.get(URL)
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        assert (json["total"], json["overdue"]) == (0, 0), "У пользователя без задач есть задачи"
+        assert [item["count"] for item in json["statuses"]] == [0] * len(task_status_registry.all()), "Есть задачи"
+
+    def test_counters_follow_api_changes(
+        self, user_one: User, user_one_client: APIClient, user_one_tasks: list[Task]
+    ) -> None:
+        """Счетчики изменяются при создании, изменении, смене статуса и удалении задач, в том числе пакетных."""
+        data = {"title": "Задача", "description": "Описание", "task_status": COMPLETED_TASK_STATUS_ID}
+        user_one_client.post("/api/v1/tasks/", data, format="json")
+        task_id = Task.objects.filter(user=user_one).latest("created_at").id
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не учли создание"
+
+        user_one_client.post("/api/v1/tasks/bulk/", [data, data], format="json")
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не учли пакетное создание"
+
+        user_one_client.patch(f"/api/v1/tasks/{task_id}/", {"task_status": NOT_COMPLETED_TASK_STATUS_ID})
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не учли изменение"
+
+        user_one_client.patch(f"/api/v1/tasks/{task_id}/change_status/", {"task_status": COMPLETED_TASK_STATUS_ID})
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не учли смену статуса"
+
+        ids = [str(task.id) for task in user_one_tasks]
+        user_one_client.patch(
+            "/api/v1/tasks/bulk/change_status/",
+            {"ids": ids, "task_status": NOT_COMPLETED_TASK_STATUS_ID},
+            format="json",
+        )
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не учли пакетную смену статуса"
+
+        user_one_client.delete(f"/api/v1/tasks/{task_id}/")
+        user_one_client.delete("/api/v1/tasks/bulk/", {"ids": ids[:3]}, format="json")
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не учли удаление"
+
+    def test_counters_follow_owner_change(self, user_one: User, user_two: User) -> None:
+        """Перенос задач другому пользователю переносит их количество в его счетчики."""
+        Task.objects.filter(user=user_one).update(user=user_two)
+
+        assert get_counters(user_one) == {}, "У прежнего владельца остались задачи"
+        assert get_counters(user_two) == get_task_counts(user_two), "Счетчики нового владельца не совпадают"
+
+    def test_user_delete(self, user_one: User) -> None:
+        """Удаление пользователя удаляет его задачи и счетчики."""
+        user_one.delete()
+
+        assert not TaskStatusCounter.objects.exists(), "Счетчики удаленного пользователя остались"
+
+    def test_rebuild(self, user_one: User, user_two: User) -> None:
+        """Команда rebuild_task_counters восстанавливает счетчики по задачам."""
+        TaskStatusCounter.objects.update(count=100500)
+        TaskStatusCounter.objects.create(user=user_two, task_status_id=COMPLETED_TASK_STATUS_ID, count=1)
+
+        call_command("rebuild_task_counters", "--user", str(user_two.id))
+        assert get_counters(user_two) == {}, "Счетчики пользователя не пересчитаны"
+        assert get_counters(user_one) != get_task_counts(user_one), "Пересчитаны счетчики другого пользователя"
+
+        call_command("rebuild_task_counters")
+        assert get_counters(user_one) == get_task_counts(user_one), "Счетчики не пересчитаны"
+
+
+def test_summary_unauthorized(anonymous_client: APIClient) -> None:
+    """Сводка доступна только аутентифицированному пользователю."""
+    response = anonymous_client.get(URL)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED, "Код ответа отличается от ожидаемого"
@@ -0,0 +1,152 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from api.v1.tasks.sync import SyncCursor
+from classifiers.constants import COMPLETED_TASK_STATUS_ID
+from classifiers.registry import task_status_registry
+from tasks.models import Task, TaskTombstone
+from tests.constants import NOT_COMPLETED_TASK_STATUS_ID
+from users.models import User
+
+URL = "/api/v1/tasks/sync/"
+
+
+def sync(client: APIClient, cursor: str | None = None) -> dict:
+    """Все страницы синхронизации: задачи по id, id удаленных задач и курсор следующей синхронизации."""
+    tasks, deleted = {}, []
+    while True:
+        response = client.get(URL, {"updated_since": cursor} if cursor else {})
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+        json = response.json()
+        tasks.update((task["id"], task) for task in json["tasks"])
+        deleted.extend(json["deleted"])
+        cursor = json["cursor"]
+        if not json["has_more"]:
+            return {"tasks": tasks, "deleted": deleted, "cursor": cursor}
+
+
+# Курсор синхронизации - xmin снимка, поэтому изменения должны фиксироваться: внутри общей транзакции теста
+# все задачи изменены незавершенной транзакцией и передавались бы повторно. Статусы задач из миграции
+# восстанавливаются после очистки базы транзакционными тестами (serialized_rollback).
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+class TestTaskSync:
+    """Класс тестов синхронизации задач."""
+
+    def test_initial_sync(self, user_one_client: APIClient, user_one_tasks: list[Task], user_two: User) -> None:
+        """Без курсора передаются все задачи пользователя с полными данными."""
+        Task.objects.create(title="Чужая", description="Описание", task_status_id=1, user=user_two)
+
+        result = sync(user_one_client)
+
+        assert set(result["tasks"]) == {str(task.id) for task in user_one_tasks}, "Переданы не все задачи"
+        assert result["deleted"] == [], "При первой синхронизации переданы удаленные задачи"
+        task = next(iter(result["tasks"].values()))
+        assert {"id", "title", "description", "task_status", "updated_at"} <= set(task), "Неполные данные задачи"
+
+    def test_delta(self, user_one: User, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """С курсором передаются только созданные, измененные и удаленные после него задачи."""
+        cursor = sync(user_one_client)["cursor"]
+        assert sync(user_one_client, cursor)["tasks"] == {}, "Без изменений переданы задачи"
+
+        changed, deleted = user_one_tasks[0], user_one_tasks[1]
+        user_one_client.patch(f"/api/v1/tasks/{changed.id}/", {"title": "Изменена"})
+        user_one_client.delete(f"/api/v1/tasks/{deleted.id}/")
+        created = Task.objects.create(
+            title="Новая", description="Описание", task_status_id=NOT_COMPLETED_TASK_STATUS_ID, user=user_one
+        )
+
+        result = sync(user_one_client, cursor)
+
+        assert set(result["tasks"]) == {str(changed.id), str(created.id)}, "Переданы не только измененные задачи"
+        assert result["tasks"][str(changed.id)]["title"] == "Изменена", "Передана старая версия задачи"
+        assert result["deleted"] == [str(deleted.id)], "Не передана удаленная задача"
+        assert sync(user_one_client, result["cursor"]) == {
+            "tasks": {},
+            "deleted": [],
+            "cursor": sync(user_one_client, result["cursor"])["cursor"],
+        }, "Изменения переданы повторно"
+
+    def test_bulk_changes(self, user_one_client: APIClient, user_one_tasks: list[Task]) -> None:
+        """Пакетные изменения, смена статуса одним UPDATE и пакетное удаление попадают в синхронизацию."""
+        cursor = sync(user_one_client)["cursor"]
+        ids = [str(task.id) for task in user_one_tasks]
+        user_one_client.patch(
+            "/api/v1/tasks/bulk/change_status/",
+            {"ids": ids[:2], "task_status": COMPLETED_TASK_STATUS_ID},
+            format="json",
+        )
+        user_one_client.delete("/api/v1/tasks/bulk/", {"ids": ids[2:4]}, format="json")
+
+        result = sync(user_one_client, cursor)
+
+        assert set(result["tasks"]) == set(ids[:2]), "Не переданы задачи со сменой статуса"
+        assert sorted(result["deleted"]) == sorted(ids[2:4]), "Не переданы удаленные задачи"
+
+    def test_pages(
+        self, user_one: User, user_one_client: APIClient, user_one_tasks: list[Task], settings: SettingsWrapper
+    ) -> None:
+        """Изменения, не уместившиеся в страницу, передаются следующими страницами, в том числе из одной транзакции."""
+        cursor = sync(user_one_client)["cursor"]
+        settings.TASKS_SYNC_PAGE_SIZE = 2
+        Task.objects.filter(user=user_one).update(title="Изменена")
+        user_one_client.delete(f"/api/v1/tasks/{user_one_tasks[0].id}/")
+
+        response = user_one_client.get(URL, {"updated_since": cursor})
+        assert response.json()["has_more"], "Изменения не разбиты на страницы"
+        assert response.json()["deleted"] == [], "Удаленные задачи переданы не на последней странице"
+
+        result = sync(user_one_client, cursor)
+        assert set(result["tasks"]) == {str(task.id) for task in user_one_tasks[1:]}, "Переданы не все задачи"
+        assert result["deleted"] == [str(user_one_tasks[0].id)], "Не передана удаленная задача"
+
+    @pytest.mark.usefixtures("user_one_tasks")
+    def test_query_count(self, user_one_client: APIClient, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+        """Синхронизация: снимок, задачи и удаленные задачи."""
+        task_status_registry.all()
+        cursor = sync(user_one_client)["cursor"]
+
+        with django_assert_num_queries(3):
+            response = user_one_client.get(URL, {"updated_since": cursor})
+
+        assert response.status_code == HTTPStatus.OK, "Код ответа отличается от ожидаемого"
+
+    def test_invalid_cursor(self, user_one_client: APIClient) -> None:
+        """Некорректный курсор отклоняется с кодом 400."""
+        response = user_one_client.get(URL, {"updated_since": "1.1:abc:def"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, "Код ответа отличается от ожидаемого"
+        assert "updated_since" in response.json(), "Нет ошибки курсора"
+
+    def test_expired_cursor(
+        self, user_one_client: APIClient, settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Курсор старше срока хранения записей об удаленных задачах отклоняется с кодом 410."""
+        issued_at = time.time() - timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS + 1).total_seconds()
+        with monkeypatch.context() as patch:
+            patch.setattr(time, "time", lambda: issued_at)
+            cursor = SyncCursor(1, 1).encode()
+
+        response = user_one_client.get(URL, {"updated_since": cursor})
+
+        assert response.status_code == HTTPStatus.GONE, "Код ответа отличается от ожидаемого"
+        assert response.json()["detail"].startswith("Курсор синхронизации устарел"), "Нет описания ошибки"
+
+    def test_purge_tombstones(self, user_one: User, user_one_tasks: list[Task], settings: SettingsWrapper) -> None:
+        """Команда purge_task_tombstones удаляет только записи старше срока хранения."""
+        Task.objects.filter(id__in=[task.id for task in user_one_tasks[:3]]).delete()
+        old = timezone.now() - timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS + 1)
+        TaskTombstone.objects.filter(task_id__in=[task.id for task in user_one_tasks[:2]]).update(deleted_at=old)
+
+        call_command("purge_task_tombstones", "--batch-size", "1")
+
+        assert list(TaskTombstone.objects.values_list("task_id", flat=True)) == [
+            user_one_tasks[2].id
+        ], "Удалены не только устаревшие записи"
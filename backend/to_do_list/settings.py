@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import copy
 import os
 import socket
 from datetime import timedelta
@@ -28,7 +29,8 @@ SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DEBUG").lower() == "true"
 
-ALLOWED_HOSTS = []
+# Хосты через запятую, по которым доступен сервер.
+ALLOWED_HOSTS = [host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host]
 
 
 # Application definition
@@ -40,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework.authtoken",
     "djoser",
@@ -51,6 +54,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.PerformanceMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -99,6 +104,46 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST", "db"),
         "PORT": os.getenv("POSTGRES_PORT", 5432),
+        # Время жизни постоянного соединения в секундах (0 - соединение на каждый запрос). Не используется с пулом.
+        "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", 0)),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Пул соединений psycopg 3: соединения открываются заранее и переиспользуются запросами.
+if os.getenv("POSTGRES_POOL", "false").lower() == "true":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", 10)),
+            # Сколько секунд запрос ждет свободное соединение, прежде чем завершиться ошибкой.
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.getenv("POSTGRES_POOL_MAX_IDLE", 600)),
+        },
+    }
+
+# Реплики базы только для чтения: хосты через запятую (host или host:port), остальные параметры как у default.
+# Безопасные запросы (GET, HEAD, OPTIONS) читают с реплик, запись и чтение после записи идут в default.
+DATABASE_REPLICAS = []
+for replica_index, replica_host in enumerate(filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), 1):
+    replica_alias = f"replica_{replica_index}"
+    host, _, port = replica_host.strip().partition(":")
+    DATABASES[replica_alias] = copy.deepcopy(DATABASES["default"])
+    DATABASES[replica_alias].update(HOST=host, PORT=port or DATABASES["default"]["PORT"], TEST={"MIRROR": "default"})
+    DATABASE_REPLICAS.append(replica_alias)
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+# Допустимое отставание реплик, секунды: столько времени после записи запросы клиента читают из default.
+DATABASE_REPLICA_LAG_TOLERANCE = float(os.getenv("POSTGRES_REPLICA_LAG_TOLERANCE", 5))
+
+# Кэш Django. По умолчанию - в памяти процесса, для нескольких процессов нужен общий кэш, например
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache и CACHE_LOCATION=redis://redis:6379/0.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
 
@@ -121,6 +166,25 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Хеширование паролей: PBKDF2 SHA256 в ограниченном пуле потоков (users.hashers). Стандартный
+# PBKDF2PasswordHasher не указывается: у него тот же алгоритм, и он перехватил бы проверку хешей pbkdf2_sha256.
+PASSWORD_HASHERS = [
+    "users.hashers.BoundedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Число итераций PBKDF2 (0 - значение Django по умолчанию). Меньшее значение подходит для окружений разработки
+# и тестов, хеши с другим числом итераций пересчитываются при следующем входе пользователя.
+PASSWORD_HASHER_ITERATIONS = int(os.getenv("PASSWORD_HASHER_ITERATIONS", 0))
+
+# Сколько паролей процесс хеширует одновременно (0 - в потоке запроса, без пула) и сколько ждут в очереди,
+# прежде чем запросы входа и регистрации начнут получать 503.
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_QUEUE_SIZE = int(os.getenv("PASSWORD_HASHING_QUEUE_SIZE", 32))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -151,9 +215,10 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.v1.users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "EXCEPTION_HANDLER": "api.v1.exceptions.exception_handler",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -168,6 +233,67 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Как часто (в секундах) процесс перечитывает классификатор статусов задач из базы.
+TASK_STATUS_CACHE_CHECK_INTERVAL = float(os.getenv("TASK_STATUS_CACHE_CHECK_INTERVAL", 5))
+# Не раньше чем через сколько секунд после последнего чтения неизвестный id статуса перечитывает статусы.
+TASK_STATUS_CACHE_MISS_INTERVAL = float(os.getenv("TASK_STATUS_CACHE_MISS_INTERVAL", 1))
+
+# Заголовок Server-Timing с временем запросов к базе, сериализации и обработки запроса.
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "true").lower() == "true"
+
+# Токен доступа к метрикам /metrics (заголовок Authorization: Bearer <токен>), без токена метрики недоступны.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Поведение при превышении бюджета запросов к базе (core.query_budget): off, warn (предупреждение в лог) или raise.
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "warn")
+
+# Сколько секунд пользователь, аутентифицированный по JWT, хранится в кэше процесса (0 - не кэшировать).
+# Изменения пользователя в других процессах, например деактивация, вступают в силу не позже чем через это время.
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", 30))
+# Сколько пользователей хранится в кэше процесса, сверх этого вытесняются дольше всех не запрашивавшиеся.
+AUTH_USER_CACHE_MAX_SIZE = int(os.getenv("AUTH_USER_CACHE_MAX_SIZE", 10000))
+
+# Режим поиска задач по умолчанию: fulltext (tsvector + GIN) или substring (ILIKE).
+TASKS_SEARCH_MODE = os.getenv("TASKS_SEARCH_MODE", "fulltext")
+
+# Максимальное количество задач в одном запросе пакетного создания, изменения и удаления.
+TASKS_BULK_BATCH_SIZE = int(os.getenv("TASKS_BULK_BATCH_SIZE", 1000))
+
+# Быстрый режим списка задач: строки values() без сериализаторов DRF.
+TASKS_LIST_FAST_PATH = os.getenv("TASKS_LIST_FAST_PATH", "true").lower() == "true"
+
+# Асинхронные список, просмотр и создание задач (AsyncTaskViewSet). Имеет смысл только под ASGI сервером.
+TASKS_ASYNC_VIEWS = os.getenv("TASKS_ASYNC_VIEWS", "false").lower() == "true"
+
+# Количество строк, которое выгрузка задач читает из серверного курсора за один раз.
+TASKS_EXPORT_CHUNK_SIZE = int(os.getenv("TASKS_EXPORT_CHUNK_SIZE", 2000))
+
+# Сводка задач по счетчикам, которые поддерживают триггеры таблицы задач. При false сводка считается
+# агрегатом по задачам пользователя, например пока счетчики пересчитываются командой rebuild_task_counters.
+TASKS_SUMMARY_COUNTERS = os.getenv("TASKS_SUMMARY_COUNTERS", "true").lower() == "true"
+
+# Количество просроченных задач, которое обработчик sweep_overdue_tasks отмечает одним запросом.
+TASKS_OVERDUE_BATCH_SIZE = int(os.getenv("TASKS_OVERDUE_BATCH_SIZE", 500))
+
+# Завершенные задачи старше этого количества дней команда archive_tasks переносит в архив.
+TASKS_ARCHIVE_AFTER_DAYS = int(os.getenv("TASKS_ARCHIVE_AFTER_DAYS", 90))
+
+# Количество задач, которое archive_tasks переносит в архив одним запросом.
+TASKS_ARCHIVE_BATCH_SIZE = int(os.getenv("TASKS_ARCHIVE_BATCH_SIZE", 500))
+
+# Количество задач в одной странице синхронизации (/api/v1/tasks/sync/).
+TASKS_SYNC_PAGE_SIZE = int(os.getenv("TASKS_SYNC_PAGE_SIZE", 500))
+
+# Сколько дней хранятся записи об удаленных задачах. Курсор синхронизации старше этого срока не принимается.
+TASKS_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASKS_TOMBSTONE_RETENTION_DAYS", 30))
+
+# Кэш ответов списка и детального просмотра задач с версиями по пользователю. Требует общего для всех процессов
+# кэша (CACHE_BACKEND): сброс версии в кэше одного процесса не виден остальным.
+TASKS_RESPONSE_CACHE = os.getenv("TASKS_RESPONSE_CACHE", "false").lower() == "true"
+
+# Сколько секунд хранится ответ в кэше ответов задач: за это время учитываются изменения задач в обход API.
+TASKS_RESPONSE_CACHE_TTL = int(os.getenv("TASKS_RESPONSE_CACHE_TTL", 300))
+
 DJOSER = {
     "SERIALIZERS": {
         "user": "api.v1.users.serializers.CustomUserSerializer",
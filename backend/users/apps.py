@@ -6,3 +6,7 @@ class UsersConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        """Подключение сигналов приложения."""
+        from users import signals  # noqa: F401
@@ -0,0 +1,87 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class AuthenticatedUserCache:
+    """Кэш пользователей, аутентифицированных по JWT, в памяти процесса.
+
+    Пользователь хранится не дольше AUTH_USER_CACHE_TTL секунд. При сохранении или удалении пользователя
+    сигналы модели сбрасывают его запись в текущем процессе, в остальных процессах изменение
+    (например, деактивация) вступает в силу по истечении TTL. Счетчики hits и misses показывают, сколько
+    запросов пользователя к базе сэкономлено.
+
+    Записей не больше AUTH_USER_CACHE_MAX_SIZE: при сохранении в заполненный кэш сначала удаляются устаревшие
+    записи, затем записи, которые дольше всех не запрашивались.
+    """
+
+    def __init__(self):
+        """Инициализация пустого кэша."""
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        """Номер поколения кэша, увеличивается при каждом сбросе."""
+        return self._generation
+
+    def get(self, user_id):
+        """Копия пользователя из кэша или None, если записи нет или она устарела."""
+        key = str(user_id)
+        with self._lock:
+            entry = self._users.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self._users.pop(key, None)
+                self.misses += 1
+                return None
+            self._users.move_to_end(key)
+            self.hits += 1
+        # Копия, чтобы изменения пользователя в одном запросе не попадали в другие.
+        return copy.copy(entry[0])
+
+    def set(self, user_id, user, generation: int) -> None:
+        """Сохраняет пользователя, загруженного из базы в поколении generation.
+
+        Если кэш сбрасывался во время загрузки, пользователь мог быть прочитан до изменения и не сохраняется.
+        """
+        ttl = settings.AUTH_USER_CACHE_TTL
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return
+            key = str(user_id)
+            self._users.pop(key, None)
+            if len(self._users) >= settings.AUTH_USER_CACHE_MAX_SIZE:
+                self._evict(now)
+            self._users[key] = (copy.copy(user), now + ttl)
+
+    def _evict(self, now):
+        for key in [key for key, (_, expires_at) in self._users.items() if expires_at <= now]:
+            del self._users[key]
+        while self._users and len(self._users) >= settings.AUTH_USER_CACHE_MAX_SIZE:
+            self._users.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        """Сбрасывает запись пользователя."""
+        with self._lock:
+            self._generation += 1
+            self._users.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        """Сбрасывает все записи и счетчики."""
+        with self._lock:
+            self._generation += 1
+            self._users = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+
+
+authenticated_user_cache = AuthenticatedUserCache()
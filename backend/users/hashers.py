@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+from core.metrics import request_metrics
+
+
+class PasswordHashingBusy(Exception):
+    """Очередь хеширования паролей заполнена. API отвечает на нее кодом 503 (api.v1.exceptions)."""
+
+
+class PasswordHashingExecutor:
+    """Ограниченный пул потоков процесса для хеширования и проверки паролей.
+
+    Одновременно хешируется не больше PASSWORD_HASHING_WORKERS паролей, остальные ждут в очереди
+    не длиннее PASSWORD_HASHING_QUEUE_SIZE. Хеширование сверх очереди сразу завершается PasswordHashingBusy
+    (в API - ответ 503), поэтому волна входов занимает не больше PASSWORD_HASHING_WORKERS ядер, а не все потоки
+    рабочего процесса. hashlib отпускает GIL на время PBKDF2, остальные запросы процесса выполняются
+    параллельно. При PASSWORD_HASHING_WORKERS = 0 пароли хешируются в потоке запроса.
+
+    Пул создается при первом хешировании, то есть после fork рабочих процессов сервера.
+    """
+
+    def __init__(self):
+        """Инициализация без пула потоков."""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._local = threading.local()
+        self.queued = 0
+        self.running = 0
+
+    @property
+    def executor(self):
+        """Пул потоков, не меньше одного потока при любом PASSWORD_HASHING_WORKERS."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(settings.PASSWORD_HASHING_WORKERS, 1), thread_name_prefix="password-hashing"
+                )
+            return self._executor
+
+    def submit(self, func, *args):
+        """Future вызова func в пуле или PasswordHashingBusy, если очередь заполнена."""
+        with self._lock:
+            if self.queued + self.running >= settings.PASSWORD_HASHING_WORKERS + settings.PASSWORD_HASHING_QUEUE_SIZE:
+                request_metrics.password_hashing_rejected.inc(())
+                raise PasswordHashingBusy
+            self.queued += 1
+            self.update_gauges()
+        try:
+            return self.executor.submit(self.call, func, *args)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+                self.update_gauges()
+            raise
+
+    def call(self, func, *args):
+        """Вызов func в потоке пула с учетом в счетчиках очереди."""
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.update_gauges()
+        self._local.in_pool = True
+        try:
+            return func(*args)
+        finally:
+            self._local.in_pool = False
+            with self._lock:
+                self.running -= 1
+                self.update_gauges()
+
+    def update_gauges(self):
+        """Метрики очереди и выполняемых хеширований для /metrics."""
+        request_metrics.password_hashing_queue.set((), self.queued)
+        request_metrics.password_hashing_running.set((), self.running)
+
+    def run(self, func, *args):
+        """Результат func, вычисленный в пуле. Поток вызывающего ждет результата."""
+        if settings.PASSWORD_HASHING_WORKERS <= 0 or getattr(self._local, "in_pool", False):
+            return func(*args)
+        return self.submit(func, *args).result()
+
+    def shutdown(self):
+        """Останавливает пул. Следующее хеширование создаст новый пул с текущими настройками."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hashing_executor = PasswordHashingExecutor()
+
+
+class BoundedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 SHA256 с хешированием в password_hashing_executor и числом итераций из настроек.
+
+    Алгоритм совпадает со стандартным pbkdf2_sha256, поэтому существующие хеши проверяются без изменений.
+    Хеши с другим числом итераций Django пересчитывает при следующем успешном входе.
+    """
+
+    @property
+    def iterations(self):
+        """Число итераций PBKDF2: PASSWORD_HASHER_ITERATIONS или значение Django по умолчанию."""
+        return settings.PASSWORD_HASHER_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+    def encode(self, password, salt, iterations=None):
+        """Хеш пароля, вычисленный в пуле хеширования. Через encode проверяются и пароли при входе."""
+        return password_hashing_executor.run(super().encode, password, salt, iterations)
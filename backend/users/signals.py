@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.cache import authenticated_user_cache
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user_cache(instance, **kwargs):
+    """Сбрасывает кэш аутентифицированного пользователя при его изменении, деактивации или смене пароля."""
+    authenticated_user_cache.invalidate(instance.pk)
+    # До фиксации транзакции другой запрос может снова загрузить в кэш прежнюю версию пользователя.
+    transaction.on_commit(lambda: authenticated_user_cache.invalidate(instance.pk))